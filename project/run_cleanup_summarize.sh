@@ -40,4 +40,4 @@ export LEGAL_LUMINARY_POSTS="${LEGAL_LUMINARY_POSTS:-/Volumes/RepoPart1/legal-lu
 echo "Using Python: $(which python)"
 echo "Posts dir: $LEGAL_LUMINARY_POSTS"
 echo "---"
-python src/agent/cleanup_summarize.py
+PYTHONPATH=src python src/agent/cleanup_summarize.py
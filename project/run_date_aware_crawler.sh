@@ -13,4 +13,4 @@ if ! python3 -c "import playwright" 2>/dev/null; then
 fi
 
 echo "Running date_aware_crawler -> legal-luminary/_posts"
-python3 src/agent/date_aware_crawler.py
+PYTHONPATH=src python3 src/agent/date_aware_crawler.py
@@ -0,0 +1,187 @@
+"""Per-source boilerplate lines learned from crawled posts.
+
+Every station wraps its articles in the same navigation, promo and footer
+lines ("Copyright 2026 KWTX. All rights reserved.", "Download the KXAN app"),
+far more than cleanup_summarize's fixed patterns can list. The index counts,
+per ``source_name``, in how many raw posts each normalized line appears; a
+line that keeps showing up in a large share of that source's posts since it
+was first seen is boilerplate, and cleanup drops it before the text goes to
+the LLM.
+
+Only the article part of a raw post is counted: summarized posts (those with
+``summary_source_hash`` in their front matter) and the Source Information
+block are skipped. Each post is counted once, by filename, and the counts
+persist in legal-luminary/_data/boilerplate_index.json.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+from agent.front_matter import Post, text_value
+
+_LEGAL_LUMINARY_DEFAULT = Path("/Volumes/RepoPart1/legal-luminary")
+
+BOILERPLATE_FILENAME = "boilerplate_index.json"
+BOILERPLATE_VERSION = 1
+
+# A line is boilerplate once it is in at least MIN_POSTS posts and in
+# MIN_SHARE of the source's posts crawled since it first appeared.
+MIN_POSTS = 5
+MIN_SHARE = 0.5
+# Longer lines are article prose, never counted.
+MAX_LINE_CHARS = 200
+# Lines seen once and not again within this many posts are forgotten on save.
+PRUNE_AFTER_POSTS = 50
+
+_WS_RE = re.compile(r"\s+")
+_SOURCE_HEADER_RE = re.compile(r"^##\s*Source Information\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def default_boilerplate_path() -> Path:
+    """Return the index location, honoring LEGAL_LUMINARY_DATA."""
+    data_dir = Path(os.environ.get("LEGAL_LUMINARY_DATA", str(_LEGAL_LUMINARY_DEFAULT / "_data")))
+    return data_dir / BOILERPLATE_FILENAME
+
+
+def normalize_line(line: str) -> str:
+    """Case-folded line with runs of whitespace collapsed, for exact matching."""
+    return _WS_RE.sub(" ", line).strip().casefold()
+
+
+def line_key(line: str) -> str:
+    """Short hash of a normalized line; the index stores keys, not text."""
+    return hashlib.blake2b(normalize_line(line).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class BoilerplateIndex:
+    """Counts of normalized lines per source, and the boilerplate they imply."""
+
+    def __init__(self, min_posts: int = MIN_POSTS, min_share: float = MIN_SHARE):
+        self.min_posts = min_posts
+        self.min_share = min_share
+        # source -> number of posts counted
+        self.totals: Dict[str, int] = {}
+        # source -> {line key: [posts containing it, totals[source] when first seen]}
+        self.lines: Dict[str, Dict[str, List[int]]] = {}
+        # post filename -> source, so a post is counted once
+        self.posts: Dict[str, str] = {}
+        self._cache: Dict[str, FrozenSet[str]] = {}
+
+    def add(self, name: str, source: str, lines: Iterable[str]) -> bool:
+        """Count the distinct lines of one post; False if name was already counted."""
+        if name in self.posts or not source:
+            return False
+        self.posts[name] = source
+        total = self.totals.get(source, 0) + 1
+        self.totals[source] = total
+        counts = self.lines.setdefault(source, {})
+        keys = {line_key(line) for line in lines if line.strip() and len(line) <= MAX_LINE_CHARS}
+        for key in keys:
+            entry = counts.get(key)
+            if entry is None:
+                counts[key] = [1, total]
+            else:
+                entry[0] += 1
+        self._cache.pop(source, None)
+        return True
+
+    def add_post(self, post_path: Path) -> bool:
+        """Count a raw post's article lines; summarized posts are skipped."""
+        post = Post.read(post_path)
+        if not post.has_front_matter or "summary_source_hash" in post.front_matter:
+            return False
+        body = post.body
+        header = _SOURCE_HEADER_RE.search(body)
+        if header:
+            body = body[: header.start()]
+        return self.add(post_path.name, text_value(post.get("source_name")), body.splitlines())
+
+    def update(self, posts_dir: Path) -> int:
+        """Count every post in posts_dir not counted before; return how many were added."""
+        added = 0
+        with os.scandir(posts_dir) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".md") and not e.name.startswith("."))
+        for name in names:
+            if name not in self.posts and self.add_post(posts_dir / name):
+                added += 1
+        return added
+
+    def boilerplate(self, source: Optional[str]) -> FrozenSet[str]:
+        """Line keys that are boilerplate for source (empty until it has MIN_POSTS posts)."""
+        if not source:
+            return frozenset()
+        if source not in self._cache:
+            total = self.totals.get(source, 0)
+            self._cache[source] = frozenset(
+                key
+                for key, (count, first) in self.lines.get(source, {}).items()
+                if count >= self.min_posts and count >= self.min_share * (total - first + 1)
+            )
+        return self._cache[source]
+
+    def is_boilerplate(self, source: Optional[str], line: str) -> bool:
+        return line_key(line) in self.boilerplate(source)
+
+    def prune(self) -> int:
+        """Forget one-off lines that have not recurred within PRUNE_AFTER_POSTS posts."""
+        removed = 0
+        for source, counts in self.lines.items():
+            total = self.totals.get(source, 0)
+            stale = [k for k, (count, first) in counts.items() if count == 1 and total - first >= PRUNE_AFTER_POSTS]
+            for key in stale:
+                del counts[key]
+            removed += len(stale)
+        return removed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": BOILERPLATE_VERSION,
+            "totals": self.totals,
+            "lines": self.lines,
+            "posts": self.posts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BoilerplateIndex":
+        index = cls()
+        if data.get("version") != BOILERPLATE_VERSION:
+            return index
+        index.totals = data.get("totals", {})
+        index.lines = data.get("lines", {})
+        index.posts = data.get("posts", {})
+        return index
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Prune, then write the index as JSON (temp file + rename)."""
+        path = path or default_boilerplate_path()
+        self.prune()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "BoilerplateIndex":
+        """Load a saved index; returns an empty one if missing or unreadable."""
+        path = path or default_boilerplate_path()
+        if not path.exists():
+            return cls()
+        try:
+            return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+
+def load_updated_index(posts_dir: Path, path: Optional[Path] = None) -> BoilerplateIndex:
+    """Load the saved index, count posts in posts_dir it has not seen, and persist any changes."""
+    index = BoilerplateIndex.load(path)
+    if posts_dir.exists() and index.update(posts_dir):
+        index.save(path)
+    return index
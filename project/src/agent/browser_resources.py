@@ -0,0 +1,264 @@
+"""Browser memory management for long crawls.
+
+Chromium's memory grows with every navigation a page or context serves. A
+SourceSession owns one source's context and page pool and keeps that bounded:
+pages are replaced after MAX_PAGE_NAVIGATIONS, and the whole context is
+retired and reopened after MAX_CONTEXT_NAVIGATIONS, or as soon as the
+browser's resident memory (sampled every RSS_CHECK_EVERY navigations)
+crosses RSS_LIMIT_BYTES. Recycling waits for in-flight pages to finish.
+
+Contexts are warmed across runs: each source's cookies and local storage
+(consent dismissals included) are saved with ``storage_state`` when its
+context is retired or closed, under output/crawl_state/browser_state/, and
+loaded into the next context for that source.
+
+BrowserResources is shared by every source in a crawl; it holds the limits,
+samples RSS, and records the JavaScript heap each context had in use when it
+was retired, for the crawl summary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import subprocess
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from agent.crawl_scheduler import PAGES_PER_SOURCE, PagePool
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+STORAGE_STATE_DIR = _PROJECT_ROOT / "output" / "crawl_state" / "browser_state"
+MAX_PAGE_NAVIGATIONS = 25
+MAX_CONTEXT_NAVIGATIONS = 150
+RSS_LIMIT_BYTES = 1536 * 1024 * 1024
+RSS_CHECK_EVERY = 10
+
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+_JS_HEAP = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+def browser_rss_bytes(root_pid: Optional[int] = None) -> int:
+    """Total resident memory of browser processes descended from root_pid (default: this process)."""
+    root_pid = root_pid or os.getpid()
+    try:
+        out = subprocess.run(
+            ["ps", "-eo", "pid=,ppid=,rss=,comm="], capture_output=True, text=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return 0
+    procs: Dict[int, Tuple[int, int, str]] = {}
+    for line in out.splitlines():
+        fields = line.split(None, 3)
+        if len(fields) == 4:
+            procs[int(fields[0])] = (int(fields[1]), int(fields[2]), fields[3])
+
+    def _descends(pid: int) -> bool:
+        while pid in procs and pid != root_pid:
+            pid = procs[pid][0]
+        return pid == root_pid
+
+    return sum(
+        rss * 1024
+        for pid, (_, rss, comm) in procs.items()
+        if any(name in comm.lower() for name in BROWSER_PROCESS_NAMES) and _descends(pid)
+    )
+
+
+class BrowserResources:
+    """Recycling limits, RSS sampling and per-context memory reports for one crawl."""
+
+    def __init__(
+        self,
+        max_page_navigations: Optional[int] = MAX_PAGE_NAVIGATIONS,
+        max_context_navigations: Optional[int] = MAX_CONTEXT_NAVIGATIONS,
+        rss_limit: Optional[int] = RSS_LIMIT_BYTES,
+        state_dir: Optional[Path] = STORAGE_STATE_DIR,
+    ):
+        """Create the manager.
+
+        Args:
+            max_page_navigations: Replace a page after this many loads (None: never).
+            max_context_navigations: Retire a context after this many loads (None: never).
+            rss_limit: Browser RSS in bytes above which every context is recycled (None: no limit).
+            state_dir: Where per-source storage state is kept (None: start every context cold).
+        """
+        self.max_page_navigations = max_page_navigations
+        self.max_context_navigations = max_context_navigations
+        self.rss_limit = rss_limit
+        self.state_dir = state_dir
+        self.navigations = 0
+        self.contexts_recycled = 0
+        self.pages_recycled = 0
+        self.peak_rss = 0
+        # Samples over rss_limit, each of which recycled every open context.
+        self.rss_limit_hits = 0
+        # Bumped when RSS crosses the limit; sessions opened in an older generation recycle.
+        self.generation = 0
+        # (source, navigations served, JS heap bytes in use at retirement)
+        self.context_reports: List[Tuple[str, int, int]] = []
+
+    @classmethod
+    def unmanaged(cls) -> BrowserResources:
+        """No recycling, no RSS limit and no saved state: one plain context per source."""
+        return cls(None, None, None, None)
+
+    def storage_state_path(self, name: str) -> Optional[Path]:
+        """Return where source name's storage state is saved, or None without a state_dir."""
+        if self.state_dir is None:
+            return None
+        return self.state_dir / f"{re.sub(r'[^A-Za-z0-9_-]+', '_', name)}.json"
+
+    async def new_context(self, browser: Any, name: str) -> Any:
+        """Open a context for source name, warmed with its saved storage state if any."""
+        path = self.storage_state_path(name)
+        if path is not None and path.exists():
+            try:
+                return await browser.new_context(storage_state=str(path))
+            except Exception:
+                pass
+        return await browser.new_context()
+
+    async def retire(self, name: str, context: Any, pages: List[Any], navigations: int) -> None:
+        """Record a context's memory, save its storage state, and close it."""
+        heap = 0
+        for page in pages:
+            try:
+                heap += int(await page.evaluate(_JS_HEAP) or 0)
+            except Exception:
+                pass
+        self.context_reports.append((name, navigations, heap))
+        path = self.storage_state_path(name)
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                await context.storage_state(path=str(path))
+            except Exception:
+                pass
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def navigated(self) -> None:
+        """Count one page load and, every RSS_CHECK_EVERY loads, check browser RSS."""
+        self.navigations += 1
+        if self.rss_limit is None or self.navigations % RSS_CHECK_EVERY:
+            return
+        rss = await asyncio.to_thread(browser_rss_bytes)
+        self.peak_rss = max(self.peak_rss, rss)
+        if rss > self.rss_limit:
+            self.rss_limit_hits += 1
+            self.generation += 1
+
+    async def open(
+        self, browser: Any, name: str, blocker: Any = None, pages: int = PAGES_PER_SOURCE
+    ) -> SourceSession:
+        """Open a recycled context and page pool for one source."""
+        session = SourceSession(self, browser, name, blocker, pages)
+        await session.start()
+        return session
+
+    def summary(self) -> str:
+        """Return navigation, recycling and memory figures for the crawl summary."""
+        heaps = [heap for _, _, heap in self.context_reports]
+        heap_text = (
+            f", JS heap per context avg {sum(heaps) / len(heaps) / 1_000_000:.0f} MB "
+            f"max {max(heaps) / 1_000_000:.0f} MB"
+            if heaps
+            else ""
+        )
+        return (
+            f"{self.navigations} navigations, {self.contexts_recycled} contexts and "
+            f"{self.pages_recycled} pages recycled, peak RSS {self.peak_rss / 1_000_000:.0f} MB "
+            f"(over limit {self.rss_limit_hits}x){heap_text}"
+        )
+
+
+class SourceSession:
+    """One source's browser context and page pool, recycled under BrowserResources' limits."""
+
+    def __init__(self, resources: BrowserResources, browser: Any, name: str, blocker: Any, pages: int):
+        """Prepare a session for source name; start() opens its context and pool."""
+        self.resources = resources
+        self.browser = browser
+        self.name = name
+        self.blocker = blocker
+        self.size = pages
+        self.context: Any = None
+        self.pool: Optional[PagePool] = None
+        self.navigations = 0
+        self._generation = resources.generation
+        self._active = 0
+        self._recycling = False
+        self._drained = asyncio.Event()
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+
+    async def start(self) -> None:
+        """Open a (warmed) context with request blocking and a fresh page pool."""
+        self.context = await self.resources.new_context(self.browser, self.name)
+        if self.blocker is not None:
+            await self.blocker.for_source(self.name).install(self.context)
+        self.pool = PagePool(self.context, self.size, max_uses=self.resources.max_page_navigations)
+        self.navigations = 0
+        self._generation = self.resources.generation
+
+    def _should_recycle(self) -> bool:
+        limit = self.resources.max_context_navigations
+        return (limit is not None and self.navigations >= limit) or (
+            self._generation < self.resources.generation
+        )
+
+    def _started_pool(self) -> PagePool:
+        if self.pool is None:
+            raise RuntimeError(f"SourceSession {self.name!r} used before start()")
+        return self.pool
+
+    async def _shutdown(self) -> None:
+        pool = self._started_pool()
+        self.resources.pages_recycled += pool.recycled
+        await self.resources.retire(self.name, self.context, pool.pages, self.navigations)
+
+    async def _recycle(self) -> None:
+        self._recycling = True
+        self._resumed.clear()
+        try:
+            while self._active:
+                self._drained.clear()
+                await self._drained.wait()
+            await self._shutdown()
+            self.resources.contexts_recycled += 1
+            await self.start()
+        finally:
+            self._recycling = False
+            self._resumed.set()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Borrow a page, recycling the context first if it is due."""
+        while self._recycling:
+            await self._resumed.wait()
+        if self._should_recycle():
+            await self._recycle()
+        # Counted at borrow time so a burst of borrowers cannot overshoot the limit.
+        self.navigations += 1
+        self._active += 1
+        try:
+            async with self._started_pool().page() as page:
+                yield page
+        finally:
+            self._active -= 1
+            if not self._active:
+                self._drained.set()
+            await self.resources.navigated()
+
+    async def close(self) -> None:
+        """Save this source's storage state and close its context."""
+        if self.context is not None:
+            await self._shutdown()
+            self.context = None
@@ -1,12 +1,44 @@
-"""Manual cleanup and OpenAI summarization for Jekyll posts.
+"""Manual cleanup and summarization for Jekyll posts.
 
 Reads each post, strips junk (Skip to content, ads, nav, repeated headers),
-keeps full article content, and asks OpenAI for a summary. Overwrites the
-markdown file with the summary as the body and sets excerpt to a short teaser.
+keeps full article content, and asks a summarizer backend (see
+agent.summarizers: OpenAI, Ollama or in-process TextRank) for a summary.
+Overwrites the markdown file with the summary as the body and sets excerpt to
+a short teaser. Near-duplicate copies of a story (see agent.near_duplicates)
+are skipped so only the canonical post is summarized.
+
+The backend is chosen per post: posts evidence_validator rates critical or
+high get the best available backend, everything else the cheapest, within an
+optional latency budget. The batch run is async, with up to
+SUMMARY_CONCURRENCY summaries in flight and each post rewritten as soon as
+its own summary comes back. Rewrites are atomic and skipped when the new
+content is byte-identical (see agent.post_io); each run lists the posts it
+changed in changed_posts.json next to important_articles.json.
+
+Summarizing is idempotent. A summarized post carries ``summary_source_hash``,
+``summary_backend`` and ``summary_version`` (backend model + prompts) in its
+front matter and is skipped while the version matches. A summary is never
+replaced by one from a lower-quality backend. Summaries are cached by content
+hash (see agent.summary_cache), so a re-crawled but unchanged article costs
+no API call, and a prompt or model change re-summarizes from the cached
+source text rather than from the previous summary.
+
+Large backfills can skip live calls: --export-batch writes an OpenAI Batch
+API request file for every post that needs a summary, and --ingest-batch
+applies the results file (see agent.summary_batch).
+
+LLM calls are metered (see agent.llm_budget). With a token, dollar or time
+budget, each post's prompt is estimated before its summary is requested and
+posts the run can no longer afford are deferred (left untouched for the next
+run); high-priority posts are always summarized. The run ends with a per-node
+report of tokens, latency, cost and what the cache saved.
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import json
 import os
 from pathlib import Path
 
@@ -20,10 +52,45 @@ except ImportError:
 import re
 from typing import Any, Dict, List, Optional
 
-try:
-    import yaml
-except ImportError:
-    yaml = None
+from agent.boilerplate import (
+    BOILERPLATE_FILENAME,
+    BoilerplateIndex,
+    line_key,
+    load_updated_index,
+    normalize_line,
+)
+from agent.front_matter import Post, render
+from agent.llm_budget import (
+    EXPECTED_COMPLETION_TOKENS,
+    RunBudget,
+    cost,
+    estimate_tokens,
+    ledger,
+    start_run,
+)
+from agent.near_duplicates import load_updated_detector
+from agent.post_io import write_if_changed, write_manifest
+from agent.summarizers import (
+    BACKENDS,
+    OpenAISummarizer,
+    Summarizer,
+    TextRankSummarizer,
+    map_prompts,
+    notes_text,
+    select_summarizer,
+    summary_prompt,
+)
+from agent.summary_batch import (
+    MAX_BATCH_REQUESTS,
+    batch_request,
+    is_summary_model,
+    map_id,
+    notes_key,
+    read_results,
+    summary_id,
+    write_jsonl,
+)
+from agent.summary_cache import SummaryCache, content_hash
 
 try:
     from openai import OpenAI
@@ -58,35 +125,45 @@ JUNK_LINE_PATTERNS = [
     r"^\s*More Videos\s*$",
 ]
 
+_LITERAL_RE = re.compile(r"^\^\\s\*([A-Za-z0-9 ]+)\\s\*\$$")
+
+
+def _compile_junk_patterns(patterns: List[str]) -> tuple[frozenset[str], re.Pattern[str]]:
+    """Split patterns into an exact normalized-line set and one alternation for the rest."""
+    literals = set()
+    others = []
+    for pat in patterns:
+        m = _LITERAL_RE.match(pat)
+        if m:
+            literals.add(normalize_line(m.group(1)))
+        else:
+            others.append(pat.removeprefix(r"^\s*").removesuffix(r"\s*$"))
+    return frozenset(literals), re.compile(r"\s*(?:" + "|".join(others) + r")\s*", re.IGNORECASE)
+
+
+_JUNK_LINES, _JUNK_RE = _compile_junk_patterns(JUNK_LINE_PATTERNS)
+
 SOURCE_HEADER = re.compile(r"^##\s*Source Information\s*$", re.IGNORECASE)
 
-# Max characters sent to LLM for summarization (allow longer articles)
-MAX_INPUT_CHARS = 12000
+# Summaries in flight at once in the async batch run
+SUMMARY_CONCURRENCY = 8
+# relevance values (from evidence_validator) whose posts get the best available backend
+HIGH_PRIORITY_RELEVANCE = ("critical", "high")
 
 
 def parse_front_matter_and_body(content: str) -> tuple[Dict[str, Any], str]:
     """Parse Jekyll front matter and body. Returns (front_matter_dict, body_text)."""
-    fm: Dict[str, Any] = {}
-    body = content
-    if content.strip().startswith("---") and yaml:
-        parts = content.split("---", 2)
-        if len(parts) >= 3:
-            try:
-                fm = yaml.safe_load(parts[1]) or {}
-            except Exception:
-                pass
-            body = parts[2].lstrip("\n")
-    return fm, body
+    post = Post(content)
+    return post.front_matter, post.body
 
 
-def _is_junk_line(line: str) -> bool:
+def _is_junk_line(line: str, boilerplate: frozenset[str] = frozenset()) -> bool:
     s = line.strip()
     if not s:
         return False
-    for pat in JUNK_LINE_PATTERNS:
-        if re.match(pat, s, re.IGNORECASE):
-            return True
-    return False
+    if normalize_line(s) in _JUNK_LINES or _JUNK_RE.fullmatch(s):
+        return True
+    return bool(boilerplate) and line_key(s) in boilerplate
 
 
 def _split_body_and_source(body: str) -> tuple[str, str]:
@@ -98,47 +175,25 @@ def _split_body_and_source(body: str) -> tuple[str, str]:
     return body.strip(), ""
 
 
-def clean_body(body: str) -> tuple[str, str]:
-    """Remove junk lines only; keep full article content. Returns (article_part, source_section)."""
-    lines = [ln for ln in body.split("\n") if not _is_junk_line(ln)]
-    cleaned = "\n".join(lines).strip()
-    article_part, source_section = _split_body_and_source(cleaned)
-    return article_part.strip(), source_section.strip()
+def clean_body(body: str, boilerplate: frozenset[str] = frozenset()) -> tuple[str, str]:
+    """Remove junk lines only; keep full article content. Returns (article_part, source_section).
 
-
-SUMMARY_SYSTEM_PROMPT = """You are an editor writing a comprehensive summary for a news article.
-
-Your task: read the article and produce a detailed summary that will replace the raw article body on a news site. The summary must:
-
-1. Be written in clear, neutral, third-person prose suitable for a legal/community news site.
-2. Cover the main point in the first 1–2 sentences (who, what, when, where).
-3. Include key facts, figures, quotes (if notable), and context.
-4. Explain why it matters or what happens next when relevant.
-5. Be substantive: aim for roughly 2–5 short paragraphs (or equivalent length). Do not reduce the article to a single short sentence unless the source is genuinely a one-line item.
-6. Preserve any important names, dates, locations, and outcomes. Do not invent details not present in the source.
-7. Output only the summary text, no headings or labels."""
+    boilerplate holds line keys learned for the post's source (see agent.boilerplate);
+    only the article part is filtered, so the Source Information block is kept intact.
+    """
+    article_part, source_section = _split_body_and_source(body)
+    lines = [ln for ln in article_part.split("\n") if not _is_junk_line(ln, boilerplate)]
+    return "\n".join(lines).strip(), source_section.strip()
 
 
 def summarize_with_langchain(title: str, body: str) -> Optional[str]:
     """Produce a comprehensive, detailed article summary with LangChain (OpenAI). Returns None if unavailable."""
-    if not HAS_LANGCHAIN:
-        return None
-    if not body or not body.strip():
-        return None
-    try:
-        import os
-        if not os.environ.get("OPENAI_API_KEY"):
-            return None
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        text = f"Title: {title}\n\n{body}"[:MAX_INPUT_CHARS]
-        messages = [
-            SystemMessage(content=SUMMARY_SYSTEM_PROMPT),
-            HumanMessage(content=text),
-        ]
-        response = llm.invoke(messages)
-        return (response.content or "").strip() or None
-    except Exception:
-        return None
+    return OpenAISummarizer().summarize(title, body)
+
+
+async def asummarize_with_langchain(title: str, body: str, llm: Any = None) -> Optional[str]:
+    """Async summarize_with_langchain, optionally on a given chat client."""
+    return await OpenAISummarizer(llm).asummarize(title, body)
 
 
 def excerpt_from_summary(full_summary: str, max_sentences: int = 2, max_chars: int = 320) -> str:
@@ -155,69 +210,478 @@ def excerpt_from_summary(full_summary: str, max_sentences: int = 2, max_chars: i
     return excerpt
 
 
-def cleanup_and_summarize_post(post_path: Path) -> Dict[str, Any]:
+def summary_version(summarizer: Optional[Summarizer] = None) -> str:
+    """Short hash of a backend's identity, stored as ``summary_version`` on summarized posts."""
+    return content_hash(*(summarizer or OpenAISummarizer()).identity())[:12]
+
+
+def _quality(backend: Optional[str]) -> int:
+    cls = BACKENDS.get(backend or "")
+    return cls.quality if cls else 0
+
+
+def _plan(
+    post_path: Path,
+    cache: Optional[SummaryCache],
+    boilerplate: Optional[BoilerplateIndex] = None,
+    summarizer: Optional[Summarizer] = None,
+    high_priority: bool = False,
+    latency_budget: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """Read and clean a post and work out what, if anything, to summarize and with which backend.
+
+    Returns None when the post already holds a summary for the current
+    version, or one from a better backend than would be used now (or is
+    stale but its source text is no longer available). ``summary`` is set
+    when the cache already has the answer.
     """
-    Read post, clean junk only (keep full content), get comprehensive LLM summary,
+    post = Post.read(post_path)
+    fm, body = post.front_matter, post.body
+    learned = boilerplate.boilerplate(fm.get("source_name")) if boilerplate is not None else frozenset()
+    article_part, source_section = clean_body(body, learned)
+    title = (fm.get("title") or "") if isinstance(fm.get("title"), str) else ""
+    text = article_part
+
+    source_hash = fm.get("summary_source_hash")
+    resummarize = bool(source_hash)
+    if resummarize:
+        # The body is an earlier summary; only the cached source can be summarized again.
+        source = cache.source(source_hash) if cache is not None and isinstance(source_hash, str) else None
+        if source is None:
+            return None
+        title, text = source
+    else:
+        source_hash = content_hash(title, text)[:16]
+
+    summarizer = summarizer or select_summarizer(text, high_priority, latency_budget)
+    if resummarize:
+        # Posts summarized before backends existed were all OpenAI.
+        previous = fm.get("summary_backend", "openai")
+        if summarizer is None or _quality(previous) > summarizer.quality:
+            return None
+        if previous == summarizer.name and fm.get("summary_version") == summary_version(summarizer):
+            return None
+
+    key = content_hash(*summarizer.identity(), title, text) if summarizer is not None else None
+    return {
+        "fm": fm,
+        "article_part": article_part,
+        "source_section": source_section,
+        "title": title,
+        "text": text,
+        "source_hash": source_hash,
+        "resummarize": resummarize,
+        "summarizer": summarizer,
+        "key": key,
+        "summary": cache.get(key) if cache is not None and key else None,
+    }
+
+
+def _finish(
+    post_path: Path,
+    job: Dict[str, Any],
+    summary: Optional[str],
+    cache: Optional[SummaryCache],
+    result: Dict[str, Any],
+) -> None:
+    """Cache a fresh summary, mark the front matter, and rewrite the post."""
+    if cache is not None and not job["summary"]:
+        cache.put_source(job["source_hash"], job["title"], job["text"])
+        if summary and job["key"]:
+            cache.put(job["key"], job["source_hash"], summary)
+    if not summary and job["resummarize"]:
+        # Keep the old summary rather than replace it with nothing better.
+        result["skipped"] = True
+        return
+    fm = job["fm"]
+    if summary:
+        result["backend"] = job["summarizer"].name
+        fm["summary_source_hash"] = job["source_hash"]
+        fm["summary_backend"] = job["summarizer"].name
+        fm["summary_version"] = summary_version(job["summarizer"])
+    _write_post(post_path, fm, job["article_part"], job["source_section"], summary, result)
+
+
+def _admit(job: Dict[str, Any], high_priority: bool, result: Dict[str, Any]) -> bool:
+    """Check a planned summary against the run budget; False (post deferred) if the run cannot afford it.
+
+    An admitted summary reserves its estimate (``job["reserved"]``) until _release.
+    """
+    summarizer = job["summarizer"]
+    tokens = summarizer.prompt_tokens(job["title"], job["text"]) if summarizer is not None else 0
+    if not tokens:
+        return True
+    node = f"{summarizer.name}.summarize"
+    if job["summary"]:
+        ledger().record_cache_hit(node, summarizer.model, tokens)
+        return True
+    if ledger().reserve(node, summarizer.model, tokens, high_priority):
+        job["reserved"] = tokens
+        return True
+    result["deferred"] = True
+    return False
+
+
+def _release(job: Optional[Dict[str, Any]]) -> None:
+    if job is not None and job.get("reserved"):
+        ledger().release(job["summarizer"].model, job.pop("reserved"))
+
+
+def _write_post(
+    post_path: Path,
+    fm: Dict[str, Any],
+    article_part: str,
+    source_section: str,
+    summary: Optional[str],
+    result: Dict[str, Any],
+) -> None:
+    """Overwrite the post with the summary (or the cleaned article) as its body."""
+    excerpt = ""
+    if summary:
+        excerpt = excerpt_from_summary(summary)
+        if fm.get("news_excerpt") is not False and excerpt:
+            fm["excerpt"] = excerpt
+        result["summary_set"] = True
+        # Body = full LLM summary + Source Information block
+        body_to_write = summary
+        if source_section:
+            body_to_write = body_to_write + "\n\n" + source_section
+    else:
+        # No LLM summary: keep cleaned article content + source section
+        body_to_write = article_part
+        if source_section:
+            body_to_write = (body_to_write + "\n\n" + source_section) if body_to_write else source_section
+
+    result["changed"] = write_if_changed(post_path, render(fm, body_to_write))
+    result["cleaned"] = True
+
+
+def cleanup_and_summarize_post(
+    post_path: Path,
+    cache: Optional[SummaryCache] = None,
+    boilerplate: Optional[BoilerplateIndex] = None,
+    summarizer: Optional[Summarizer] = None,
+    high_priority: bool = False,
+    latency_budget: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Read post, clean junk only (keep full content), get comprehensive summary,
     then overwrite the markdown file with: front matter (excerpt = short teaser) and
     body = full detailed summary + Source Information block.
-    Returns dict with keys: path, cleaned, summary_set, error (if any).
+    summarizer fixes the backend; otherwise one is selected for this post.
+    Posts already summarized under the current backend version are left alone.
+    The file is replaced atomically, and not at all if its content is unchanged.
+    A post the run budget cannot afford is deferred and left untouched.
+    Returns dict with keys: path, cleaned, changed, summary_set, backend, cached, skipped, deferred, error (if any).
     """
     result: Dict[str, Any] = {"path": str(post_path), "cleaned": False, "summary_set": False}
+    job = None
     try:
-        content = post_path.read_text(encoding="utf-8", errors="replace")
-        fm, body = parse_front_matter_and_body(content)
-        article_part, source_section = clean_body(body)
-        title = (fm.get("title") or "") if isinstance(fm.get("title"), str) else ""
-
-        # Get comprehensive detailed summary from LLM; use full article text
-        summary = summarize_with_langchain(title, article_part)
-
-        if summary:
-            excerpt = excerpt_from_summary(summary)
-            if fm.get("news_excerpt") is not False and excerpt:
-                fm["excerpt"] = excerpt
-            result["summary_set"] = True
-            # Body = full LLM summary + Source Information block
-            body_to_write = summary
-            if source_section:
-                body_to_write = body_to_write + "\n\n" + source_section
-        else:
-            # No LLM summary: keep cleaned article content + source section
-            body_to_write = article_part
-            if source_section:
-                body_to_write = (body_to_write + "\n\n" + source_section) if body_to_write else source_section
+        job = _plan(post_path, cache, boilerplate, summarizer, high_priority, latency_budget)
+        if job is None:
+            result["skipped"] = True
+            return result
+        if not _admit(job, high_priority, result):
+            return result
+        result["cached"] = bool(job["summary"])
+        summary = job["summary"]
+        if not summary and job["summarizer"] is not None:
+            # Get comprehensive detailed summary; use full article text
+            summary = job["summarizer"].summarize(job["title"], job["text"])
+        _finish(post_path, job, summary, cache, result)
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        _release(job)
+    return result
 
-        if yaml:
-            new_content = "---\n" + yaml.dump(fm, default_flow_style=False, allow_unicode=True).strip() + "\n---\n\n" + body_to_write
-        else:
-            fm_match = re.match(r"^---\s*\n(.*?)\n---\s*\n", content, re.DOTALL)
-            if fm_match:
-                fm_block = fm_match.group(1)
-                if summary and excerpt and fm.get("news_excerpt") is not False and "excerpt:" not in fm_block:
-                    fm_block = fm_block.rstrip() + "\nexcerpt: " + repr(excerpt) + "\n"
-                new_content = "---\n" + fm_block + "\n---\n\n" + body_to_write
-            else:
-                new_content = "---\n\n---\n\n" + body_to_write
-
-        post_path.write_text(new_content, encoding="utf-8")
-        result["cleaned"] = True
+
+async def acleanup_and_summarize_post(
+    post_path: Path,
+    cache: Optional[SummaryCache] = None,
+    boilerplate: Optional[BoilerplateIndex] = None,
+    summarizer: Optional[Summarizer] = None,
+    high_priority: bool = False,
+    latency_budget: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Async cleanup_and_summarize_post; the post is rewritten as soon as its summary returns."""
+    result: Dict[str, Any] = {"path": str(post_path), "cleaned": False, "summary_set": False}
+    job = None
+    try:
+        job = _plan(post_path, cache, boilerplate, summarizer, high_priority, latency_budget)
+        if job is None:
+            result["skipped"] = True
+            return result
+        if not _admit(job, high_priority, result):
+            return result
+        result["cached"] = bool(job["summary"])
+        summary = job["summary"]
+        if not summary and job["summarizer"] is not None:
+            summary = await job["summarizer"].asummarize(job["title"], job["text"])
+        _finish(post_path, job, summary, cache, result)
     except Exception as e:
         result["error"] = str(e)
+    finally:
+        _release(job)
     return result
 
 
-def cleanup_and_summarize_all_posts(posts_dir: Path) -> List[Dict[str, Any]]:
-    """Run cleanup + summarization on every .md file in posts_dir (non-dotfiles)."""
-    results = []
+def high_priority_posts(data_dir: Path) -> set[str]:
+    """Filenames of posts important_articles.json rates critical or high."""
+    try:
+        ranked = json.loads((data_dir / "important_articles.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return set()
+    by_relevance = ranked.get("by_relevance", {})
+    return {
+        Path(article["path"]).name
+        for level in HIGH_PRIORITY_RELEVANCE
+        for article in by_relevance.get(level, [])
+        if article.get("path")
+    }
+
+
+def _data_dir(posts_dir: Path, data_dir: Optional[Path]) -> Path:
+    return data_dir or Path(os.environ.get("LEGAL_LUMINARY_DATA", str(posts_dir.parent / "_data")))
+
+
+def _record_changes(posts_dir: Path, data_dir: Optional[Path], results: List[Dict[str, Any]]) -> None:
+    """Write the manifest of posts this run rewrote."""
+    write_manifest(_data_dir(posts_dir, data_dir), (r["path"] for r in results if r.get("changed")))
+
+
+def _posts_to_summarize(
+    posts_dir: Path, data_dir: Optional[Path]
+) -> tuple[List[Path], List[Dict[str, Any]], BoilerplateIndex, set[str]]:
+    """Split posts into (canonical posts to summarize, results for skipped near-duplicates).
+
+    Also returns the boilerplate index, updated with every raw post before
+    any is summarized, and the filenames of high-priority posts.
+    """
+    data_dir = _data_dir(posts_dir, data_dir)
+    detector = load_updated_detector(posts_dir, data_dir / "post_signatures.json")
+    boilerplate = load_updated_index(posts_dir, data_dir / BOILERPLATE_FILENAME)
+    todo: List[Path] = []
+    skipped: List[Dict[str, Any]] = []
     for path in sorted(posts_dir.glob("*.md")):
         if path.name.startswith("."):
             continue
-        results.append(cleanup_and_summarize_post(path))
+        if detector.is_duplicate(str(path)):
+            skipped.append(
+                {"path": str(path), "cleaned": False, "summary_set": False, "duplicate_of": detector.canonical_of(str(path))}
+            )
+            continue
+        todo.append(path)
+    return todo, skipped, boilerplate, high_priority_posts(data_dir)
+
+
+def cleanup_and_summarize_all_posts(
+    posts_dir: Path,
+    data_dir: Optional[Path] = None,
+    cache: Optional[SummaryCache] = None,
+    summarizer: Optional[Summarizer] = None,
+    latency_budget: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Run cleanup + summarization on every .md file in posts_dir (non-dotfiles).
+
+    Near-duplicates of an already-present post are skipped (result has
+    ``duplicate_of`` set) so each story is summarized once. The posts that
+    were rewritten are listed in the data directory's changed_posts.json.
+    """
+    todo, skipped, boilerplate, important = _posts_to_summarize(posts_dir, data_dir)
+    own_cache = cache is None
+    cache = cache or SummaryCache()
+    try:
+        results = skipped + [
+            cleanup_and_summarize_post(path, cache, boilerplate, summarizer, path.name in important, latency_budget)
+            for path in todo
+        ]
+    finally:
+        if own_cache:
+            cache.close()
+    _record_changes(posts_dir, data_dir, results)
+    return results
+
+
+async def acleanup_and_summarize_all_posts(
+    posts_dir: Path,
+    data_dir: Optional[Path] = None,
+    concurrency: int = SUMMARY_CONCURRENCY,
+    cache: Optional[SummaryCache] = None,
+    summarizer: Optional[Summarizer] = None,
+    latency_budget: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Async cleanup_and_summarize_all_posts with up to ``concurrency`` summaries in flight."""
+    todo, skipped, boilerplate, important = _posts_to_summarize(posts_dir, data_dir)
+    own_cache = cache is None
+    cache = cache or SummaryCache()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(path: Path) -> Dict[str, Any]:
+        async with semaphore:
+            return await acleanup_and_summarize_post(
+                path, cache, boilerplate, summarizer, path.name in important, latency_budget
+            )
+
+    try:
+        results = skipped + list(await asyncio.gather(*(_one(path) for path in todo)))
+    finally:
+        if own_cache:
+            cache.close()
+    _record_changes(posts_dir, data_dir, results)
+    return results
+
+
+def _batch_requests(job: Dict[str, Any], cache: SummaryCache) -> List[Dict[str, Any]]:
+    """Batch requests for one post: its map requests, or the single-shot/reduce request."""
+    key, title = job["key"], job["title"]
+    notes = cache.get(notes_key(key))
+    if notes:
+        return [batch_request(summary_id(key), summary_prompt(title, notes))]
+    prompts = map_prompts(title, job["text"])
+    if prompts is None:
+        return [batch_request(summary_id(key), summary_prompt(title, job["text"]))]
+    return [batch_request(map_id(key, i, len(prompts)), prompt) for i, prompt in enumerate(prompts, 1)]
+
+
+def export_summary_batch(
+    posts_dir: Path,
+    out_path: Path,
+    data_dir: Optional[Path] = None,
+    cache: Optional[SummaryCache] = None,
+) -> Dict[str, int]:
+    """Write a Batch API request file for every post that needs an OpenAI summary.
+
+    Posts whose summary is already cached get no request; ingest applies
+    them. Posts beyond MAX_BATCH_REQUESTS are left for the next export.
+    Returns counts of posts, requests, cached, current, deferred and
+    duplicates, plus the requests' estimated prompt_tokens.
+    """
+    todo, skipped, boilerplate, _ = _posts_to_summarize(posts_dir, data_dir)
+    counts = {"posts": 0, "requests": 0, "cached": 0, "current": 0, "deferred": 0, "duplicates": len(skipped)}
+    counts["prompt_tokens"] = 0
+    summarizer = OpenAISummarizer()
+    requests: Dict[str, Dict[str, Any]] = {}
+    own_cache = cache is None
+    cache = cache or SummaryCache()
+    try:
+        for path in todo:
+            job = _plan(path, cache, boilerplate, summarizer)
+            if job is None:
+                counts["current"] += 1
+                continue
+            if job["summary"]:
+                counts["cached"] += 1
+                continue
+            batch = [r for r in _batch_requests(job, cache) if r["custom_id"] not in requests]
+            if len(requests) + len(batch) > MAX_BATCH_REQUESTS:
+                counts["deferred"] += 1
+                continue
+            requests.update((r["custom_id"], r) for r in batch)
+            counts["posts"] += 1
+            counts["prompt_tokens"] += sum(estimate_tokens(r["body"]["messages"], summarizer.model) for r in batch)
+    finally:
+        if own_cache:
+            cache.close()
+    counts["requests"] = write_jsonl(out_path, requests.values())
+    return counts
+
+
+def ingest_summary_batch(
+    posts_dir: Path,
+    results_path: Path,
+    data_dir: Optional[Path] = None,
+    cache: Optional[SummaryCache] = None,
+) -> List[Dict[str, Any]]:
+    """Apply a Batch API results file to the posts it summarizes.
+
+    Each post is planned again and matched to the results by custom id, so
+    posts that changed since the export are simply not found (``missing``).
+    Summaries are cached like live ones. A long article whose map results
+    are all in the file has its notes cached and is marked ``pending``: the
+    next export sends its reduce request. Answers from another model (the
+    local stand-in) are applied and cached as TextRank summaries.
+    """
+    todo, skipped, boilerplate, _ = _posts_to_summarize(posts_dir, data_dir)
+    answers, failures = read_results(results_path)
+    summarizer = OpenAISummarizer()
+    stand_in = TextRankSummarizer()
+    own_cache = cache is None
+    cache = cache or SummaryCache()
+    results = list(skipped)
+    try:
+        for path in todo:
+            result: Dict[str, Any] = {"path": str(path), "cleaned": False, "summary_set": False}
+            results.append(result)
+            try:
+                job = _plan(path, cache, boilerplate, summarizer)
+                if job is None:
+                    result["skipped"] = True
+                    continue
+                key = job["key"]
+                if job["summary"]:
+                    result["cached"] = True
+                    _finish(path, job, job["summary"], cache, result)
+                    continue
+                if summary_id(key) in answers:
+                    summary, model = answers[summary_id(key)]
+                    if not is_summary_model(model):
+                        if job["resummarize"] and _quality(job["fm"].get("summary_backend", "openai")) > stand_in.quality:
+                            result["skipped"] = True
+                            continue
+                        job["summarizer"] = stand_in
+                        job["key"] = content_hash(*stand_in.identity(), job["title"], job["text"])
+                    _finish(path, job, summary, cache, result)
+                    continue
+                prompts = map_prompts(job["title"], job["text"]) or []
+                ids = [summary_id(key)] + [map_id(key, i, len(prompts)) for i in range(1, len(prompts) + 1)]
+                if prompts and all(i in answers for i in ids[1:]):
+                    cache.put_source(job["source_hash"], job["title"], job["text"])
+                    cache.put(notes_key(key), job["source_hash"], notes_text([answers[i][0] for i in ids[1:]]))
+                    result["pending"] = True
+                elif any(i in failures for i in ids):
+                    result["error"] = next(failures[i] for i in ids if i in failures)
+                else:
+                    result["missing"] = True
+            except Exception as e:
+                result["error"] = str(e)
+    finally:
+        if own_cache:
+            cache.close()
+    _record_changes(posts_dir, data_dir, results)
     return results
 
 
 def main() -> None:
-    import os
+    parser = argparse.ArgumentParser(description="Clean up and summarize Jekyll posts.")
+    parser.add_argument(
+        "--concurrency", type=int, default=SUMMARY_CONCURRENCY, help="Summaries in flight at once"
+    )
+    parser.add_argument(
+        "--backend", choices=["auto", *BACKENDS], default=os.environ.get("SUMMARY_BACKEND", "auto"),
+        help="Summarizer backend (auto: best for high-priority posts, cheapest otherwise)",
+    )
+    parser.add_argument(
+        "--latency-budget", type=float, default=None, help="Seconds one summary may take (auto selection)"
+    )
+    batch = parser.add_mutually_exclusive_group()
+    batch.add_argument(
+        "--export-batch", type=Path, metavar="FILE", help="Write OpenAI Batch API requests instead of summarizing"
+    )
+    batch.add_argument("--ingest-batch", type=Path, metavar="FILE", help="Apply a Batch API results file")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Token budget for this run's LLM calls")
+    parser.add_argument("--max-dollars", type=float, default=None, help="Dollar budget for this run's LLM calls")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Wall-time budget for this run")
+    args = parser.parse_args()
+    env = RunBudget.from_env()
+    start_run(
+        RunBudget(
+            args.max_tokens if args.max_tokens is not None else env.max_tokens,
+            args.max_dollars if args.max_dollars is not None else env.max_dollars,
+            args.max_seconds if args.max_seconds is not None else env.max_seconds,
+        )
+    )
+    summarizer = BACKENDS[args.backend]() if args.backend in BACKENDS else None
     posts_dir = Path(
         os.environ.get("LEGAL_LUMINARY_POSTS", "/Volumes/RepoPart1/legal-luminary/_posts")
     )
@@ -226,15 +690,53 @@ def main() -> None:
         return
     print("Cleanup and summarize posts")
     print("=" * 50)
-    print(f"  Posts: {posts_dir}")
-    results = cleanup_and_summarize_all_posts(posts_dir)
+    if args.export_batch:
+        counts = export_summary_batch(posts_dir, args.export_batch)
+        print(f"  Wrote {counts['requests']} requests for {counts['posts']} posts to {args.export_batch}")
+        print(f"  {counts['cached']} already cached (apply with --ingest-batch), {counts['current']} up to date, "
+              f"{counts['duplicates']} duplicates skipped, {counts['deferred']} left for the next export.")
+        model = OpenAISummarizer().model
+        completion = counts["requests"] * EXPECTED_COMPLETION_TOKENS
+        print(f"  Estimated {counts['prompt_tokens']} prompt tokens, "
+              f"${cost(model, counts['prompt_tokens'], completion):.4f} at {model} list price.")
+        return
+    if args.ingest_batch:
+        print(f"  Posts: {posts_dir} (batch results {args.ingest_batch})")
+        results = ingest_summary_batch(posts_dir, args.ingest_batch)
+        pending = sum(1 for r in results if r.get("pending"))
+        missing = sum(1 for r in results if r.get("missing"))
+        print(f"  {pending} long posts need a reduce round (export again), {missing} not in the results file.")
+    else:
+        print(f"  Posts: {posts_dir} (backend {args.backend}, concurrency {args.concurrency})")
+        results = asyncio.run(
+            acleanup_and_summarize_all_posts(
+                posts_dir, concurrency=args.concurrency, summarizer=summarizer, latency_budget=args.latency_budget
+            )
+        )
     cleaned = sum(1 for r in results if r.get("cleaned"))
+    changed = sum(1 for r in results if r.get("changed"))
     summarized = sum(1 for r in results if r.get("summary_set"))
+    duplicates = sum(1 for r in results if r.get("duplicate_of"))
+    current = sum(1 for r in results if r.get("skipped"))
+    cached = sum(1 for r in results if r.get("cached"))
+    deferred = sum(1 for r in results if r.get("deferred"))
     errors = [r for r in results if r.get("error")]
-    print(f"\nDone: {len(results)} posts processed, {cleaned} cleaned, {summarized} summarized.")
+    print(f"\nDone: {len(results)} posts processed, {cleaned} cleaned, {summarized} summarized ({cached} from cache), "
+          f"{current} already up to date, {duplicates} duplicates skipped.")
+    if deferred:
+        print(f"  {deferred} posts deferred by the run budget (run again to summarize them).")
+    print(f"  {changed} files rewritten (see changed_posts.json), {cleaned - changed} already identical.")
+    backends: Dict[str, int] = {}
+    for r in results:
+        if r.get("backend"):
+            backends[r["backend"]] = backends.get(r["backend"], 0) + 1
+    if backends:
+        print("  Backends: " + ", ".join(f"{name} {count}" for name, count in sorted(backends.items())))
     if errors:
         for r in errors:
             print(f"  Error {r['path']}: {r['error']}")
+    print()
+    print(ledger().report())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+"""Crawl throughput benchmark against the offline replay server.
+
+Runs date_aware_crawler.crawl_all over a recorded archive (see crawl_replay)
+served locally, with a throwaway frontier, HTTP cache and feed state so every
+run starts cold, and reports pages per second, p50/p95 page latency, bytes
+served and peak browser memory. Nothing is written to _posts.
+
+Usage (from the project root, after ``crawl_replay.py record``):
+    PYTHONPATH=src python3 src/agent/crawl_benchmark.py --latency 0.2 --error-rate 0.05
+    PYTHONPATH=src python3 src/agent/crawl_benchmark.py --no-http   # browser only
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent.browser_resources import BrowserResources, browser_rss_bytes
+from agent.crawl_frontier import CrawlFrontier
+from agent.crawl_replay import ARCHIVE_DIR, ReplayArchive, ReplayServer
+from agent.crawl_scheduler import CrawlStats, Deadline, HostLimiter
+from agent.date_aware_crawler import crawl_all
+from agent.feed_discovery import FeedDiscovery
+from agent.http_cache import HttpCache
+from agent.http_fetch import HttpFetcher
+from agent.resource_blocking import ResourceBlocker
+
+MEMORY_SAMPLE_SECONDS = 0.5
+
+
+class MemorySampler:
+    """Polls browser_rss_bytes in the background and keeps the peak."""
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_SECONDS):
+        """Sample every ``interval`` seconds once started."""
+        self.interval = interval
+        self.peak = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def _run(self) -> None:
+        while True:
+            rss = await asyncio.to_thread(browser_rss_bytes)
+            self.peak = max(self.peak, rss)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling; peak keeps the highest reading."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+def replay_sources(archive: ReplayArchive, server: ReplayServer) -> List[Tuple[str, str]]:
+    """Return (name, local index URL) for each recorded source, as crawl_all takes them."""
+    return [(name, server.url_for(source["index"])) for name, source in archive.sources.items()]
+
+
+async def run_benchmark(
+    archive: ReplayArchive,
+    server: ReplayServer,
+    state_dir: Path,
+    use_http: bool = True,
+    max_concurrency: int = 8,
+    deadline_seconds: float = 120.0,
+    launch_options: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Crawl the replayed sources once and return the measured figures."""
+    sources = replay_sources(archive, server)
+    allowed = archive.hosts()
+    fetcher = HttpFetcher(cache=HttpCache(state_dir / "cache.sqlite3")) if use_http else None
+    frontier = CrawlFrontier(state_dir / "frontier.sqlite3")
+    feeds = None
+    if fetcher is not None:
+        feeds = FeedDiscovery(fetcher, state_path=state_dir / "feeds.json")
+        # Point each source at its recorded feed so discovery does not probe live URLs.
+        for name, source in archive.sources.items():
+            feed_url = source["feed"]
+            feed = server.url_for(feed_url) if feed_url else None
+            feeds.state[name] = {"feed": feed, "checked_at": time.time()}
+    else:
+        fetcher = HttpFetcher(js_required=frozenset({"127.0.0.1"}))
+
+    stats = CrawlStats()
+    resources = BrowserResources(state_dir=None)
+    memory = MemorySampler()
+    memory.start()
+    started = time.monotonic()
+    # Every replayed source shares one host, so the per-host cap is the global one.
+    articles = await crawl_all(
+        sources, allowed, fetcher, frontier, feeds, ResourceBlocker(),
+        limiter=HostLimiter(max_concurrency, per_host=max_concurrency),
+        deadline=Deadline(deadline_seconds),
+        stats=stats,
+        launch_options=launch_options,
+        resources=resources,
+    )
+    elapsed = time.monotonic() - started
+    await memory.stop()
+    await fetcher.close()
+    frontier.close()
+
+    return {
+        "articles": len(articles),
+        "pages": len(stats.latencies),
+        "failed": stats.failures,
+        "seconds": elapsed,
+        "pages_per_second": len(stats.latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": stats.percentile(50) * 1000,
+        "p95_ms": stats.percentile(95) * 1000,
+        "bytes_served": server.bytes_served,
+        "requests": server.requests,
+        "peak_browser_mb": memory.peak / 1_000_000,
+        "contexts": resources.summary(),
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line and print each run's figures."""
+    parser = argparse.ArgumentParser(description="Benchmark the crawler against recorded responses.")
+    parser.add_argument("--archive", type=Path, default=ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean added latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max in-flight page loads")
+    parser.add_argument("--runs", type=int, default=1, help="Repeat the crawl this many times")
+    parser.add_argument("--no-http", action="store_true", help="Disable the HTTP fast path")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for simulated latency/errors")
+    args = parser.parse_args()
+
+    archive = ReplayArchive(args.archive)
+    if not archive.sources:
+        print(f"No recorded sources in {args.archive}; run crawl_replay.py record first.")
+        return
+
+    for run in range(1, args.runs + 1):
+        server = ReplayServer(archive, args.latency, args.jitter, args.error_rate, seed=args.seed)
+        with server, tempfile.TemporaryDirectory() as state_dir:
+            result = asyncio.run(
+                run_benchmark(archive, server, Path(state_dir), not args.no_http, args.concurrency,
+                              launch_options={"headless": True})
+            )
+        print(f"Run {run}:")
+        print(f"  {result['pages']} pages ({result['failed']} failed) in {result['seconds']:.1f}s "
+              f"-> {result['pages_per_second']:.2f} pages/s")
+        print(f"  page latency p50 {result['p50_ms']:.0f} ms, p95 {result['p95_ms']:.0f} ms")
+        print(f"  {result['requests']} requests, {result['bytes_served'] / 1_000_000:.1f} MB served")
+        print(f"  peak browser memory {result['peak_browser_mb']:.0f} MB")
+        print(f"  contexts: {result['contexts']}")
+
+
+if __name__ == "__main__":
+    main()
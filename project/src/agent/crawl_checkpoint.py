@@ -0,0 +1,77 @@
+"""Append-only checkpoint log for resumable crawls.
+
+Every relevant article is appended to output/crawl_state/checkpoint.jsonl the
+moment it is extracted, and a matching ``written`` record follows once its
+post is on disk. If the crawler dies (a Chromium crash, an HPCC job hitting
+its time limit), the next run replays the articles that were extracted but
+never written before crawling anything; the URLs they came from are then
+ingested in the frontier, which is itself committed after every fetch, so no
+completed page is fetched again. A run that finishes cleanly truncates the
+log.
+
+Records are single JSON lines flushed as they are written; a line torn by a
+crash mid-write is ignored on load.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+CHECKPOINT_PATH = _PROJECT_ROOT / "output" / "crawl_state" / "checkpoint.jsonl"
+
+
+def _key(article: Dict[str, Any]) -> str:
+    return article.get("url", "")
+
+
+class CrawlCheckpoint:
+    """Append-only JSONL log of extracted and written articles."""
+
+    def __init__(self, path: Path = CHECKPOINT_PATH):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a", encoding="utf-8")
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def record_article(self, article: Dict[str, Any]) -> None:
+        """Log an extracted article before anything is written for it."""
+        self._append({"type": "article", "article": article})
+
+    def record_written(self, article: Dict[str, Any], post_path: str = "") -> None:
+        """Log that article's post is on disk (or it was a duplicate and needs none)."""
+        self._append({"type": "written", "url": _key(article), "post": post_path})
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Articles logged as extracted but never written, in extraction order."""
+        articles: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return []
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("type") == "article":
+                    articles[_key(record["article"])] = record["article"]
+                elif record.get("type") == "written":
+                    articles.pop(record.get("url", ""), None)
+        return list(articles.values())
+
+    def clear(self) -> None:
+        """Truncate the log after a run whose articles are all written."""
+        self._file.close()
+        self._file = self.path.open("w", encoding="utf-8")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
@@ -0,0 +1,172 @@
+"""Persistent URL frontier and seen-set for the news crawler.
+
+Every article URL the crawler discovers is normalized and recorded in SQLite
+(output/crawl_state/frontier.sqlite3) with its last fetch time, a hash of the
+extracted text and its outcome. Later runs consult it before navigating:
+URLs that were already ingested as posts, or fetched and found irrelevant,
+are skipped, and link discovery stops once it runs into a streak of known
+URLs (index pages list newest first), so a recrawl only fetches new articles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+FRONTIER_PATH = _PROJECT_ROOT / "output" / "crawl_state" / "frontier.sqlite3"
+
+# Outcomes that mean a URL never needs fetching again.
+DONE_STATUSES = ("ingested", "irrelevant")
+# Consecutive known links after which the rest of an index page is skipped.
+KNOWN_STREAK_STOP = 5
+# Seconds to wait for another process holding the database lock.
+SQLITE_TIMEOUT = 30.0
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "outputtype", "cmpid")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    source TEXT,
+    status TEXT NOT NULL DEFAULT 'discovered',
+    first_seen REAL NOT NULL,
+    last_fetched REAL,
+    content_hash TEXT,
+    post_path TEXT
+)
+"""
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the frontier key.
+
+    Lowercases scheme and host, drops ``www.``, default ports, fragments and
+    tracking parameters, sorts the remaining query, and strips a trailing
+    slash from non-root paths.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit(((parts.scheme or "https").lower(), host, path, urlencode(query), ""))
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of text, stored to spot re-published articles."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CrawlFrontier:
+    """SQLite-backed record of discovered, fetched and ingested URLs."""
+
+    def __init__(self, path: Path = FRONTIER_PATH):
+        """Open (or create) the frontier database at path."""
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Crawl worker processes share this file; WAL lets them read while one writes.
+        self._db = sqlite3.connect(str(path), timeout=SQLITE_TIMEOUT)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def status(self, url: str) -> Optional[str]:
+        """Return url's recorded status, or None if it was never seen."""
+        row = self._db.execute(
+            "SELECT status FROM urls WHERE url = ?", (normalize_url(url),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def is_done(self, url: str) -> bool:
+        """Return True if url was already ingested or fetched and found irrelevant."""
+        return self.status(url) in DONE_STATUSES
+
+    def filter_new(
+        self,
+        urls: Iterable[str],
+        source: str = "",
+        stop_after_known: int = KNOWN_STREAK_STOP,
+    ) -> List[str]:
+        """Return the URLs that still need fetching, in order, recording them as discovered.
+
+        Scanning stops after ``stop_after_known`` consecutive done URLs, since
+        everything further down a newest-first index page is older still.
+        """
+        fresh: List[str] = []
+        seen = set()
+        streak = 0
+        now = time.time()
+        for url in urls:
+            key = normalize_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            if self.is_done(url):
+                streak += 1
+                if streak >= stop_after_known:
+                    break
+                continue
+            streak = 0
+            self._db.execute(
+                "INSERT OR IGNORE INTO urls (url, source, first_seen) VALUES (?, ?, ?)",
+                (key, source, now),
+            )
+            fresh.append(url)
+        self._db.commit()
+        return fresh
+
+    def mark_fetched(self, url: str, status: str, text: str = "", source: str = "") -> None:
+        """Record a fetch outcome ("relevant", "irrelevant" or "failed")."""
+        now = time.time()
+        self._db.execute(
+            """INSERT INTO urls (url, source, status, first_seen, last_fetched, content_hash)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(url) DO UPDATE SET
+                   status = CASE WHEN urls.status = 'ingested' THEN urls.status ELSE excluded.status END,
+                   last_fetched = excluded.last_fetched,
+                   content_hash = COALESCE(excluded.content_hash, urls.content_hash)""",
+            (normalize_url(url), source, status, now, now, content_hash(text) if text else None),
+        )
+        self._db.commit()
+
+    def mark_ingested(self, url: str, post_path: str = "") -> None:
+        """Record that url now has a post on disk."""
+        now = time.time()
+        self._db.execute(
+            """INSERT INTO urls (url, status, first_seen, post_path) VALUES (?, 'ingested', ?, ?)
+               ON CONFLICT(url) DO UPDATE SET status = 'ingested', post_path = excluded.post_path""",
+            (normalize_url(url), now, post_path),
+        )
+        self._db.commit()
+
+    def has_content(self, text: str) -> bool:
+        """Return True if an ingested URL already carried exactly this text."""
+        row = self._db.execute(
+            "SELECT 1 FROM urls WHERE content_hash = ? AND status = 'ingested' LIMIT 1",
+            (content_hash(text),),
+        ).fetchone()
+        return row is not None
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of URLs in each status."""
+        return dict(self._db.execute("SELECT status, COUNT(*) FROM urls GROUP BY status").fetchall())
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self._db.commit()
+        self._db.close()
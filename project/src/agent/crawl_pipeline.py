@@ -0,0 +1,276 @@
+"""Streaming crawl -> write -> validate -> summarize pipeline.
+
+date_aware_crawler.stream_all yields articles as they are extracted; each
+stage here runs as its own task and hands its output to the next through a
+bounded asyncio.Queue, so a post is written, scored and summarized while the
+rest of the crawl is still running, and a slow stage (the LLM) holds the
+crawl back instead of letting articles pile up in memory.
+
+Stages:
+  write      PostWriter: (title, date) dedup, post file, frontier, checkpoint.
+  validate   ValidatorWatcher.add_post: near-duplicate check and relevance
+             score; important_articles.json is rewritten on its debounce.
+  summarize  cleanup_summarize.acleanup_and_summarize_post for posts that
+             are not near-duplicates; posts the validate stage rates
+             critical or high get the best available summarizer backend.
+
+Every post the run wrote or rewrote is listed in _data/changed_posts.json.
+
+Usage (from the project root):
+    PYTHONPATH=src python3 src/agent/crawl_pipeline.py --summarize
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Set
+
+from agent.boilerplate import BOILERPLATE_FILENAME, BoilerplateIndex, load_updated_index
+from agent.browser_resources import BrowserResources
+from agent.crawl_checkpoint import CrawlCheckpoint
+from agent.crawl_frontier import CrawlFrontier
+from agent.crawl_scheduler import (
+    CRAWL_DEADLINE_SECONDS,
+    STREAM_QUEUE_SIZE,
+    CrawlStats,
+    Deadline,
+)
+from agent.date_aware_crawler import (
+    OUTPUT_DIR,
+    SOURCES,
+    PostWriter,
+    load_allowlist,
+    polite_limiter,
+    stream_all,
+)
+from agent.feed_discovery import FeedDiscovery
+from agent.http_cache import HttpCache
+from agent.http_fetch import HttpFetcher
+from agent.llm_budget import ledger
+from agent.near_duplicates import load_updated_detector
+from agent.post_io import write_manifest
+from agent.resource_blocking import ResourceBlocker
+from agent.summary_cache import SummaryCache
+
+# Marks the end of the stream for the next stage.
+_END = None
+
+
+class CrawlPipeline:
+    """Runs the stages over one crawl, connected by bounded queues."""
+
+    def __init__(
+        self,
+        writer: PostWriter,
+        data_dir: Path,
+        validate: bool = True,
+        summarize: bool = False,
+        queue_size: int = STREAM_QUEUE_SIZE,
+    ):
+        """Create the pipeline.
+
+        Args:
+            writer: Writes posts (and owns dedup, frontier and checkpoint).
+            data_dir: Jekyll _data directory for important_articles.json and signatures.
+            validate: Score each new post and keep important_articles.json current.
+            summarize: Clean up and LLM-summarize each new non-duplicate post.
+            queue_size: Items buffered between consecutive stages.
+        """
+        self.writer = writer
+        self.data_dir = data_dir
+        self.validate = validate
+        self.summarize = summarize
+        self.queue_size = queue_size
+        self.counts = {"articles": 0, "written": 0, "validated": 0, "duplicates": 0, "summarized": 0}
+        self.watcher: Any = None
+        self.detector: Any = None
+        self.summaries: Optional[SummaryCache] = None
+        self.boilerplate: Optional[BoilerplateIndex] = None
+        # Posts written or rewritten this run, for changed_posts.json.
+        self.changed: Set[str] = set()
+
+    async def _write_stage(
+        self, inbox: asyncio.Queue[Optional[Dict[str, Any]]], outbox: Optional[asyncio.Queue[Optional[Path]]]
+    ) -> None:
+        while (article := await inbox.get()) is not _END:
+            self.counts["articles"] += 1
+            path = self.writer.write(article)
+            if path is None:
+                continue
+            self.counts["written"] += 1
+            self.changed.add(str(path))
+            if outbox is not None:
+                await outbox.put(path)
+        if outbox is not None:
+            await outbox.put(_END)
+
+    async def _validate_stage(
+        self, inbox: asyncio.Queue[Optional[Path]], outbox: Optional[asyncio.Queue[Optional[Path]]]
+    ) -> None:
+        while (path := await inbox.get()) is not _END:
+            duplicate = self.watcher.add_post(path)
+            self.counts["duplicates" if duplicate else "validated"] += 1
+            self.watcher.flush()
+            if outbox is not None and not duplicate:
+                await outbox.put(path)
+        if outbox is not None:
+            await outbox.put(_END)
+
+    async def _summarize_stage(self, inbox: asyncio.Queue[Optional[Path]]) -> None:
+        from agent.cleanup_summarize import (
+            HIGH_PRIORITY_RELEVANCE,
+            acleanup_and_summarize_post,
+        )
+
+        while (path := await inbox.get()) is not _END:
+            if self.detector is not None:
+                self.detector.add_post(path)
+                if self.detector.is_duplicate(str(path)):
+                    self.counts["duplicates"] += 1
+                    continue
+            if self.boilerplate is not None:
+                # Learn this post's lines before cleaning it, while the body is still raw.
+                self.boilerplate.add_post(path)
+            ranked = self.watcher.result(path) if self.watcher is not None else None
+            result = await acleanup_and_summarize_post(
+                path,
+                cache=self.summaries,
+                boilerplate=self.boilerplate,
+                high_priority=bool(ranked and ranked["relevance"] in HIGH_PRIORITY_RELEVANCE),
+            )
+            if result.get("changed"):
+                self.changed.add(str(path))
+            if result.get("error"):
+                print(f"  Summarize failed for {path.name}: {result['error']}")
+            elif result.get("summary_set"):
+                self.counts["summarized"] += 1
+                print(f"  Summarized: {path.name}")
+            if self.watcher is not None and result.get("cleaned"):
+                # The post was rewritten; re-score the summarized text.
+                self.watcher.add_post(path)
+
+    def _open_stages(self) -> None:
+        posts_dir = self.writer.output_dir
+        if self.validate:
+            from agent.evidence_validator import ValidatorWatcher
+
+            self.watcher = ValidatorWatcher(posts_dir, self.data_dir)
+            # Rank what is already on disk so the output is never just this run's posts.
+            self.watcher.poll()
+        elif self.summarize:
+            self.detector = load_updated_detector(posts_dir, self.data_dir / "post_signatures.json")
+        if self.summarize:
+            self.summaries = SummaryCache()
+            self.boilerplate = load_updated_index(posts_dir, self.data_dir / BOILERPLATE_FILENAME)
+
+    def _close_stages(self) -> None:
+        if self.watcher is not None:
+            self.watcher.flush(force=True)
+            # flush only saves signatures when the ranking changed; new posts may not have.
+            self.detector = self.watcher.detector
+        if self.detector is not None:
+            self.detector.save(self.data_dir / "post_signatures.json")
+        if self.boilerplate is not None:
+            self.boilerplate.save(self.data_dir / BOILERPLATE_FILENAME)
+        if self.summaries is not None:
+            print(f"Summaries: {self.summaries.summary()}")
+            self.summaries.close()
+            print(ledger().report())
+        write_manifest(self.data_dir, self.changed)
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue[Any], item: Any, tasks: Sequence[asyncio.Future[None]]) -> None:
+        """Put item on queue, raising instead if a stage fails while the queue is full."""
+        put = asyncio.ensure_future(queue.put(item))
+        pending: Set[asyncio.Future[None]] = {put, *tasks}
+        while not put.done():
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = None if task is put or task.cancelled() else task.exception()
+                if error is not None:
+                    # The stage is gone, so nothing will drain the queue.
+                    put.cancel()
+                    raise error
+
+    async def run(self, articles: Any) -> Dict[str, int]:
+        """Push every article from an async iterator through the stages; return stage counts."""
+        self._open_stages()
+        to_write: asyncio.Queue[Optional[Dict[str, Any]]] = asyncio.Queue(self.queue_size)
+        to_validate: Optional[asyncio.Queue[Optional[Path]]] = asyncio.Queue(self.queue_size) if self.validate else None
+        to_summarize: Optional[asyncio.Queue[Optional[Path]]] = asyncio.Queue(self.queue_size) if self.summarize else None
+
+        stages = [self._write_stage(to_write, to_validate or to_summarize)]
+        if to_validate is not None:
+            stages.append(self._validate_stage(to_validate, to_summarize))
+        if to_summarize is not None:
+            stages.append(self._summarize_stage(to_summarize))
+        tasks = [asyncio.ensure_future(stage) for stage in stages]
+
+        try:
+            async for article in articles:
+                await self._put(to_write, article, tasks)
+            await self._put(to_write, _END, tasks)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._close_stages()
+        return self.counts
+
+
+async def main(validate: bool = True, summarize: bool = False, queue_size: int = STREAM_QUEUE_SIZE) -> None:
+    print("Starting Streaming Crawl Pipeline...")
+    print("=" * 50)
+
+    allowlist = load_allowlist()
+    allowed = [d.lower().replace("www.", "") for d in allowlist.get("domains", [])]
+    data_dir = Path(os.environ.get("LEGAL_LUMINARY_DATA", str(OUTPUT_DIR.parent / "_data")))
+
+    blocker = ResourceBlocker.from_config()
+    fetcher = HttpFetcher(cache=HttpCache())
+    limiter = polite_limiter(fetcher)
+    frontier = CrawlFrontier()
+    feeds = FeedDiscovery(fetcher)
+    stats = CrawlStats()
+    checkpoint = CrawlCheckpoint()
+    writer = PostWriter(OUTPUT_DIR, frontier, checkpoint=checkpoint)
+    writer.resume()
+    resources = BrowserResources()
+
+    pipeline = CrawlPipeline(writer, data_dir, validate, summarize, queue_size)
+    counts = await pipeline.run(
+        stream_all(
+            SOURCES, allowed, fetcher, frontier, feeds, blocker, limiter,
+            deadline=Deadline(CRAWL_DEADLINE_SECONDS), stats=stats, resources=resources,
+            queue_size=queue_size,
+        )
+    )
+    writer.finish()
+    checkpoint.close()
+    feeds.save()
+    if limiter.politeness is not None and limiter.politeness.robots is not None:
+        limiter.politeness.robots.save()
+    await fetcher.close()
+
+    print(f"Pages: {stats.summary()}")
+    print(f"Browser: {resources.summary()}")
+    print(f"Frontier: {frontier.counts()}")
+    frontier.close()
+    print(
+        f"\nDone! {counts['articles']} articles, {counts['written']} new posts, "
+        f"{counts['validated']} scored, {counts['duplicates']} near-duplicates, "
+        f"{counts['summarized']} summarized."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl and stream new posts through validation and summarization.")
+    parser.add_argument("--no-validate", dest="validate", action="store_false", help="Skip relevance scoring")
+    parser.add_argument("--summarize", action="store_true", help="Clean up and LLM-summarize each new post")
+    parser.add_argument("--queue-size", type=int, default=STREAM_QUEUE_SIZE, help="Items buffered per stage")
+    args = parser.parse_args()
+    asyncio.run(main(args.validate, args.summarize, args.queue_size))
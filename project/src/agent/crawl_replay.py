@@ -0,0 +1,318 @@
+"""Record/replay harness for offline crawls.
+
+``record`` fetches each source's index page, its feed and the article pages
+they link to over HTTP and stores the responses in an archive directory
+(index.json plus one body file per response). ReplayServer serves that
+archive from a local ThreadingHTTPServer at ``http://127.0.0.1:PORT/<host><path>``
+with simulated latency and server errors, rewriting links to archived hosts so
+the crawler stays on the stand-in. crawl_benchmark runs date_aware_crawler
+against it.
+
+Usage (from the project root):
+    PYTHONPATH=src python3 src/agent/crawl_replay.py record
+    PYTHONPATH=src python3 src/agent/crawl_replay.py serve --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+from urllib.parse import urlsplit
+
+from agent.feed_discovery import FeedDiscovery
+from agent.http_fetch import HttpFetcher
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+ARCHIVE_DIR = _PROJECT_ROOT / "output" / "crawl_replay"
+# Articles recorded per source (matches date_aware_crawler.MAX_ARTICLES_PER_SOURCE).
+RECORD_ARTICLES_PER_SOURCE = 20
+
+_TEXT_TYPES = ("html", "xml", "rss", "atom", "json", "text/")
+_ROOT_RELATIVE_RE = re.compile(r"""\b(href|src|action)=(["'])/(?!/)""")
+
+
+def archive_key(url: str) -> str:
+    """``host/path?query`` with ``www.`` dropped, used to look responses up."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    key = host + (parts.path or "/")
+    return f"{key}?{parts.query}" if parts.query else key
+
+
+class ReplaySource(TypedDict):
+    """A recorded source: its index page URL and the feed URL it used, if any."""
+
+    index: str
+    feed: Optional[str]
+
+
+class ReplayArchive:
+    """Recorded responses on disk: index.json maps archive_key -> status, type, body file."""
+
+    def __init__(self, path: Path = ARCHIVE_DIR):
+        """Open the archive at path, loading its index.json if one was saved."""
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.sources: Dict[str, ReplaySource] = {}
+        index_path = path / "index.json"
+        if index_path.exists():
+            data = json.loads(index_path.read_text())
+            self.entries = data.get("entries", {})
+            self.sources = data.get("sources", {})
+
+    def add(self, url: str, body: bytes, content_type: str = "text/html", status: int = 200) -> None:
+        """Store a response body for url (index.json is written by save)."""
+        key = archive_key(url)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".bin"
+        (self.path / "bodies").mkdir(parents=True, exist_ok=True)
+        (self.path / "bodies" / name).write_bytes(body)
+        self.entries[key] = {"url": url, "status": status, "content_type": content_type, "body": name}
+
+    def lookup(self, key: str) -> Optional[Tuple[int, str, bytes]]:
+        """Return (status, content_type, body) for an archive key, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        body = (self.path / "bodies" / entry["body"]).read_bytes()
+        return entry["status"], entry["content_type"], body
+
+    def hosts(self) -> List[str]:
+        """Return the sorted hosts that have archived responses."""
+        return sorted({key.split("/", 1)[0] for key in self.entries})
+
+    def save(self) -> None:
+        """Write index.json with the recorded sources and entries."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / "index.json").write_text(
+            json.dumps({"sources": self.sources, "entries": self.entries}, indent=2)
+        )
+
+
+async def record(
+    sources: List[Tuple[str, str]],
+    archive: ReplayArchive,
+    fetcher: HttpFetcher,
+    per_source: int = RECORD_ARTICLES_PER_SOURCE,
+) -> int:
+    """Record index pages, feeds and linked article pages for each source.
+
+    Returns:
+        Number of responses added to the archive.
+    """
+    added = 0
+
+    async def _store(url: str) -> bool:
+        nonlocal added
+        result = await fetcher.get(url)
+        if result is None:
+            return False
+        archive.add(url, result[0], result[1])
+        added += 1
+        return True
+
+    for name, index_url in sources:
+        print(f"Recording {name}...")
+        await _store(index_url)
+        feeds = FeedDiscovery(fetcher, state_path=archive.path / "feeds.json")
+        items = await feeds.discover(name, index_url)
+        feed_url = (feeds.state.get(name) or {}).get("feed")
+        if feed_url:
+            await _store(feed_url)
+        archive.sources[name] = {"index": index_url, "feed": feed_url}
+
+        hrefs = [item["href"] for item in items]
+        hrefs += [
+            link["href"]
+            for link in await fetcher.discover_links(index_url)
+            if len(link["text"]) > 15 and "/news/" in link["href"]
+        ]
+        stored = 0
+        for href in dict.fromkeys(hrefs):
+            if stored >= per_source:
+                break
+            if await _store(href):
+                stored += 1
+        print(f"  {stored} articles")
+    archive.save()
+    return added
+
+
+class ReplayServer:
+    """Serves a ReplayArchive locally with simulated latency and errors."""
+
+    def __init__(
+        self,
+        archive: ReplayArchive,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        """Create the server (not started).
+
+        Args:
+            archive: Recorded responses to serve.
+            latency: Mean seconds added before each response.
+            jitter: Uniform +/- seconds around latency.
+            error_rate: Fraction of requests answered with a 500.
+            port: Port to bind on 127.0.0.1 (0 picks a free one).
+            seed: Seed for the latency/error RNG, for reproducible runs.
+        """
+        self.archive = archive
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self.not_found = 0
+        self.bytes_served = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._hosts = archive.hosts()
+
+    @property
+    def base_url(self) -> str:
+        """Return the server's root URL on 127.0.0.1."""
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def url_for(self, url: str) -> str:
+        """Local URL under which the archived response for url is served."""
+        return f"{self.base_url}/{archive_key(url)}"
+
+    def rewrite(self, body: bytes, host: str) -> bytes:
+        """Point absolute links to archived hosts, and root-relative links, at the server."""
+        text = body.decode("utf-8", errors="replace")
+        for archived in self._hosts:
+            local = f"{self.base_url}/{archived}"
+            for prefix in (f"https://www.{archived}", f"http://www.{archived}",
+                           f"https://{archived}", f"http://{archived}"):
+                text = text.replace(prefix, local)
+        text = _ROOT_RELATIVE_RE.sub(rf"\1=\2/{host}/", text)
+        return text.encode("utf-8")
+
+    def _respond(self, path: str) -> Tuple[int, str, bytes]:
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.error_rate
+        time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.errors += 1
+            return 500, "text/plain", b"simulated server error"
+        found = self.archive.lookup(path.lstrip("/"))
+        if found is None:
+            with self._lock:
+                self.not_found += 1
+            return 404, "text/plain", b"not in archive"
+        status, content_type, body = found
+        if any(t in content_type for t in _TEXT_TYPES):
+            body = self.rewrite(body, path.lstrip("/").split("/", 1)[0])
+        return status, content_type, body
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                status, content_type, body = server._respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.bytes_served += len(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return _Handler
+
+    def start(self) -> ReplayServer:
+        """Serve in a daemon thread and return self."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down and close its socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> ReplayServer:
+        """Start the server for the duration of a with block."""
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        """Stop the server."""
+        self.stop()
+
+    def summary(self) -> str:
+        """Return request, error and byte counts for this server's lifetime."""
+        return (
+            f"{self.requests} requests, {self.errors} simulated errors, "
+            f"{self.not_found} not archived, {self.bytes_served / 1_000_000:.1f} MB served"
+        )
+
+
+async def _record_main(archive_dir: Path) -> None:
+    from agent.date_aware_crawler import SOURCES
+
+    fetcher = HttpFetcher()
+    if not fetcher.enabled:
+        print("httpx is required to record an archive.")
+        return
+    archive = ReplayArchive(archive_dir)
+    added = await record(SOURCES, archive, fetcher)
+    await fetcher.close()
+    print(f"Recorded {added} responses to {archive_dir}")
+
+
+def main() -> None:
+    """Record an archive or serve one, from the command line."""
+    parser = argparse.ArgumentParser(description="Record or replay crawl responses offline.")
+    parser.add_argument("command", choices=["record", "serve"])
+    parser.add_argument("--archive", type=Path, default=ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean added latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(_record_main(args.archive))
+        return
+
+    archive = ReplayArchive(args.archive)
+    server = ReplayServer(archive, args.latency, args.jitter, args.error_rate, port=args.port)
+    with server:
+        for name, source in archive.sources.items():
+            print(f"{name}: {server.url_for(source['index'])}")
+        print(f"Serving {len(archive.entries)} responses at {server.base_url} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print(server.summary())
+
+
+if __name__ == "__main__":
+    main()
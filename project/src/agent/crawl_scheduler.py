@@ -0,0 +1,294 @@
+"""Concurrency primitives for the async news crawler.
+
+HostLimiter caps in-flight requests globally and per host (and, with a
+Politeness attached, paces each host's request rate); PagePool hands out
+a fixed set of browser pages for one source so its article fetches run in
+parallel without opening a page per link; Deadline tracks a single global
+cut-off so a slow site cannot hold up the whole crawl; iter_until and
+merge_until stream results out as they complete instead of collecting them;
+CrawlStats collects per-page latencies for the crawl summary and benchmarks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from agent.politeness import MAX_TIMEOUT_SECONDS, Politeness
+
+MAX_CONCURRENCY = 8
+PER_HOST_CONCURRENCY = 3
+PAGES_PER_SOURCE = 3
+CRAWL_DEADLINE_SECONDS = 300.0
+# Articles buffered between the crawl and the stages consuming it.
+STREAM_QUEUE_SIZE = 16
+# Extra seconds a whole source gets past the deadline to hand back partial results.
+SOURCE_GRACE_SECONDS = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host of url without a leading www."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class HostLimiter:
+    """Caps concurrent requests globally and per host."""
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        per_host: int = PER_HOST_CONCURRENCY,
+        politeness: Optional[Politeness] = None,
+    ):
+        """Create the limiter.
+
+        Args:
+            max_concurrency: Maximum in-flight requests across all hosts.
+            per_host: Maximum in-flight requests to any single host.
+            politeness: Optional per-host rate limiting and backoff, applied
+                before a global slot is taken.
+        """
+        self.per_host = per_host
+        self.politeness = politeness
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one global and one per-host slot for the duration of a request."""
+        host = host_of(url)
+        host_sem = self._hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with host_sem:
+            if self.politeness is not None:
+                await self.politeness.wait(host, url)
+            async with self._global:
+                self.in_flight[host] = self.in_flight.get(host, 0) + 1
+                try:
+                    yield
+                finally:
+                    self.in_flight[host] -= 1
+
+    def record(self, url: str, status: int, seconds: float, retry_after: Optional[str] = None) -> None:
+        """Report a response (status 0 for a failed load) so the host's pace can adapt."""
+        if self.politeness is not None:
+            self.politeness.record(host_of(url), status, seconds, retry_after)
+
+    def timeout_ms(self, url: str) -> float:
+        """Navigation timeout for url in Playwright milliseconds."""
+        if self.politeness is None:
+            return MAX_TIMEOUT_SECONDS * 1000
+        return self.politeness.timeout_for(host_of(url)) * 1000
+
+
+class PagePool:
+    """A fixed-size pool of pages opened from one browser context."""
+
+    def __init__(self, context: Any, size: int = PAGES_PER_SOURCE, max_uses: Optional[int] = None):
+        """Create an empty pool; pages are opened lazily up to size.
+
+        A page that has been borrowed ``max_uses`` times is closed on return
+        and replaced by a fresh one, so a long crawl does not keep one
+        renderer's memory growing.
+        """
+        self.context = context
+        self.size = size
+        self.max_uses = max_uses
+        self.recycled = 0
+        self._pages: List[Any] = []
+        self._uses: Dict[int, int] = {}
+        self._opening = 0
+        self._idle: asyncio.Queue[Any] = asyncio.Queue()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Borrow a page, opening a new one if the pool is not yet full."""
+        if self._idle.empty() and len(self._pages) + self._opening < self.size:
+            self._opening += 1
+            try:
+                page = await self.context.new_page()
+            finally:
+                self._opening -= 1
+            self._pages.append(page)
+        else:
+            page = await self._idle.get()
+        try:
+            yield page
+        finally:
+            uses = self._uses[id(page)] = self._uses.get(id(page), 0) + 1
+            if self.max_uses is not None and uses >= self.max_uses:
+                await self._retire(page)
+            else:
+                self._idle.put_nowait(page)
+
+    @property
+    def pages(self) -> List[Any]:
+        """Pages currently open in the pool."""
+        return list(self._pages)
+
+    async def _retire(self, page: Any) -> None:
+        self._pages.remove(page)
+        self._uses.pop(id(page), None)
+        self.recycled += 1
+        try:
+            await page.close()
+        except Exception:
+            pass
+        # Borrowers may be waiting on the idle queue, so replace the page now.
+        if len(self._pages) + self._opening < self.size:
+            self._opening += 1
+            try:
+                replacement = await self.context.new_page()
+            finally:
+                self._opening -= 1
+            self._pages.append(replacement)
+            self._idle.put_nowait(replacement)
+
+    async def close(self) -> None:
+        """Close every open page; pages that fail to close are dropped anyway."""
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._pages.clear()
+        self._uses.clear()
+
+
+class Deadline:
+    """A wall-clock cut-off shared by every task in one crawl."""
+
+    def __init__(self, seconds: float = CRAWL_DEADLINE_SECONDS):
+        """Start a deadline that expires ``seconds`` from now."""
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Return the seconds left, never below zero."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Return True once the deadline has passed."""
+        return self.remaining() <= 0
+
+
+class CrawlStats:
+    """Per-page latency and throughput counters for one crawl."""
+
+    def __init__(self) -> None:
+        """Start the throughput clock with no pages recorded."""
+        self.started = time.monotonic()
+        self.latencies: List[float] = []
+        self.by_tier: Dict[str, int] = {}
+        self.failures = 0
+
+    def record_page(self, seconds: float, tier: str) -> None:
+        """Record one article page loaded via tier ("http" or "browser")."""
+        self.latencies.append(seconds)
+        self.by_tier[tier] = self.by_tier.get(tier, 0) + 1
+
+    def record_failure(self) -> None:
+        """Record one page or source that failed to load."""
+        self.failures += 1
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile of page latency in seconds (0.0 if none)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def pages_per_second(self) -> float:
+        """Return pages recorded per second since the stats were created."""
+        elapsed = time.monotonic() - self.started
+        return len(self.latencies) / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Return a one-line summary of counts, throughput and latency percentiles."""
+        tiers = ", ".join(f"{tier}={n}" for tier, n in sorted(self.by_tier.items()))
+        return (
+            f"{len(self.latencies)} pages ({tiers}), {self.failures} failed, "
+            f"{self.pages_per_second():.2f} pages/s, "
+            f"p50 {self.percentile(50) * 1000:.0f} ms, p95 {self.percentile(95) * 1000:.0f} ms"
+        )
+
+
+async def iter_until(
+    coros: List[Awaitable[Any]], deadline: Optional[Deadline], grace: float = 0.0
+) -> AsyncIterator[Any]:
+    """Run coroutines concurrently and yield each successful result as soon as it completes.
+
+    Whatever is unfinished ``grace`` seconds past the deadline is cancelled;
+    with no deadline, every coroutine runs to completion.
+    """
+    pending = {asyncio.ensure_future(c) for c in coros}
+    try:
+        while pending:
+            timeout = deadline.remaining() + grace if deadline else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def merge_until(
+    streams: List[AsyncIterator[Any]],
+    deadline: Optional[Deadline],
+    grace: float = 0.0,
+    maxsize: int = STREAM_QUEUE_SIZE,
+    names: Optional[List[str]] = None,
+    stats: Optional[CrawlStats] = None,
+) -> AsyncIterator[Any]:
+    """Interleave async iterators through a bounded queue, stopping at the deadline.
+
+    Each stream is drained by its own task; when the consumer falls behind and
+    the queue fills, those tasks block, so at most ``maxsize`` items wait
+    between producers and consumer. A stream that raises is logged under its
+    entry in ``names`` and counted in ``stats.failures``; the others carry on.
+    """
+    queue: asyncio.Queue[Any] = asyncio.Queue(maxsize)
+    finished = object()
+    labels = names if names is not None else [f"stream {i}" for i in range(len(streams))]
+
+    async def pump(label: str, stream: AsyncIterator[Any]) -> None:
+        try:
+            async for item in stream:
+                await queue.put(item)
+        except Exception:
+            logger.exception("%s: stream failed", label)
+            if stats is not None:
+                stats.record_failure()
+        await queue.put(finished)
+
+    producers = [asyncio.ensure_future(pump(label, stream)) for label, stream in zip(labels, streams)]
+    remaining = len(producers)
+    try:
+        while remaining:
+            timeout = deadline.remaining() + grace if deadline else None
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is finished:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in producers:
+            task.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
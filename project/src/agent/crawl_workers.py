@@ -0,0 +1,231 @@
+"""Multi-process crawl: domain-sharded workers feeding one post writer.
+
+One Python process with one Chromium instance caps crawl throughput at what a
+single event loop and browser can drive. The coordinator here groups sources
+by domain, assigns the domains round-robin to N worker processes, and starts
+each worker with its own asyncio loop, browser, HTTP client and politeness
+limits. Workers share the SQLite frontier and HTTP cache on disk and send
+each article back over a multiprocessing queue as soon as it is extracted;
+the coordinator process is the only writer, doing the (title, date) dedup and
+the post/index writes from date_aware_crawler through PostWriter, with the
+same checkpoint log so an interrupted run resumes.
+
+A worker that dies without reporting completion is restarted with the
+sources it had not finished; sources it already reported are not re-crawled,
+and URLs it fetched are in the frontier.
+
+Usage (from the project root):
+    PYTHONPATH=src python3 src/agent/crawl_workers.py --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent.browser_resources import BrowserResources
+from agent.crawl_checkpoint import CrawlCheckpoint
+from agent.crawl_frontier import CrawlFrontier
+from agent.crawl_scheduler import CRAWL_DEADLINE_SECONDS, CrawlStats, Deadline, host_of
+from agent.date_aware_crawler import (
+    OUTPUT_DIR,
+    SOURCES,
+    PostWriter,
+    load_allowlist,
+    polite_limiter,
+    stream_all,
+)
+from agent.feed_discovery import FeedDiscovery
+from agent.http_cache import HttpCache
+from agent.http_fetch import HttpFetcher
+from agent.resource_blocking import ResourceBlocker
+
+# Times a crashed worker's remaining sources are retried in a fresh process.
+MAX_RESTARTS = 2
+# Seconds past the crawl deadline before stuck workers are terminated.
+SHUTDOWN_GRACE_SECONDS = 30.0
+QUEUE_POLL_SECONDS = 1.0
+
+
+def shard_sources(sources: List[Tuple[str, str]], workers: int) -> List[List[Tuple[str, str]]]:
+    """Split sources into at most ``workers`` shards, keeping each domain in one shard.
+
+    Domains are assigned round-robin in sorted order, so the split is stable
+    between runs and every domain's politeness limits live in one process.
+    """
+    by_host: Dict[str, List[Tuple[str, str]]] = {}
+    for name, url in sources:
+        by_host.setdefault(host_of(url), []).append((name, url))
+    shards: List[List[Tuple[str, str]]] = [[] for _ in range(max(1, min(workers, len(by_host))))]
+    for i, host in enumerate(sorted(by_host)):
+        shards[i % len(shards)].extend(by_host[host])
+    return [shard for shard in shards if shard]
+
+
+async def _crawl_shard(worker_id: int, sources: List[Tuple[str, str]], allowed: List[str],
+                       results: Any, deadline_seconds: float) -> None:
+    blocker = ResourceBlocker.from_config()
+    cache = HttpCache()
+    fetcher = HttpFetcher(cache=cache)
+    limiter = polite_limiter(fetcher)
+    frontier = CrawlFrontier()
+    feeds = FeedDiscovery(fetcher)
+    stats = CrawlStats()
+    resources = BrowserResources()
+
+    async for article in stream_all(
+        sources, allowed, fetcher, frontier, feeds, blocker, limiter,
+        deadline=Deadline(deadline_seconds), stats=stats,
+        on_source_done=lambda name, articles: results.put(("source", worker_id, name, None)),
+        resources=resources,
+    ):
+        results.put(("article", worker_id, article["source"], [article]))
+    feeds.save()
+    politeness = limiter.politeness
+    if politeness is not None and politeness.robots is not None:
+        politeness.robots.save()
+    print(f"[worker {worker_id}] Pages: {stats.summary()}")
+    if politeness is not None:
+        print(f"[worker {worker_id}] Politeness: {politeness.summary()}")
+    print(f"[worker {worker_id}] Browser: {resources.summary()}")
+    print(f"[worker {worker_id}] Resource blocking: {blocker.stats.summary()}")
+    print(f"[worker {worker_id}] HTTP cache: {cache.summary()}")
+    await fetcher.close()
+    frontier.close()
+
+
+def worker_main(worker_id: int, sources: List[Tuple[str, str]], allowed: List[str],
+                results: Any, deadline_seconds: float) -> None:
+    """Entry point of a worker process: crawl one shard, then report exit."""
+    asyncio.run(_crawl_shard(worker_id, sources, allowed, results, deadline_seconds))
+    results.put(("exit", worker_id, None, None))
+
+
+class CrawlCoordinator:
+    """Starts shard workers, restarts crashed ones, and writes their results."""
+
+    def __init__(
+        self,
+        sources: List[Tuple[str, str]],
+        allowed: List[str],
+        workers: int = os.cpu_count() or 1,
+        writer: Optional[PostWriter] = None,
+        deadline_seconds: float = CRAWL_DEADLINE_SECONDS,
+        max_restarts: int = MAX_RESTARTS,
+    ):
+        """Shard sources across ``workers`` processes, writing posts through ``writer``."""
+        self.allowed = allowed
+        self.writer = writer or PostWriter(OUTPUT_DIR)
+        self.deadline_seconds = deadline_seconds
+        self.max_restarts = max_restarts
+        self.shards = shard_sources(sources, workers)
+        self.articles = 0
+        self.restarts = 0
+        # "spawn" gives every worker a clean interpreter for its own browser and loop.
+        self._mp = mp.get_context("spawn")
+        self._results = self._mp.Queue()
+        self._procs: Dict[int, Any] = {}
+        self._pending: Dict[int, List[Tuple[str, str]]] = {}
+        self._restarts: Dict[int, int] = {}
+
+    def _start(self, worker_id: int, sources: List[Tuple[str, str]], deadline_seconds: float) -> None:
+        proc = self._mp.Process(
+            target=worker_main,
+            args=(worker_id, sources, self.allowed, self._results, deadline_seconds),
+            name=f"crawl-worker-{worker_id}",
+        )
+        proc.start()
+        self._procs[worker_id] = proc
+        self._pending[worker_id] = list(sources)
+
+    def _handle(self, message: Tuple[str, int, Optional[str], Optional[List[Dict[str, Any]]]]) -> None:
+        kind, worker_id, name, articles = message
+        if kind == "exit":
+            self._pending.pop(worker_id, None)
+            return
+        if kind == "source":
+            self._pending[worker_id] = [s for s in self._pending.get(worker_id, []) if s[0] != name]
+            return
+        for article in articles or []:
+            self.articles += 1
+            self.writer.write(article)
+
+    def _check_workers(self, deadline: Deadline) -> None:
+        for worker_id, proc in list(self._procs.items()):
+            if proc.is_alive() or worker_id not in self._pending:
+                continue
+            proc.join()
+            remaining = self._pending.pop(worker_id)
+            if not remaining or deadline.expired():
+                continue
+            if self._restarts.get(worker_id, 0) >= self.max_restarts:
+                print(f"Worker {worker_id} crashed again; giving up on {[n for n, _ in remaining]}")
+                continue
+            self._restarts[worker_id] = self._restarts.get(worker_id, 0) + 1
+            self.restarts += 1
+            print(f"Worker {worker_id} exited with code {proc.exitcode}; restarting for "
+                  f"{[n for n, _ in remaining]}")
+            self._start(worker_id, remaining, deadline.remaining())
+
+    def run(self) -> int:
+        """Crawl every shard to completion and return the number of posts written."""
+        self.writer.resume()
+        deadline = Deadline(self.deadline_seconds)
+        for worker_id, shard in enumerate(self.shards):
+            print(f"Worker {worker_id}: {[name for name, _ in shard]}")
+            self._start(worker_id, shard, self.deadline_seconds)
+
+        hard_stop = time.monotonic() + self.deadline_seconds + SHUTDOWN_GRACE_SECONDS
+        next_check = time.monotonic() + QUEUE_POLL_SECONDS
+        while self._pending and time.monotonic() < hard_stop:
+            try:
+                self._handle(self._results.get(timeout=QUEUE_POLL_SECONDS))
+            except queue.Empty:
+                pass
+            # Checked on a timer too, so a busy queue cannot hide a crashed worker.
+            if time.monotonic() >= next_check:
+                self._check_workers(deadline)
+                next_check = time.monotonic() + QUEUE_POLL_SECONDS
+
+        for proc in self._procs.values():
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+        return self.writer.finish()
+
+
+def main() -> None:
+    """Run the multi-process crawl from the command line."""
+    parser = argparse.ArgumentParser(description="Crawl news sources with domain-sharded worker processes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--deadline", type=float, default=CRAWL_DEADLINE_SECONDS,
+                        help="Seconds before in-flight pages are abandoned")
+    args = parser.parse_args()
+
+    print("Starting Multi-Process News Crawler...")
+    print("=" * 50)
+    allowlist = load_allowlist()
+    allowed = [d.lower().replace("www.", "") for d in allowlist.get("domains", [])]
+
+    frontier = CrawlFrontier()
+    checkpoint = CrawlCheckpoint()
+    coordinator = CrawlCoordinator(
+        SOURCES, allowed, args.workers, PostWriter(OUTPUT_DIR, frontier, checkpoint=checkpoint),
+        args.deadline,
+    )
+    count = coordinator.run()
+    checkpoint.close()
+
+    print(f"\n=== {coordinator.articles} relevant articles, {coordinator.restarts} worker restarts ===")
+    print(f"Frontier: {frontier.counts()}")
+    frontier.close()
+    print(f"\nDone! Created {count} new posts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 """Multi-Source News Crawler - Extracts actual article dates.
 
 Crawls news and extracts the actual publish date from each article.
+Sources are crawled concurrently (see agent.crawl_scheduler): each source gets
+a small pool of pages, requests are capped globally and per host, and the
+whole crawl stops at a global deadline.
 """
 
 from __future__ import annotations
@@ -8,12 +11,36 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from playwright.async_api import async_playwright
 
+from agent.browser_resources import BrowserResources, SourceSession
+from agent.crawl_checkpoint import CrawlCheckpoint
+from agent.crawl_frontier import CrawlFrontier
+from agent.crawl_scheduler import (
+    CRAWL_DEADLINE_SECONDS,
+    PAGES_PER_SOURCE,
+    SOURCE_GRACE_SECONDS,
+    STREAM_QUEUE_SIZE,
+    CrawlStats,
+    Deadline,
+    HostLimiter,
+    iter_until,
+    merge_until,
+)
+from agent.feed_discovery import FeedDiscovery, parse_date
+from agent.front_matter import render
+from agent.http_cache import HttpCache
+from agent.http_fetch import HttpFetcher
+from agent.politeness import Politeness, RobotsCache
+from agent.post_index import PostIndex
+from agent.post_io import write_if_changed
+from agent.resource_blocking import ResourceBlocker
+
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 _LEGAL_LUMINARY = Path("/Volumes/RepoPart1/legal-luminary")
 # Allowlist: project config or legal-luminary
@@ -24,6 +51,18 @@ _ALLOWLIST_CANDIDATES = [
 ALLOWLIST_PATH = next((p for p in _ALLOWLIST_CANDIDATES if p.exists()), _ALLOWLIST_CANDIDATES[0])
 OUTPUT_DIR = Path("/Volumes/RepoPart1/legal-luminary/_posts")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+INDEX_PATH = OUTPUT_DIR.parent / "_data" / "post_index.json"
+MAX_ARTICLES_PER_SOURCE = 20
+# The DOM index path reads links once this many have rendered, or after the timeout.
+INDEX_READY_LINKS = 10
+INDEX_READY_TIMEOUT_MS = 5000
+
+SOURCES = [
+    ("KWTX", "https://www.kwtx.com/news/"),
+    ("KBTX", "https://www.kbtx.com/news/"),
+    ("KXAN", "https://www.kxan.com/news/"),
+    ("KVUE", "https://www.kvue.com/news/"),
+]
 
 RELEVANT_KEYWORDS = [
     "bell county",
@@ -62,184 +101,571 @@ def is_relevant(text: str) -> bool:
     return any(kw in text_lower for kw in RELEVANT_KEYWORDS)
 
 
-def extract_date(content: str, url: str) -> str:
-    """Extract the actual publish date from article content."""
-    # Common date patterns
-    patterns = [
-        r"([A-Za-z]+ \d{1,2},? \d{4})",  # February 11, 2026
-        r"(\d{1,2}/[\d/]+)",  # 02/11/26 or 02/11/2026
-        r"([A-Za-z]+ \d{1,2} \d{4})",  # February 11 2026
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, content[:500])
-        if match:
-            date_str = match.group(1)
-            try:
-                # Try to parse various formats
-                for fmt in [
-                    "%B %d, %Y",
-                    "%B %d %Y",
-                    "%m/%d/%y",
-                    "%m/%d/%Y",
-                    "%b %d, %Y",
-                ]:
-                    try:
-                        parsed = datetime.strptime(
-                            date_str.replace(",", ""), fmt.replace(",", "")
-                        )
-                        if 2020 <= parsed.year <= 2026:
-                            return parsed.strftime("%Y-%m-%d")
-                    except:
-                        continue
-            except:
-                pass
-
-    # Check URL for date pattern
-    url_match = re.search(r"/(\d{4})/(\d{2})/(\d{2})/", url)
-    if url_match:
-        year, month, day = url_match.groups()
-        if 2020 <= int(year) <= 2026:
-            return f"{year}-{month}-{day}"
-
-    return "2026-02-19"  # Default
+MIN_YEAR = 2020
+MAX_YEAR = 2026
+DEFAULT_DATE = "2026-02-19"
+
+_MONTHS = {
+    name: i
+    for i, names in enumerate(
+        [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+         ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+         ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december")],
+        start=1,
+    )
+    for name in names
+}
+# "February 11, 2026" / "Feb. 11 2026" or "02/11/26" / "2/11/2026", in one pass.
+_TEXT_DATE_RE = re.compile(
+    r"\b(?P<month>[A-Za-z]{3,9})\.? (?P<day>\d{1,2}),? (?P<year>\d{4})\b"
+    r"|\b(?P<m>\d{1,2})/(?P<d>\d{1,2})/(?P<y>\d{4}|\d{2})\b"
+)
+_URL_DATE_RE = re.compile(r"/(\d{4})/(\d{2})/(\d{2})/")
+
+
+def _valid_date(year: int, month: int, day: int) -> Optional[str]:
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        return None
+    try:
+        return datetime(year, month, day).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
 
 
-async def crawl_source(name: str, url: str, browser, allowed: List[str]) -> List[Dict]:
-    results = []
+def extract_date(content: str, url: str) -> str:
+    """Extract the publish date from the start of article text, then the URL.
+
+    Only a fallback: structured metadata (feed dates, JSON-LD, article meta
+    tags) is preferred when the page provides it.
+    """
+    for match in _TEXT_DATE_RE.finditer(content[:500]):
+        if match.group("month"):
+            month = _MONTHS.get(match.group("month").lower())
+            if month is None:
+                continue
+            date = _valid_date(int(match.group("year")), month, int(match.group("day")))
+        else:
+            year = int(match.group("y"))
+            date = _valid_date(year + 2000 if year < 100 else year, int(match.group("m")), int(match.group("d")))
+        if date:
+            return date
+
+    url_match = _URL_DATE_RE.search(url)
+    if url_match:
+        date = _valid_date(*(int(g) for g in url_match.groups()))
+        if date:
+            return date
+
+    return DEFAULT_DATE
+
+
+# One CDP round trip per article: title, canonical URL, structured publish
+# dates and main-content text together.
+ARTICLE_METADATA_JS = """() => {
+    const content = (sel) => {
+        const el = document.querySelector(sel);
+        return el ? el.getAttribute('content') : null;
+    };
+    let ldDate = null;
+    for (const script of document.querySelectorAll('script[type="application/ld+json"]')) {
+        try {
+            const stack = [JSON.parse(script.textContent)];
+            while (stack.length && !ldDate) {
+                const node = stack.pop();
+                if (Array.isArray(node)) { stack.push(...node); continue; }
+                if (node && typeof node === 'object') {
+                    if (node.datePublished) { ldDate = node.datePublished; break; }
+                    if (node['@graph']) stack.push(node['@graph']);
+                }
+            }
+        } catch (e) {}
+        if (ldDate) break;
+    }
+    const canonical = document.querySelector('link[rel="canonical"]');
+    const main = document.querySelector('article') || document.querySelector('main');
+    let text = main ? main.innerText : '';
+    if (text.length < 300 && document.body) text = document.body.innerText;
+    return {
+        title: document.title,
+        canonical: canonical ? canonical.href : null,
+        ld_date_published: ldDate,
+        meta_published_time: content('meta[property="article:published_time"]')
+            || content('meta[name="article:published_time"]'),
+        content: text.substring(0, 3000),
+    };
+}"""
+
+
+def structured_date(metadata: Dict[str, Any]) -> Optional[str]:
+    """Publish date from JSON-LD datePublished or article:published_time, if present."""
+    for key in ("ld_date_published", "meta_published_time"):
+        date = parse_date(metadata.get(key))
+        if date and MIN_YEAR <= int(date[:4]) <= MAX_YEAR:
+            return date
+    return None
+
+
+def _record_response(limiter: HostLimiter, url: str, response: Any, started: float) -> None:
+    status = response.status if response is not None else 200
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    limiter.record(url, status, time.monotonic() - started, retry_after)
+
+
+async def _wait_for_news_links(page) -> None:
+    """Wait until the index page has rendered its article links, not a fixed sleep.
+
+    Returns as soon as INDEX_READY_LINKS news links exist; gives up quietly
+    after INDEX_READY_TIMEOUT_MS and lets the caller read whatever is there.
+    """
+    try:
+        await page.wait_for_function(
+            "n => document.querySelectorAll('a[href*=\"/news/\"]').length >= n",
+            arg=INDEX_READY_LINKS,
+            timeout=INDEX_READY_TIMEOUT_MS,
+        )
+    except Exception:
+        pass
+
+
+async def _fetch_article(
+    name: str,
+    href: str,
+    pool: SourceSession,
+    limiter: HostLimiter,
+    fetcher: Optional[HttpFetcher] = None,
+    frontier: Optional[CrawlFrontier] = None,
+    known_date: Optional[str] = None,
+    stats: Optional[CrawlStats] = None,
+) -> Optional[Dict]:
+    """Load one article (HTTP first, pooled browser page as fallback); return it if relevant.
+
+    ``known_date`` (from feed metadata) is used instead of guessing the date from page text.
+    """
+    page_data = None
+    if fetcher is not None:
+        async with limiter.slot(href):
+            started = time.monotonic()
+            page_data = await fetcher.fetch(href)
+        if page_data and stats is not None:
+            stats.record_page(time.monotonic() - started, "http")
+
+    if not page_data:
+        async with limiter.slot(href), pool.page() as page:
+            started = time.monotonic()
+            try:
+                response = await page.goto(
+                    href, wait_until="domcontentloaded", timeout=limiter.timeout_ms(href)
+                )
+                _record_response(limiter, href, response, started)
+                page_data = await page.evaluate(ARTICLE_METADATA_JS)
+            except Exception:
+                limiter.record(href, 0, time.monotonic() - started)
+                if stats is not None:
+                    stats.record_failure()
+                if frontier is not None:
+                    frontier.mark_fetched(href, "failed", source=name)
+                return None
+            if stats is not None:
+                stats.record_page(time.monotonic() - started, "browser")
+
+    title = page_data.get("title") or ""
+    content = page_data.get("content") or ""
+    # Feed date, then page metadata; scanning the text is the last resort.
+    article_date = known_date or structured_date(page_data) or extract_date(content, href)
+
+    relevant = is_relevant(title + content) and len(content) > 300
+    if frontier is not None:
+        frontier.mark_fetched(href, "relevant" if relevant else "irrelevant", content, name)
+    if relevant:
+        print(f"  + [{name}] {title[:40]}... ({article_date})")
+        return {
+            "title": title,
+            "content": content,
+            "url": href,
+            "canonical_url": page_data.get("canonical") or href,
+            "source": name,
+            "date": article_date,
+        }
+    return None
+
+
+async def iter_source(
+    name: str,
+    url: str,
+    browser,
+    allowed: List[str],
+    limiter: Optional[HostLimiter] = None,
+    deadline: Optional[Deadline] = None,
+    pages: int = PAGES_PER_SOURCE,
+    blocker: Optional[ResourceBlocker] = None,
+    fetcher: Optional[HttpFetcher] = None,
+    frontier: Optional[CrawlFrontier] = None,
+    feeds: Optional[FeedDiscovery] = None,
+    stats: Optional[CrawlStats] = None,
+    resources: Optional[BrowserResources] = None,
+) -> AsyncIterator[Dict]:
+    """Discover article links for a source and yield each relevant article as it is extracted.
+
+    Article loads share a pool of ``pages`` tabs in one browser context and go
+    through ``limiter``; anything still loading at ``deadline`` is dropped.
+    ``blocker`` (with this source's overrides) aborts images, fonts, media,
+    ads and trackers for every page in the context. With ``fetcher``, the
+    index page and articles are fetched over plain HTTP (through its response
+    cache) and only fall back to a browser page when HTTP yields nothing usable.
+    With ``frontier``, links already ingested (or known irrelevant) in earlier
+    runs are dropped before any navigation. With ``feeds``, links and publish
+    dates come from the source's RSS/Atom feed or news sitemap, and the index
+    page is only read when the source has no feed. ``resources`` recycles the
+    source's pages and context under memory limits and warms the context with
+    state saved by earlier runs.
+    """
+    limiter = limiter or HostLimiter()
+    resources = resources or BrowserResources.unmanaged()
+    kept = 0
     seen = set()
+    pool = None
 
     try:
-        page = await browser.new_page()
-        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        await page.wait_for_timeout(3000)
+        pool = await resources.open(browser, name, blocker, pages)
+        links = []
+        feed_dates: Dict[str, str] = {}
+        if feeds is not None:
+            async with limiter.slot(url):
+                items = await feeds.discover(name, url)
+            if items:
+                # Newest first, so the frontier's known-streak cut-off applies.
+                items.sort(key=lambda item: item["date"] or "", reverse=True)
+                links = [{"href": item["href"], "text": item["text"]} for item in items]
+                feed_dates = {item["href"]: item["date"] for item in items if item["date"]}
+                print(f"{name}: {len(items)} items from feed")
+        if not links and fetcher is not None:
+            async with limiter.slot(url):
+                links = [
+                    a for a in await fetcher.discover_links(url)
+                    if len(a["text"]) > 15 and "/news/" in a["href"]
+                ]
+        if not links:
+            async with limiter.slot(url), pool.page() as page:
+                started = time.monotonic()
+                response = await page.goto(
+                    url, wait_until="domcontentloaded", timeout=limiter.timeout_ms(url)
+                )
+                _record_response(limiter, url, response, started)
+                await _wait_for_news_links(page)
 
-        links = await page.evaluate("""() => {
-            return Array.from(document.querySelectorAll('a'))
-                .map(a => ({href: a.href, text: a.innerText}))
-                .filter(a => a.text.length > 15 && a.href && a.href.includes('/news/'))
-                .slice(0, 20);
-        }""")
+                links = await page.evaluate("""() => {
+                    return Array.from(document.querySelectorAll('a'))
+                        .map(a => ({href: a.href, text: a.innerText}))
+                        .filter(a => a.text.length > 15 && a.href && a.href.includes('/news/'));
+                }""")
 
         print(f"{name}: Found {len(links)} news links")
 
+        hrefs = []
         for link in links:
             href = link.get("href", "")
             if not href or href in seen:
                 continue
             if not any(d in href for d in allowed):
                 continue
-
             seen.add(href)
-
-            try:
-                await page.goto(href, wait_until="domcontentloaded", timeout=20000)
-
-                title = await page.title()
-                content = await page.evaluate(
-                    "document.body ? document.body.innerText.substring(0, 3000) : ''"
-                )
-
-                # Extract actual date from article
-                article_date = extract_date(content, href)
-
-                if is_relevant(title + content) and len(content) > 300:
-                    results.append(
-                        {
-                            "title": title,
-                            "content": content,
-                            "url": href,
-                            "source": name,
-                            "date": article_date,
-                        }
-                    )
-                    print(f"  + {title[:40]}... ({article_date})")
-
-            except Exception as e:
-                pass
-
-        await page.close()
+            hrefs.append(href)
+
+        if frontier is not None:
+            known = len(hrefs)
+            hrefs = frontier.filter_new(hrefs, source=name)
+            print(f"{name}: {len(hrefs)} new, skipped {known - len(hrefs)} known or past known streak")
+        hrefs = hrefs[:MAX_ARTICLES_PER_SOURCE]
+
+        fetches = [
+            _fetch_article(name, href, pool, limiter, fetcher, frontier, feed_dates.get(href), stats)
+            for href in hrefs
+        ]
+        async for article in iter_until(fetches, deadline):
+            if article:
+                kept += 1
+                yield article
+        if deadline and deadline.expired():
+            print(f"{name}: deadline reached, kept {kept} articles")
 
     except Exception as e:
         print(f"Error on {name}: {e}")
-
-    return results
-
-
-async def main():
-    print("Starting Multi-Source News Crawler with Date Extraction...")
-    print("=" * 50)
-
-    allowlist = load_allowlist()
-    allowed = [d.lower().replace("www.", "") for d in allowlist.get("domains", [])]
-
-    SOURCES = [
-        ("KWTX", "https://www.kwtx.com/news/"),
-        ("KBTX", "https://www.kbtx.com/news/"),
-        ("KXAN", "https://www.kxan.com/news/"),
-        ("KVUE", "https://www.kvue.com/news/"),
-    ]
-
-    all_articles = []
-
+    finally:
+        if pool is not None:
+            await pool.close()
+
+
+async def crawl_source(name: str, url: str, browser, allowed: List[str], *args, **kwargs) -> List[Dict]:
+    """Collect every article iter_source yields for one source (same arguments)."""
+    return [article async for article in iter_source(name, url, browser, allowed, *args, **kwargs)]
+
+
+def _mark_ingested(frontier: CrawlFrontier, article: Dict, post_path: str = "") -> None:
+    for url in {article.get("url", ""), article.get("canonical_url", "")} - {""}:
+        frontier.mark_ingested(url, post_path)
+
+
+def polite_limiter(fetcher: HttpFetcher) -> HostLimiter:
+    """HostLimiter with per-host token buckets, robots.txt caps and backoff fed by fetcher."""
+    limiter = HostLimiter(politeness=Politeness(robots=RobotsCache(fetcher.get)))
+    fetcher.on_response = limiter.record
+    return limiter
+
+
+_SOURCE_DONE = object()
+
+
+async def stream_all(
+    sources: List[tuple],
+    allowed: List[str],
+    fetcher: HttpFetcher,
+    frontier: Optional[CrawlFrontier] = None,
+    feeds: Optional[FeedDiscovery] = None,
+    blocker: Optional[ResourceBlocker] = None,
+    limiter: Optional[HostLimiter] = None,
+    deadline: Optional[Deadline] = None,
+    stats: Optional[CrawlStats] = None,
+    launch_options: Optional[Dict[str, Any]] = None,
+    on_source_done: Optional[Callable[[str, List[Dict]], None]] = None,
+    resources: Optional[BrowserResources] = None,
+    queue_size: int = STREAM_QUEUE_SIZE,
+) -> AsyncIterator[Dict]:
+    """Launch Chromium, crawl every (name, url) source concurrently, and yield articles as they arrive.
+
+    Sources feed a queue of ``queue_size`` articles; when the consumer is
+    slower than the crawl, sources wait instead of buffering without bound.
+    ``on_source_done(name, articles)`` is called as each source finishes,
+    after its last article has been yielded.
+    """
+    limiter = limiter or HostLimiter()
     async with async_playwright() as p:
-        browser = await p.chromium.launch(channel="chrome", headless=True)
-
-        for name, url in SOURCES:
-            print(f"\n=== {name} ===")
-            articles = await crawl_source(name, url, browser, allowed)
-            all_articles.extend(articles)
-
-        await browser.close()
+        browser = await p.chromium.launch(**(launch_options or {"channel": "chrome", "headless": True}))
+
+        async def _source(name: str, url: str) -> AsyncIterator[Any]:
+            articles = []
+            async for article in iter_source(
+                name, url, browser, allowed, limiter, deadline,
+                blocker=blocker, fetcher=fetcher, frontier=frontier, feeds=feeds, stats=stats,
+                resources=resources,
+            ):
+                articles.append(article)
+                yield article
+            # Queued behind the source's articles, so it reaches the consumer after them.
+            yield (_SOURCE_DONE, name, articles)
+
+        try:
+            # All sources run at once; total time tracks the slowest source.
+            async for item in merge_until(
+                [_source(name, url) for name, url in sources],
+                deadline,
+                SOURCE_GRACE_SECONDS,
+                queue_size,
+                names=[name for name, _ in sources],
+                stats=stats,
+            ):
+                if isinstance(item, tuple) and item[0] is _SOURCE_DONE:
+                    if on_source_done is not None:
+                        on_source_done(item[1], item[2])
+                    continue
+                yield item
+        finally:
+            await browser.close()
+
+
+async def crawl_all(sources: List[tuple], allowed: List[str], fetcher: HttpFetcher, *args, **kwargs) -> List[Dict]:
+    """Collect every article stream_all yields (same arguments)."""
+    return [article async for article in stream_all(sources, allowed, fetcher, *args, **kwargs)]
+
+
+def render_post(article: Dict, date: str) -> str:
+    """Jekyll post markdown for one crawled article."""
+    try:
+        # A real date, so the front matter holds an unquoted YAML date as Jekyll expects.
+        post_date: Any = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        post_date = date
+    front_matter = {
+        "title": article.get("title", "Untitled"),
+        "date": post_date,
+        "layout": "default",
+        "source_url": article.get("url", ""),
+        "source_name": article.get("source", "News"),
+        "verified_at": post_date,
+        "category": "news",
+        "news_excerpt": True,
+    }
+    return render(
+        front_matter,
+        f"""{article.get("content", "")[:1500]}
 
-    print(f"\n=== Found {len(all_articles)} relevant articles ===")
+## Source Information
 
-    seen_titles = {}
-    count = 0
+- **Source**: {article.get("source", "News")}
+- **Original URL**: {article.get("url", "")}
+- **Published**: {date}
+- **Verified**: {date}
 
-    for article in all_articles:
+---
+""",
+    )
+
+
+class PostWriter:
+    """Dedupes articles by (title[:30], date) and writes each new one as a post.
+
+    With a frontier, an article whose text was already ingested from another
+    URL is skipped too.
+
+    With a checkpoint, each article is logged before its post is written and
+    marked written afterwards, so ``resume`` can finish an interrupted run.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path = OUTPUT_DIR,
+        frontier: Optional[CrawlFrontier] = None,
+        index_path: Optional[Path] = INDEX_PATH,
+        checkpoint: Optional[CrawlCheckpoint] = None,
+    ):
+        self.output_dir = output_dir
+        self.frontier = frontier
+        self.index_path = index_path
+        self.checkpoint = checkpoint
+        self.index = PostIndex.load(index_path) if index_path else None
+        self.seen_titles = set()
+        self.count = 0
+
+    def resume(self) -> int:
+        """Write articles an earlier run extracted but never wrote; return how many were pending."""
+        if self.checkpoint is None:
+            return 0
+        pending = self.checkpoint.pending()
+        if pending:
+            print(f"Resuming: {len(pending)} articles from the last run's checkpoint")
+        for article in pending:
+            self._write(article)
+        return len(pending)
+
+    def write(self, article: Dict) -> Optional[Path]:
+        """Write article unless it duplicates one already seen or on disk.
+
+        Returns:
+            Path of the new post, or None if nothing was written.
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.record_article(article)
+        return self._write(article)
+
+    def _write(self, article: Dict) -> Optional[Path]:
+        path = self._write_post(article)
+        if self.checkpoint is not None:
+            self.checkpoint.record_written(article, str(path or ""))
+        return path
+
+    def _write_post(self, article: Dict) -> Optional[Path]:
         title = article.get("title", "")[:30]
-        date = article.get("date", "2026-02-19")
+        date = article.get("date", DEFAULT_DATE)
 
         key = (title, date)
-        if key in seen_titles:
-            continue
-        seen_titles[key] = True
+        if key in self.seen_titles:
+            if self.frontier is not None:
+                _mark_ingested(self.frontier, article)
+            return None
+        self.seen_titles.add(key)
+
+        # The same story syndicated under another URL already has a post.
+        content = article.get("content", "")
+        if self.frontier is not None and content and self.frontier.has_content(content):
+            _mark_ingested(self.frontier, article)
+            return None
 
         slug = re.sub(r"[^a-z0-9]+", "-", title.lower())[:40].strip("-")
 
         # Check if already exists - use full filename with date
-        filename = f"{date}-{slug}.md"
-        if (OUTPUT_DIR / filename).exists():
-            continue
-
-        post = f"""---
-title: "{article.get("title", "Untitled")}"
-date: {date}
-layout: default
-source_url: "{article.get("url", "")}"
-source_name: "{article.get("source", "News")}"
-verified_at: {date}
-category: news
-news_excerpt: true
----
+        path = self.output_dir / f"{date}-{slug}.md"
+        if path.exists():
+            if self.frontier is not None:
+                _mark_ingested(self.frontier, article, str(path))
+            return None
+
+        # Atomic, so a crash never leaves a truncated post that the exists() check above would keep.
+        write_if_changed(path, render_post(article, date))
+        if self.index is not None:
+            self.index.add_post(path)
+        if self.frontier is not None:
+            _mark_ingested(self.frontier, article, str(path))
+        print(f"  Saved: {path.name}")
+        self.count += 1
+        return path
+
+    def finish(self) -> int:
+        """Save the post index if anything was written; return the number of posts written.
+
+        The checkpoint is truncated, since every logged article is now on disk.
+        """
+        if self.count and self.index is not None:
+            self.index.save(self.index_path)
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        return self.count
+
+
+def write_posts(
+    articles: List[Dict],
+    output_dir: Path = OUTPUT_DIR,
+    frontier: Optional[CrawlFrontier] = None,
+    index_path: Optional[Path] = INDEX_PATH,
+) -> int:
+    """Write every new article as a post and return how many were written."""
+    writer = PostWriter(output_dir, frontier, index_path)
+    for article in articles:
+        writer.write(article)
+    return writer.finish()
 
-{article.get("content", "")[:1500]}
 
-## Source Information
-
-- **Source**: {article.get("source", "News")}
-- **Original URL**: {article.get("url", "")}
-- **Published**: {date}
-- **Verified**: {date}
-
----
-"""
+async def main():
+    print("Starting Multi-Source News Crawler with Date Extraction...")
+    print("=" * 50)
 
-        (OUTPUT_DIR / f"{date}-{slug}.md").write_text(post)
-        print(f"  Saved: {date}-{slug}.md")
-        count += 1
+    allowlist = load_allowlist()
+    allowed = [d.lower().replace("www.", "") for d in allowlist.get("domains", [])]
 
+    blocker = ResourceBlocker.from_config()
+    fetcher = HttpFetcher(cache=HttpCache())
+    limiter = polite_limiter(fetcher)
+    frontier = CrawlFrontier()
+    feeds = FeedDiscovery(fetcher)
+    stats = CrawlStats()
+    # Posts are written as articles arrive; the checkpoint lets a killed run resume.
+    writer = PostWriter(OUTPUT_DIR, frontier, checkpoint=CrawlCheckpoint())
+    writer.resume()
+    resources = BrowserResources()
+
+    found = 0
+    async for article in stream_all(
+        SOURCES, allowed, fetcher, frontier, feeds, blocker, limiter,
+        deadline=Deadline(CRAWL_DEADLINE_SECONDS), stats=stats, resources=resources,
+    ):
+        found += 1
+        writer.write(article)
+    feeds.save()
+    limiter.politeness.robots.save()
+    print(f"Pages: {stats.summary()}")
+    print(f"Politeness: {limiter.politeness.summary()}")
+    print(f"Browser: {resources.summary()}")
+    print(f"Resource blocking: {blocker.stats.summary()}")
+    print(f"HTTP cache: {fetcher.cache.summary()}")
+    for domain, rate in fetcher.escalation_rates().items():
+        print(f"HTTP fast path: {domain} escalated to browser {rate:.0%}")
+    await fetcher.close()
+
+    print(f"\n=== Found {found} relevant articles ===")
+
+    count = writer.finish()
+    writer.checkpoint.close()
+
+    print(f"Frontier: {frontier.counts()}")
+    frontier.close()
     print(f"\nDone! Created {count} new posts.")
 
 
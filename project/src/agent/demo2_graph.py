@@ -17,6 +17,8 @@ load_dotenv()
 from langgraph.graph import StateGraph, START, END
 from langchain_ollama import ChatOllama
 
+from agent.llm_budget import invoke, ledger
+
 
 Route = Literal["question", "compliment"]
 
@@ -53,7 +55,11 @@ def llm_route(state: Demo2State) -> dict:
         "Return JSON now."
     )
 
-    raw = llm.invoke([("system", system), ("user", user)]).content.strip()
+    response = invoke(llm, [("system", system), ("user", user)], "llm_route")
+    if response is None:
+        # Over the run budget: route on the question mark instead.
+        return {"route": "question" if "?" in state["text"] else "compliment"}
+    raw = response.content.strip()
 
     try:
         obj = json.loads(raw)
@@ -94,7 +100,10 @@ def beautify_llm(state: Demo2State) -> dict:
         f"Reply: {state['answer']}"
     )
 
-    pretty = llm.invoke(prompt).content.strip()
+    response = invoke(llm, prompt, "beautify_llm")
+    if response is None:
+        return {"answer": state["answer"]}
+    pretty = response.content.strip()
     return {"answer": pretty}
 
 
@@ -166,3 +175,6 @@ if __name__ == "__main__":
     print("\nSTREAM:\n")
     for step in graph.stream({"payload": payload_compliment}):
         print(step)
+
+    print()
+    print(ledger().report())
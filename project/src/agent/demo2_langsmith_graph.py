@@ -18,6 +18,8 @@ load_dotenv()
 from langgraph.graph import StateGraph, START, END
 from langchain_ollama import ChatOllama
 
+from agent.llm_budget import invoke, ledger
+
 
 def get_langsmith_callbacks():
     """Get LangSmith callbacks if tracing is enabled."""
@@ -83,7 +85,11 @@ def llm_route(state: Demo2LangSmithState) -> dict:
         "Return JSON now."
     )
 
-    raw = llm.invoke([("system", system), ("user", user)]).content.strip()
+    response = invoke(llm, [("system", system), ("user", user)], "llm_route")
+    if response is None:
+        # Over the run budget: route on the question mark instead.
+        return {"route": "question" if "?" in state["text"] else "compliment"}
+    raw = response.content.strip()
 
     try:
         obj = json.loads(raw)
@@ -124,7 +130,10 @@ def beautify_llm(state: Demo2LangSmithState) -> dict:
         f"Reply: {state['answer']}"
     )
 
-    pretty = llm.invoke(prompt).content.strip()
+    response = invoke(llm, prompt, "beautify_llm")
+    if response is None:
+        return {"answer": state["answer"]}
+    pretty = response.content.strip()
     return {"answer": pretty}
 
 
@@ -207,3 +216,6 @@ if __name__ == "__main__":
     print("\nSTREAM:\n")
     for step in graph.stream({"payload": payload_compliment}, config=config):
         print(step)
+
+    print()
+    print(ledger().report())
@@ -3,16 +3,27 @@
 Scores articles based on keyword relevance for legal and governmental content.
 Reads from legal-luminary/_posts, writes ranked output to legal-luminary/_data/important_articles.json.
 Override via LEGAL_LUMINARY_POSTS and LEGAL_LUMINARY_DATA in .env.
+
+Topic search over the same posts goes through the BM25 index in
+agent.post_index (``--search "query"`` on the command line). ``--watch`` keeps
+the process running and re-scores only new or modified posts.
 """
 
 from __future__ import annotations
 
+import argparse
+import bisect
 import json
 import os
 import re
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from agent.front_matter import Post, date_value, text_value
+from agent.near_duplicates import NearDuplicateDetector, load_updated_detector
+from agent.post_index import load_updated_index
 
 _LEGAL_LUMINARY_DEFAULT = Path("/Volumes/RepoPart1/legal-luminary")
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
@@ -108,33 +119,15 @@ def calculate_relevance_score(content: str, title: str = "") -> Dict[str, Any]:
 
 def validate_article(post_path: Path, allowlist: Dict) -> Dict[str, Any]:
     """Validate a single article."""
-    content = post_path.read_text(encoding="utf-8", errors="replace")
-
-    frontmatter_match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
-    if not frontmatter_match:
+    post = Post.read(post_path)
+    if not post.has_front_matter:
         return {"error": "Invalid frontmatter", "path": str(post_path)}
 
-    frontmatter = frontmatter_match.group(1)
-
-    title_match = re.search(
-        r'^title:\s*["\']?(.+?)["\']?\s*$', frontmatter, re.MULTILINE
-    )
-    title = title_match.group(1) if title_match else ""
-
-    date_match = re.search(r"^date:\s*(\d{4}-\d{2}-\d{2})", frontmatter, re.MULTILINE)
-    date = date_match.group(1) if date_match else ""
-
-    source_match = re.search(
-        r'^source_name:\s*["\']?(.+?)["\']?\s*$', frontmatter, re.MULTILINE
-    )
-    source = source_match.group(1) if source_match else ""
-
-    url_match = re.search(
-        r'^source_url:\s*["\']?(.+?)["\']?\s*$', frontmatter, re.MULTILINE
-    )
-    url = url_match.group(1) if url_match else ""
-
-    body = content[len(frontmatter_match.group(0)) :].strip()
+    title = text_value(post.get("title"))
+    date = date_value(post.get("date"))
+    source = text_value(post.get("source_name"))
+    url = text_value(post.get("source_url"))
+    body = post.body.strip()
 
     relevance = calculate_relevance_score(body, title)
 
@@ -150,6 +143,49 @@ def validate_article(post_path: Path, allowlist: Dict) -> Dict[str, Any]:
     }
 
 
+def is_recent(result: Dict[str, Any], cutoff_date: datetime) -> bool:
+    """Return False only for articles with a parseable date older than cutoff_date."""
+    try:
+        return datetime.strptime(result["date"], "%Y-%m-%d") >= cutoff_date
+    except (KeyError, ValueError):
+        return True
+
+
+def build_output(validated: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the important_articles.json payload from score-sorted results."""
+    return {
+        "validated_at": datetime.now().isoformat(),
+        "total_articles": len(validated),
+        "by_relevance": {
+            "critical": [a for a in validated if a["relevance"] == "critical"],
+            "high": [a for a in validated if a["relevance"] == "high"],
+            "medium": [a for a in validated if a["relevance"] == "medium"],
+            "low": [a for a in validated if a["relevance"] == "low"],
+        },
+        "all_articles": validated,
+    }
+
+
+def write_output(output_file: Path, output: Dict[str, Any]) -> None:
+    """Write JSON via temp file + rename so the site never reads a partial file."""
+    tmp = output_file.with_name(output_file.name + ".tmp")
+    tmp.write_text(json.dumps(output, indent=2))
+    os.replace(tmp, output_file)
+
+
+def search_posts(
+    query: str,
+    limit: int = 10,
+    posts_dir: Optional[Path] = None,
+    data_dir: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """Rank posts for a topic query using the persisted BM25 index (no full scan)."""
+    _posts = posts_dir or Path(os.environ.get("LEGAL_LUMINARY_POSTS", str(_LEGAL_LUMINARY_DEFAULT / "_posts")))
+    _data = data_dir or Path(os.environ.get("LEGAL_LUMINARY_DATA", str(_LEGAL_LUMINARY_DEFAULT / "_data")))
+    index = load_updated_index(_posts, _data / "post_index.json")
+    return index.search(query, limit=limit)
+
+
 def main():
     """Main validator entry point. Reads from legal-luminary/_posts, writes to legal-luminary/_data/important_articles.json."""
     # Re-read env so pipeline overrides take effect
@@ -169,41 +205,37 @@ def main():
         _posts.glob("*.md"), key=lambda x: x.stat().st_mtime, reverse=True
     )
 
+    detector = load_updated_detector(_posts, _data / "post_signatures.json")
+
     cutoff_date = datetime.now() - timedelta(days=MAX_AGE_DAYS)
     validated = []
     skipped = 0
+    duplicates = 0
 
     for post in posts:
+        if detector.is_duplicate(str(post)):
+            duplicates += 1
+            continue
         result = validate_article(post, allowlist)
 
         if "error" not in result:
-            try:
-                article_date = datetime.strptime(result["date"], "%Y-%m-%d")
-                if article_date < cutoff_date:
-                    skipped += 1
-                    continue
-            except:
-                pass
+            if not is_recent(result, cutoff_date):
+                skipped += 1
+                continue
             validated.append(result)
 
     print(f"Skipped {skipped} articles older than 3 months")
+    print(f"Skipped {duplicates} near-duplicate articles")
 
     validated.sort(key=lambda x: x["score"], reverse=True)
 
-    output = {
-        "validated_at": datetime.now().isoformat(),
-        "total_articles": len(validated),
-        "by_relevance": {
-            "critical": [a for a in validated if a["relevance"] == "critical"],
-            "high": [a for a in validated if a["relevance"] == "high"],
-            "medium": [a for a in validated if a["relevance"] == "medium"],
-            "low": [a for a in validated if a["relevance"] == "low"],
-        },
-        "all_articles": validated,
-    }
+    output = build_output(validated)
+
+    index = load_updated_index(_posts, _data / "post_index.json")
+    print(f"Search index: {len(index)} posts")
 
     output_file = _data / "important_articles.json"
-    output_file.write_text(json.dumps(output, indent=2))
+    write_output(output_file, output)
     print(f"Saved: {output_file}")
 
     print(f"\n=== Summary ===")
@@ -223,5 +255,204 @@ def main():
         )
 
 
+class ValidatorWatcher:
+    """Long-running validator that keeps an in-memory ranking of _posts.
+
+    Each poll compares the directory mtime first; only when it moved (or every
+    ``rescan_every`` polls, to catch in-place edits that do not touch the
+    directory) is the directory listed with scandir and diffed against the
+    last (mtime_ns, size) of every post. Only new or modified posts are
+    re-scored, and important_articles.json is rewritten atomically at most
+    once per ``debounce`` seconds. Ranked posts that age past MAX_AGE_DAYS
+    while the watcher runs are dropped, as a fresh run would drop them.
+    """
+
+    def __init__(
+        self,
+        posts_dir: Path,
+        data_dir: Path,
+        poll_interval: float = 2.0,
+        debounce: float = 5.0,
+        rescan_every: int = 15,
+    ):
+        """Set up the watcher.
+
+        Args:
+            posts_dir: Jekyll _posts directory to watch.
+            data_dir: Directory receiving important_articles.json.
+            poll_interval: Seconds between polls.
+            debounce: Minimum seconds between output rewrites.
+            rescan_every: Force a scandir diff after this many idle polls.
+        """
+        self.posts_dir = posts_dir
+        self.data_dir = data_dir
+        self.output_file = data_dir / "important_articles.json"
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.rescan_every = rescan_every
+        self.allowlist = load_allowlist()
+        self.detector = NearDuplicateDetector.load(data_dir / "post_signatures.json")
+        self._dir_mtime_ns = -1
+        self._idle_polls = 0
+        self._stats: Dict[str, tuple] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        # Sorted (-score, path) keys; mirrors _results for O(log n) updates.
+        self._ranking: List[tuple] = []
+        self._dirty = False
+        self._last_write = 0.0
+        self._cutoff_day = ""
+
+    def _drop(self, path: str) -> None:
+        result = self._results.pop(path, None)
+        if result is None:
+            return
+        key = (-result["score"], path)
+        i = bisect.bisect_left(self._ranking, key)
+        if i < len(self._ranking) and self._ranking[i] == key:
+            del self._ranking[i]
+        self._dirty = True
+
+    def _expire(self, cutoff_date: datetime) -> None:
+        """Drop ranked posts dated before cutoff_date.
+
+        Post dates are whole days, so the ranking only needs re-checking
+        when the cutoff moves to a new day.
+        """
+        day = cutoff_date.strftime("%Y-%m-%d")
+        if day == self._cutoff_day:
+            return
+        self._cutoff_day = day
+        for path in [p for p, result in self._results.items() if not is_recent(result, cutoff_date)]:
+            self._drop(path)
+
+    def _score(self, path: str, cutoff_date: datetime) -> None:
+        self._drop(path)
+        if self.detector.is_duplicate(path):
+            return
+        result = validate_article(Path(path), self.allowlist)
+        if "error" in result or not is_recent(result, cutoff_date):
+            return
+        self._results[path] = result
+        bisect.insort(self._ranking, (-result["score"], path))
+        self._dirty = True
+
+    def poll(self) -> Dict[str, int]:
+        """Diff _posts against the last poll and re-score what changed.
+
+        Returns:
+            Counts of added, modified and removed posts.
+        """
+        changes = {"added": 0, "modified": 0, "removed": 0}
+        cutoff_date = datetime.now() - timedelta(days=MAX_AGE_DAYS)
+        self._expire(cutoff_date)
+        try:
+            dir_mtime_ns = self.posts_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return changes
+        self._idle_polls += 1
+        if dir_mtime_ns == self._dir_mtime_ns and self._idle_polls < self.rescan_every:
+            return changes
+        self._dir_mtime_ns = dir_mtime_ns
+        self._idle_polls = 0
+
+        current: Dict[str, tuple] = {}
+        with os.scandir(self.posts_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".md") and not entry.name.startswith("."):
+                    st = entry.stat()
+                    current[entry.path] = (st.st_mtime_ns, st.st_size)
+
+        changed = [p for p, sig in current.items() if self._stats.get(p) != sig]
+        removed = [p for p in self._stats if p not in current]
+        if not changed and not removed:
+            return changes
+
+        before = self.detector.duplicates()
+        self.detector.update(self.posts_dir)
+        after = self.detector.duplicates()
+        # Posts whose duplicate status flipped need re-scoring even if unchanged.
+        flipped = {p for p in set(before) ^ set(after) if p in current}
+
+        for path in removed:
+            self._drop(path)
+            changes["removed"] += 1
+        for path in changed:
+            changes["modified" if path in self._stats else "added"] += 1
+        for path in set(changed) | flipped:
+            self._score(path, cutoff_date)
+        self._stats = current
+        return changes
+
+    def add_post(self, post_path: Path) -> bool:
+        """Cluster and score one new post now, without waiting for the next poll.
+
+        Returns:
+            True if the post is a near-duplicate (and so was not ranked).
+        """
+        path = str(post_path)
+        st = post_path.stat()
+        self.detector.add_post(post_path)
+        self._score(path, datetime.now() - timedelta(days=MAX_AGE_DAYS))
+        self._stats[path] = (st.st_mtime_ns, st.st_size)
+        return self.detector.is_duplicate(path)
+
+    def result(self, post_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the ranked result for a post, or None if it is unranked (duplicate, stale or unscored)."""
+        return self._results.get(str(post_path))
+
+    def ranking(self) -> List[Dict[str, Any]]:
+        """Return the current results, highest score first."""
+        return [self._results[path] for _, path in self._ranking]
+
+    def flush(self, force: bool = False) -> bool:
+        """Rewrite important_articles.json if dirty and the debounce window has passed."""
+        self._expire(datetime.now() - timedelta(days=MAX_AGE_DAYS))
+        now = time.monotonic()
+        if not self._dirty or (not force and now - self._last_write < self.debounce):
+            return False
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        write_output(self.output_file, build_output(self.ranking()))
+        self.detector.save(self.data_dir / "post_signatures.json")
+        self._dirty = False
+        self._last_write = now
+        return True
+
+    def run(self) -> None:
+        """Poll until interrupted, flushing on the debounce schedule."""
+        print(f"Watching {self.posts_dir} (poll {self.poll_interval}s, debounce {self.debounce}s)")
+        try:
+            while True:
+                changes = self.poll()
+                if any(changes.values()):
+                    print(
+                        f"  +{changes['added']} ~{changes['modified']} -{changes['removed']}"
+                        f" -> {len(self._results)} ranked"
+                    )
+                if self.flush():
+                    print(f"Saved: {self.output_file}")
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            if self.flush(force=True):
+                print(f"Saved: {self.output_file}")
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--search", metavar="QUERY", help="rank posts for a topic query and exit")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--watch", action="store_true", help="keep running and re-score changed posts")
+    parser.add_argument("--interval", type=float, default=2.0, help="watch poll interval in seconds")
+    parser.add_argument("--debounce", type=float, default=5.0, help="minimum seconds between output rewrites")
+    args = parser.parse_args()
+    if args.search:
+        for i, hit in enumerate(search_posts(args.search, limit=args.limit), 1):
+            print(f"{i}. {hit['score']:.2f}  {hit['path']}")
+    elif args.watch:
+        ValidatorWatcher(
+            Path(os.environ.get("LEGAL_LUMINARY_POSTS", str(_LEGAL_LUMINARY_DEFAULT / "_posts"))),
+            Path(os.environ.get("LEGAL_LUMINARY_DATA", str(_LEGAL_LUMINARY_DEFAULT / "_data"))),
+            poll_interval=args.interval,
+            debounce=args.debounce,
+        ).run()
+    else:
+        main()
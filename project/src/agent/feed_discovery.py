@@ -0,0 +1,211 @@
+"""Feed- and sitemap-first article discovery.
+
+Rendering each ``/news/`` index page in Chromium and querying the DOM is the
+slowest part of a crawl and yields no reliable dates. Most stations publish an
+RSS/Atom feed or a Google News sitemap that lists article URLs with titles
+and publish timestamps. FeedDiscovery tries, per source, the known feed URLs
+for that station, then feeds advertised by ``<link rel="alternate">`` on the
+index page, then a few common paths. The first one that parses is remembered
+in output/crawl_state/feeds.json (failures too, so the earlier 404-prone RSS
+guesses are not retried on every run); the crawler falls back to DOM
+discovery only when a source has no feed.
+
+Feed bodies are fetched whole (so HttpCache can keep them) and parsed in
+memory with ``xml.etree.ElementTree.XMLPullParser``; each item is cleared
+once read, so a large sitemap's element tree is never built alongside it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urljoin
+
+from agent.http_fetch import HttpFetcher, extract_feed_links
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+FEEDS_STATE_PATH = _PROJECT_ROOT / "output" / "crawl_state" / "feeds.json"
+# Sources without a working feed are re-probed after this long.
+RECHECK_SECONDS = 7 * 24 * 3600
+
+# Station-specific feeds, tried first (keyed by source name in date_aware_crawler).
+SOURCE_FEEDS: Dict[str, List[str]] = {
+    "KWTX": [
+        "https://www.kwtx.com/arc/outboundfeeds/news-sitemap/?outputType=xml",
+        "https://www.kwtx.com/arc/outboundfeeds/rss/?outputType=xml",
+    ],
+    "KBTX": [
+        "https://www.kbtx.com/arc/outboundfeeds/news-sitemap/?outputType=xml",
+        "https://www.kbtx.com/arc/outboundfeeds/rss/?outputType=xml",
+    ],
+    "KXAN": [
+        "https://www.kxan.com/news-sitemap.xml",
+        "https://www.kxan.com/feed/",
+    ],
+    "KVUE": [
+        "https://www.kvue.com/feeds/syndication/rss/news",
+    ],
+}
+
+# Tried relative to the site root when nothing else is known.
+COMMON_FEED_PATHS = ["/news-sitemap.xml", "/feed/", "/rss", "/news/rss"]
+
+_ITEM_TAGS = frozenset({"item", "entry", "url"})
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def parse_date(value: Optional[str]) -> Optional[str]:
+    """Parse an RSS (RFC 822) or Atom/sitemap (ISO 8601) timestamp to YYYY-MM-DD."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).strftime("%Y-%m-%d")
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _item_fields(elem: ET.Element) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {}
+    for child in elem.iter():
+        name = _local(child.tag)
+        text = (child.text or "").strip()
+        if name == "link":
+            # Atom puts the URL in href; RSS in the element text.
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                fields.setdefault("href", href)
+            elif text:
+                fields.setdefault("href", text)
+        elif name == "loc" and text:
+            fields.setdefault("href", text)
+        elif name == "title" and text:
+            fields.setdefault("text", text)
+        elif name in ("pubdate", "published", "publication_date", "date") and text:
+            fields.setdefault("date", parse_date(text))
+        elif name in ("updated", "lastmod") and text:
+            fields.setdefault("updated", parse_date(text))
+    return fields
+
+
+def parse_feed(chunks: Iterable[bytes], base_url: str = "") -> Iterator[Dict[str, Any]]:
+    """Yield {href, text, date} for each RSS item, Atom entry or sitemap URL.
+
+    ``chunks`` is the feed body as one or more consecutive byte strings.
+
+    Raises:
+        ET.ParseError: If the body is not well-formed XML.
+    """
+    parser: ET.XMLPullParser[ET.Element] = ET.XMLPullParser(events=("end",))
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _drain(parser, base_url)
+    parser.close()
+    yield from _drain(parser, base_url)
+
+
+def _drain(parser: ET.XMLPullParser[ET.Element], base_url: str) -> Iterator[Dict[str, Any]]:
+    for event in parser.read_events():
+        elem = event[-1]
+        if not isinstance(elem, ET.Element) or _local(elem.tag) not in _ITEM_TAGS:
+            continue
+        fields = _item_fields(elem)
+        elem.clear()
+        href = fields.get("href")
+        if not href:
+            continue
+        yield {
+            "href": urljoin(base_url, href),
+            "text": fields.get("text", ""),
+            "date": fields.get("date") or fields.get("updated"),
+        }
+
+
+class FeedDiscovery:
+    """Finds and reads each source's feed, remembering what worked."""
+
+    def __init__(self, fetcher: HttpFetcher, state_path: Path = FEEDS_STATE_PATH):
+        """Fetch feeds through ``fetcher`` and load remembered state from ``state_path``."""
+        self.fetcher = fetcher
+        self.state_path = state_path
+        # source -> {"feed": url or None, "checked_at": epoch seconds}
+        self.state: Dict[str, Dict[str, Any]] = {}
+        if state_path.exists():
+            try:
+                self.state = json.loads(state_path.read_text())
+            except ValueError:
+                self.state = {}
+
+    def save(self) -> None:
+        """Merge this run's state into the file on disk and write it atomically.
+
+        Crawl worker processes each save their own sources, so entries for
+        sources this instance never touched are kept from the file.
+        """
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        merged: Dict[str, Dict[str, Any]] = {}
+        if self.state_path.exists():
+            try:
+                merged = json.loads(self.state_path.read_text())
+            except ValueError:
+                merged = {}
+        merged.update(self.state)
+        tmp = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(merged, indent=2))
+        os.replace(tmp, self.state_path)
+
+    async def _read(self, feed_url: str) -> Optional[List[Dict[str, Any]]]:
+        result = await self.fetcher.get(feed_url)
+        if result is None or "html" in result[1]:
+            return None
+        try:
+            items = list(parse_feed([result[0]], feed_url))
+        except ET.ParseError:
+            return None
+        return items or None
+
+    async def _candidates(self, name: str, index_url: str) -> List[str]:
+        candidates = list(SOURCE_FEEDS.get(name, []))
+        html = await self.fetcher.get_html(index_url)
+        if html:
+            candidates += extract_feed_links(html, index_url)
+        candidates += [urljoin(index_url, path) for path in COMMON_FEED_PATHS]
+        return list(dict.fromkeys(candidates))
+
+    async def discover(self, name: str, index_url: str) -> List[Dict[str, Any]]:
+        """Return feed items for a source, or [] if it has no usable feed.
+
+        A remembered feed is read directly; a source remembered as feed-less
+        is skipped until RECHECK_SECONDS have passed.
+        """
+        if not self.fetcher.enabled:
+            return []
+        known = self.state.get(name)
+        if known and known.get("feed"):
+            items = await self._read(known["feed"])
+            if items:
+                return items
+        elif known and time.time() - known.get("checked_at", 0) < RECHECK_SECONDS:
+            return []
+
+        for feed_url in await self._candidates(name, index_url):
+            items = await self._read(feed_url)
+            if items:
+                self.state[name] = {"feed": feed_url, "checked_at": time.time()}
+                return items
+        self.state[name] = {"feed": None, "checked_at": time.time()}
+        return []
@@ -0,0 +1,276 @@
+"""Shared reader and writer for Jekyll post front matter.
+
+Crawled and summarized posts use a flat subset of YAML: one ``key: value``
+per line, with plain, single- or double-quoted strings, booleans, integers,
+null and ``YYYY-MM-DD`` dates. parse_front_matter reads that subset with a
+line scanner and only hands anything else (lists, nested maps, multi-line
+or escaped strings) to PyYAML, using the LibYAML C loader when it is built.
+Front matter that is not valid YAML (older crawler output with unescaped
+quotes in a title) is read line by line, as the validator's regexes did.
+
+dump_front_matter writes keys in their original order and quotes a string
+only when it would otherwise read back as something else, so parse and dump
+round-trip. Values outside the flat subset are written by PyYAML, or as
+JSON flow collections (which are valid YAML) without it.
+
+Post wraps a post's text: the front matter is parsed on first access and the
+body sliced off on first access, so readers pay only for what they use.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import yaml
+    HAS_YAML = True
+    _LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    _DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+except ImportError:
+    HAS_YAML = False
+
+_OPEN_RE = re.compile(r"---[ \t]*\r?\n")
+_CLOSE_RE = re.compile(r"^---[ \t]*\r?$", re.MULTILINE)
+_KEY_RE = re.compile(r"[A-Za-z_][\w-]*")
+_LINE_RE = re.compile(r"([A-Za-z_][\w-]*):(?:[ \t]+(.*))?")
+_QUOTES_RE = re.compile(r"""["']?(.*?)["']?""")
+
+_NULLS = frozenset({"", "~", "null", "Null", "NULL"})
+_BOOLS = {"true": True, "True": True, "TRUE": True, "false": False, "False": False, "FALSE": False}
+# Other YAML 1.1 booleans; left to PyYAML so the result matches it exactly.
+_OTHER_BOOLS = frozenset({"yes", "Yes", "YES", "no", "No", "NO", "on", "On", "ON", "off", "Off", "OFF"})
+# Keys YAML reads as null or booleans rather than strings.
+_SPECIAL_KEYS = _NULLS | _BOOLS.keys() | _OTHER_BOOLS
+_INT_RE = re.compile(r"[-+]?(?:0|[1-9][0-9]*)")
+_DATE_RE = re.compile(r"\d{4}-\d\d-\d\d")
+# PyYAML's implicit int, float, timestamp, value and merge resolvers: plain
+# scalars matching one of these are not strings, so they go to PyYAML.
+_RESOLVED_RE = re.compile(
+    r"""[-+]?0b[0-1_]+|[-+]?0[0-7_]+|[-+]?(?:0|[1-9][0-9_]*)|[-+]?0x[0-9a-fA-F_]+
+    |[-+]?[1-9][0-9_]*(?::[0-5]?[0-9])+
+    |[-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+][0-9]+)?|\.[0-9_]+(?:[eE][-+][0-9]+)?
+    |[-+]?[0-9][0-9_]*(?::[0-5]?[0-9])+\.[0-9_]*|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)
+    |[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}(?:(?:[Tt]|[ \t]+)[0-9]{1,2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]*)?
+    (?:[ \t]*(?:Z|[-+][0-9]{1,2}(?::[0-9]{2})?))?)?
+    |=|<<""",
+    re.VERBOSE,
+)
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+# Characters a double-quoted YAML scalar cannot hold raw.
+_UNSAFE_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff\ud800-\udfff]")
+
+# A _plain result meaning "not in the flat subset".
+_NOT_FLAT = object()
+
+
+def split_front_matter(content: str) -> Optional[Tuple[str, int]]:
+    """(front matter text, offset where the body starts), or None if content has no front matter."""
+    opening = _OPEN_RE.match(content)
+    if not opening:
+        return None
+    closing = _CLOSE_RE.search(content, opening.end())
+    if not closing:
+        return None
+    end = closing.end()
+    if content.startswith("\r\n", end):
+        end += 2
+    elif content.startswith("\n", end):
+        end += 1
+    return content[opening.end() : closing.start()], end
+
+
+def _plain(value: str) -> Any:
+    """Return the value PyYAML gives an unquoted scalar, or _NOT_FLAT if it needs PyYAML to tell."""
+    if value in _NULLS:
+        return None
+    if value in _BOOLS:
+        return _BOOLS[value]
+    if value in _OTHER_BOOLS or value[0] in _INDICATORS or ": " in value or " #" in value or value.endswith(":"):
+        return _NOT_FLAT
+    if _INT_RE.fullmatch(value):
+        return int(value)
+    if _DATE_RE.fullmatch(value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return _NOT_FLAT
+    if _RESOLVED_RE.fullmatch(value):
+        return _NOT_FLAT
+    return value
+
+
+def _scalar(value: Optional[str]) -> Any:
+    if value is None:
+        return None
+    value = value.rstrip(" \t")
+    if not value:
+        return None
+    if value.startswith('"'):
+        inner = value[1:-1]
+        if len(value) < 2 or not value.endswith('"') or '"' in inner or "\\" in inner:
+            return _NOT_FLAT
+        return inner
+    if value.startswith("'"):
+        inner = value[1:-1]
+        if len(value) < 2 or not value.endswith("'") or "'" in inner.replace("''", ""):
+            return _NOT_FLAT
+        return inner.replace("''", "'")
+    return _plain(value)
+
+
+def _parse_flat(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the flat subset; None if any line is outside it."""
+    data: Dict[str, Any] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = _LINE_RE.fullmatch(line)
+        if not match or match.group(1) in _SPECIAL_KEYS:
+            return None
+        value = _scalar(match.group(2))
+        if value is _NOT_FLAT:
+            return None
+        data[match.group(1)] = value
+    return data
+
+
+def parse_front_matter(text: str) -> Dict[str, Any]:
+    """Parse a front matter block (without its ``---`` lines) into an ordered dict."""
+    data = _parse_flat(text)
+    if data is not None:
+        return data
+    if HAS_YAML:
+        try:
+            loaded = yaml.load(text, Loader=_LOADER)
+            return loaded if isinstance(loaded, dict) else {}
+        except yaml.YAMLError:
+            pass
+    return _parse_lenient(text)
+
+
+def _parse_lenient(text: str) -> Dict[str, Any]:
+    """Top-level ``key: value`` lines of invalid YAML; values that do not parse lose their outer quotes."""
+    data: Dict[str, Any] = {}
+    for line in text.splitlines():
+        match = _LINE_RE.fullmatch(line)
+        if match:
+            value = _scalar(match.group(2))
+            if value is _NOT_FLAT:
+                quoted = _QUOTES_RE.fullmatch(match.group(2).strip())
+                value = quoted.group(1) if quoted else match.group(2).strip()
+            data[match.group(1)] = value
+    return data
+
+
+def _quote(value: str) -> str:
+    quoted = json.dumps(value, ensure_ascii=False)
+    return _UNSAFE_RE.sub(lambda m: f"\\u{ord(m.group(0)):04x}", quoted)
+
+
+def _dump_scalar(value: Any) -> Optional[str]:
+    """One flat value as YAML, or None if it is outside the flat subset."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str):
+        if value and value == value.strip() and not any(c in value for c in "\r\n\t"):
+            if not _UNSAFE_RE.search(value) and _plain(value) == value:
+                return value
+        return _quote(value)
+    return None
+
+
+def dump_front_matter(data: Dict[str, Any]) -> str:
+    """Front matter block for data (without ``---`` lines), keys in insertion order."""
+    lines: List[str] = []
+    for key, value in data.items():
+        plain_key = isinstance(key, str) and key not in _SPECIAL_KEYS and _KEY_RE.fullmatch(key)
+        dumped = _dump_scalar(value) if plain_key else None
+        if dumped is not None:
+            lines.append(f"{key}: {dumped}")
+        elif HAS_YAML:
+            lines.append(
+                yaml.dump(
+                    {key: value}, Dumper=_DUMPER, default_flow_style=False, allow_unicode=True, sort_keys=False
+                ).rstrip("\n")
+            )
+        else:
+            lines.append(f"{json.dumps(str(key))}: {json.dumps(value, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def render(front_matter: Dict[str, Any], body: str) -> str:
+    """Render a full post: front matter between ``---`` lines, a blank line, then body."""
+    return f"---\n{dump_front_matter(front_matter)}---\n\n{body}"
+
+
+def text_value(value: Any) -> str:
+    """Return a front matter value as display text ("" for missing)."""
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def date_value(value: Any) -> str:
+    """Return the ``YYYY-MM-DD`` part of a front matter date, or "" if it has none."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    match = _DATE_RE.match(text_value(value).strip())
+    return match.group(0) if match else ""
+
+
+class Post:
+    """A post's text, with front matter and body parsed lazily."""
+
+    __slots__ = ("text", "_bounds", "_front_matter", "_body")
+
+    def __init__(self, text: str):
+        """Locate the front matter in text; nothing is parsed until it is read."""
+        self.text = text
+        self._bounds = split_front_matter(text)
+        self._front_matter: Optional[Dict[str, Any]] = None
+        self._body: Optional[str] = None
+
+    @classmethod
+    def read(cls, path: Path) -> Post:
+        """Read the post at path (undecodable bytes are replaced)."""
+        return cls(path.read_text(encoding="utf-8", errors="replace"))
+
+    @property
+    def has_front_matter(self) -> bool:
+        """Whether the text opens with a ``---`` front matter block."""
+        return self._bounds is not None
+
+    @property
+    def front_matter_text(self) -> str:
+        """The raw YAML between the ``---`` lines, or "" without front matter."""
+        return self._bounds[0] if self._bounds else ""
+
+    @property
+    def front_matter(self) -> Dict[str, Any]:
+        """The parsed front matter, or {} without any."""
+        if self._front_matter is None:
+            self._front_matter = parse_front_matter(self._bounds[0]) if self._bounds else {}
+        return self._front_matter
+
+    @property
+    def body(self) -> str:
+        """Everything after the front matter, leading blank lines dropped."""
+        if self._body is None:
+            self._body = self.text[self._bounds[1] :].lstrip("\r\n") if self._bounds else self.text
+        return self._body
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a front matter value, or default if the key is missing."""
+        return self.front_matter.get(key, default)
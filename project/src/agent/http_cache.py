@@ -0,0 +1,179 @@
+"""On-disk HTTP response cache for the crawler.
+
+Stores response bodies with their ETag / Last-Modified validators in SQLite
+(output/http_cache/cache.sqlite3). A cached response younger than the
+freshness window is served without any request; an older one is revalidated
+with If-None-Match / If-Modified-Since, so an unchanged page costs a 304
+instead of a full download. The cache is evicted least-recently-used once it
+grows past its size limit. Hit/revalidation/miss counters feed the crawl
+summary.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+CACHE_PATH = _PROJECT_ROOT / "output" / "http_cache" / "cache.sqlite3"
+FRESHNESS_SECONDS = 15 * 60
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+# Seconds to wait for another process holding the database lock.
+SQLITE_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body and its validators."""
+
+    url: str
+    body: bytes
+    content_type: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    @property
+    def text(self) -> str:
+        """The body decoded as UTF-8, undecodable bytes replaced."""
+        return self.body.decode("utf-8", errors="replace")
+
+    def age(self) -> float:
+        """Return the seconds since the response was stored or last revalidated."""
+        return time.time() - self.stored_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Return the headers that turn a GET into a revalidation request."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """SQLite-backed response cache with freshness window and LRU size cap."""
+
+    def __init__(
+        self,
+        path: Path = CACHE_PATH,
+        freshness: float = FRESHNESS_SECONDS,
+        max_bytes: int = MAX_CACHE_BYTES,
+    ):
+        """Open (or create) the cache.
+
+        Args:
+            path: SQLite file location.
+            freshness: Seconds a response is served without revalidation.
+            max_bytes: Total body size kept before LRU eviction.
+        """
+        self.path = path
+        self.freshness = freshness
+        self.max_bytes = max_bytes
+        self.stats = {"fresh": 0, "revalidated": 0, "miss": 0, "bytes_saved": 0}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by crawl worker processes; in WAL mode readers never wait on a writer.
+        self._db = sqlite3.connect(str(path), timeout=SQLITE_TIMEOUT)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for url, fresh or not, or None if there is none."""
+        row = self._db.execute(
+            "SELECT body, content_type, etag, last_modified, stored_at FROM responses WHERE url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        self._db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        self._db.commit()
+        return CachedResponse(url, row[0], row[1] or "", row[2], row[3], row[4])
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Return True if entry can be served without revalidation."""
+        return entry.age() < self.freshness
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        content_type: str = "",
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a 200 response, evicting old entries if the cache is over its cap."""
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, etag, last_modified, content_type, body, len(body), now, now),
+        )
+        self._evict()
+        self._db.commit()
+
+    def touch(self, url: str) -> None:
+        """Restart the freshness window after a 304."""
+        now = time.time()
+        self._db.execute(
+            "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url)
+        )
+        self._db.commit()
+
+    def record(self, outcome: str, entry: Optional[CachedResponse] = None) -> None:
+        """Count a "fresh", "revalidated" or "miss" lookup."""
+        self.stats[outcome] += 1
+        if entry is not None and outcome != "miss":
+            self.stats["bytes_saved"] += len(entry.body)
+
+    def total_bytes(self) -> int:
+        """Return the total size of the cached bodies."""
+        return int(self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0])
+
+    def _evict(self) -> None:
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        freed = 0
+        victims = []
+        for url, size in self._db.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            if freed >= excess:
+                break
+            victims.append((url,))
+            freed += size
+        self._db.executemany("DELETE FROM responses WHERE url = ?", victims)
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups answered from cache (fresh or via 304)."""
+        total = self.stats["fresh"] + self.stats["revalidated"] + self.stats["miss"]
+        return (self.stats["fresh"] + self.stats["revalidated"]) / total if total else 0.0
+
+    def summary(self) -> str:
+        """Return this run's hit rate, lookup counts and bytes saved."""
+        return (
+            f"{self.hit_rate():.0%} hit rate ({self.stats['fresh']} fresh, "
+            f"{self.stats['revalidated']} revalidated, {self.stats['miss']} downloaded, "
+            f"~{self.stats['bytes_saved'] / 1_000_000:.1f} MB not re-downloaded)"
+        )
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self._db.commit()
+        self._db.close()
@@ -0,0 +1,364 @@
+"""HTTP fast path for article fetching.
+
+Most station article pages render their text server-side, so a plain GET
+through a pooled keep-alive client plus a small HTML-to-text pass is enough;
+starting Chromium for them costs seconds per page. HttpFetcher tries that
+first and returns None when the page needs the browser: the response was not
+HTML, the extracted text was too short, or the domain is known to require
+JavaScript (listed in JS_REQUIRED_DOMAINS, or learned from a high escalation
+rate). Per-domain escalation counts are kept for the crawl summary.
+
+With an HttpCache attached, responses are served from disk while fresh and
+revalidated with conditional requests afterwards; index pages fetched through
+``discover_links`` are cached the same way. ``on_response`` (typically
+HostLimiter.record) sees the status and duration of every network request so
+per-host pacing can back off.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+from agent.crawl_scheduler import host_of
+from agent.http_cache import HttpCache
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
+)
+
+# Domains whose article text only appears after JavaScript runs.
+JS_REQUIRED_DOMAINS: frozenset[str] = frozenset()
+
+# Below this many characters of extracted text the page is treated as a shell.
+MIN_TEXT_CHARS = 300
+# After this many attempts, a domain escalating at least this often skips HTTP.
+LEARN_AFTER = 5
+LEARN_ESCALATION_RATE = 0.8
+
+MAX_CONTENT_CHARS = 3000
+
+_SKIP_TAGS = frozenset(
+    {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "iframe"}
+)
+_BLOCK_TAGS = frozenset(
+    {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "article",
+     "section", "main", "blockquote", "tr", "table", "figcaption", "time"}
+)
+_FEED_TYPES = frozenset({"application/rss+xml", "application/atom+xml", "application/xml", "text/xml"})
+_SPACES_RE = re.compile(r"[ \t\r\f\v\xa0]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.title_parts: List[str] = []
+        self.parts: List[str] = []
+        self.links: List[Dict[str, str]] = []
+        self.feeds: List[str] = []
+        self.canonical: Optional[str] = None
+        self.meta_published_time: Optional[str] = None
+        self.ld_json: List[str] = []
+        self._in_ld_json = False
+        self._skip_depth = 0
+        self._in_title = False
+        self._link: Optional[Dict[str, str]] = None
+
+    def _link_tag(self, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        a = dict(attrs)
+        if (a.get("rel") or "").lower() == "canonical" and a.get("href"):
+            self.canonical = self.canonical or a["href"]
+        if (a.get("rel") or "").lower() == "alternate" and a.get("href") and (
+            a.get("type") or ""
+        ).lower() in _FEED_TYPES:
+            self.feeds.append(a["href"] or "")
+
+    def _meta_tag(self, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        a = dict(attrs)
+        if "article:published_time" in (a.get("property"), a.get("name")):
+            self.meta_published_time = self.meta_published_time or a.get("content")
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "link":
+            self._link_tag(attrs)
+        elif tag == "meta":
+            self._meta_tag(attrs)
+        elif tag == "script" and (dict(attrs).get("type") or "").lower() == "application/ld+json":
+            self._in_ld_json = True
+            self.ld_json.append("")
+        if tag == "a":
+            href = dict(attrs).get("href")
+            self._link = {"href": href, "text": ""} if href else None
+        if tag == "title":
+            self._in_title = True
+        elif tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script":
+            self._in_ld_json = False
+        if tag == "a" and self._link is not None:
+            self._link["text"] = _SPACES_RE.sub(" ", self._link["text"]).strip()
+            self.links.append(self._link)
+            self._link = None
+        if tag == "title":
+            self._in_title = False
+        elif tag in _SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "link":
+            self._link_tag(attrs)
+        elif tag == "meta":
+            self._meta_tag(attrs)
+        elif tag in _BLOCK_TAGS and not self._skip_depth:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_ld_json:
+            self.ld_json[-1] += data
+            return
+        if self._link is not None:
+            self._link["text"] += data
+        if self._in_title:
+            self.title_parts.append(data)
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+
+def _parse(html: str) -> _TextExtractor:
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    return parser
+
+
+def extract_links(html: str, base_url: str) -> List[Dict[str, str]]:
+    """Return every anchor in html as {href (absolute), text}."""
+    return [
+        {"href": urljoin(base_url, link["href"]), "text": link["text"]}
+        for link in _parse(html).links
+    ]
+
+
+def extract_feed_links(html: str, base_url: str) -> List[str]:
+    """Return feed URLs advertised with <link rel="alternate" type="application/rss+xml"> etc."""
+    return [urljoin(base_url, href) for href in _parse(html).feeds]
+
+
+def _ld_date_published(blocks: List[str]) -> Optional[str]:
+    for block in blocks:
+        try:
+            stack = [json.loads(block)]
+        except ValueError:
+            continue
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                if node.get("datePublished"):
+                    return str(node["datePublished"])
+                if "@graph" in node:
+                    stack.append(node["@graph"])
+    return None
+
+
+def _text_of(parser: _TextExtractor) -> Tuple[str, str]:
+    title = _SPACES_RE.sub(" ", "".join(parser.title_parts)).strip()
+    text = _SPACES_RE.sub(" ", "".join(parser.parts))
+    lines = [line.strip() for line in text.split("\n")]
+    text = _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+    return title, text
+
+
+def html_to_text(html: str) -> Tuple[str, str]:
+    """Extract (title, visible text) from an HTML document.
+
+    Scripts, styles and page chrome (nav/header/footer/aside) are dropped and
+    block elements become line breaks, approximating ``innerText``.
+    """
+    return _text_of(_parse(html))
+
+
+def extract_article(html: str, base_url: str = "") -> Dict[str, Any]:
+    """Extract title, text, canonical URL and structured publish dates in one parse.
+
+    Returns the same keys as date_aware_crawler.ARTICLE_METADATA_JS.
+    """
+    parser = _parse(html)
+    title, text = _text_of(parser)
+    return {
+        "title": title,
+        "canonical": urljoin(base_url, parser.canonical) if parser.canonical else None,
+        "ld_date_published": _ld_date_published(parser.ld_json),
+        "meta_published_time": parser.meta_published_time,
+        "content": text,
+    }
+
+
+class HttpFetcher:
+    """Pooled async HTTP client that fetches article text or defers to the browser."""
+
+    def __init__(
+        self,
+        js_required: frozenset[str] = JS_REQUIRED_DOMAINS,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        cache: Optional[HttpCache] = None,
+    ):
+        """Create the fetcher.
+
+        Args:
+            js_required: Domains that always go to the browser.
+            timeout: Per-request timeout in seconds.
+            max_connections: Connection pool size (kept alive between requests).
+            cache: Optional on-disk response cache with conditional revalidation.
+        """
+        self.js_required = set(js_required)
+        self.cache = cache
+        # Called as on_response(url, status, seconds, retry_after); status 0 on network errors.
+        self.on_response: Optional[Callable[[str, int, float, Optional[str]], None]] = None
+        # domain -> {"http": served over HTTP, "browser": escalated}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._client: Any = None
+        if HAS_HTTPX:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+                follow_redirects=True,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=max_connections, max_keepalive_connections=max_connections
+                ),
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if httpx is installed, so pages can be fetched without the browser."""
+        return self._client is not None
+
+    def _record(self, domain: str, outcome: str) -> None:
+        counts = self.stats.setdefault(domain, {"http": 0, "browser": 0})
+        counts[outcome] += 1
+        total = counts["http"] + counts["browser"]
+        if total >= LEARN_AFTER and counts["browser"] / total >= LEARN_ESCALATION_RATE:
+            self.js_required.add(domain)
+
+    def needs_browser(self, url: str) -> bool:
+        """Return True if url's domain is configured or learned to need JavaScript."""
+        domain = host_of(url)
+        return any(domain == d or domain.endswith("." + d) for d in self.js_required)
+
+    async def get(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """GET url through the cache when attached.
+
+        Returns:
+            (body, content_type) for a 200 (or 304 / fresh cache hit), else None.
+        """
+        if not self.enabled:
+            return None
+        cache = self.cache
+        entry = cache.get(url) if cache is not None else None
+        if cache is not None and entry is not None and cache.is_fresh(entry):
+            cache.record("fresh", entry)
+            return entry.body, entry.content_type
+        headers = entry.conditional_headers() if entry is not None else {}
+        started = time.monotonic()
+        try:
+            response = await self._client.get(url, headers=headers)
+        except Exception:
+            if self.on_response is not None:
+                self.on_response(url, 0, time.monotonic() - started, None)
+            return None
+        if self.on_response is not None:
+            self.on_response(
+                url, response.status_code, time.monotonic() - started, response.headers.get("retry-after")
+            )
+        if response.status_code == 304 and cache is not None and entry is not None:
+            cache.touch(url)
+            cache.record("revalidated", entry)
+            return entry.body, entry.content_type
+        if response.status_code != 200:
+            return None
+        content_type = response.headers.get("content-type", "")
+        if cache is not None:
+            cache.record("miss")
+            cache.put(
+                url,
+                response.content,
+                content_type,
+                response.headers.get("etag"),
+                response.headers.get("last-modified"),
+            )
+        return response.content, content_type
+
+    async def get_html(self, url: str) -> Optional[str]:
+        """GET url and return its HTML, or None if it failed or is not HTML."""
+        result = await self.get(url)
+        if result is None or "html" not in result[1]:
+            return None
+        return result[0].decode("utf-8", errors="replace")
+
+    async def discover_links(self, url: str) -> List[Dict[str, str]]:
+        """Return the anchors on an index page fetched over HTTP ([] if unavailable)."""
+        if self.needs_browser(url):
+            return []
+        html = await self.get_html(url)
+        return extract_links(html, url) if html else []
+
+    async def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch url over HTTP.
+
+        Returns:
+            extract_article() fields (content truncated), or None if the caller
+            should use the browser.
+        """
+        domain = host_of(url)
+        if not self.enabled or self.needs_browser(url):
+            self._record(domain, "browser")
+            return None
+        html = await self.get_html(url)
+        if html is None:
+            self._record(domain, "browser")
+            return None
+        article = extract_article(html, url)
+        if len(article["content"]) < MIN_TEXT_CHARS:
+            self._record(domain, "browser")
+            return None
+        self._record(domain, "http")
+        article["content"] = article["content"][:MAX_CONTENT_CHARS]
+        return article
+
+    def escalation_rates(self) -> Dict[str, float]:
+        """Return the fraction of fetches per domain that fell back to the browser."""
+        return {
+            domain: counts["browser"] / (counts["http"] + counts["browser"])
+            for domain, counts in sorted(self.stats.items())
+            if counts["http"] + counts["browser"]
+        }
+
+    async def close(self) -> None:
+        """Close the HTTP client and the attached cache."""
+        if self._client is not None:
+            await self._client.aclose()
+        if self.cache is not None:
+            self.cache.close()
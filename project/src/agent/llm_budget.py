@@ -0,0 +1,317 @@
+"""Token accounting and per-run budgets for LLM calls.
+
+Every LLM call in cleanup_summarize (through agent.summarizers), the quiz1
+graphs and the demo2 graphs goes through this module, so one run can answer
+"how many tokens, how long, what did it cost, what did the cache save".
+
+  estimate_tokens   Pre-flight prompt token count, computed locally with
+                    tiktoken (installed with langchain-openai), or about
+                    four characters per token without it.
+  RunBudget         Limits on tokens, dollars and wall time for one run.
+                    Once a limit would be exceeded, low-priority work is
+                    deferred (the caller skips it or uses its offline
+                    fallback); high-priority work still runs. A unit of
+                    work admitted with reserve() (one post's summary, map
+                    and reduce calls together) holds its estimate against
+                    the budget until release(), so concurrent posts cannot
+                    all pass the check at once; the run overshoots only by
+                    how far actual usage exceeds the estimates.
+  UsageLedger       Per-node calls, prompt and completion tokens (from the
+                    provider's usage metadata when it reports it), latency,
+                    cost, cache hits with the tokens they saved, and
+                    deferrals. report() prints the table after a run.
+
+The run's ledger is module state: start_run() replaces it, ledger() returns
+it. The budget can also come from LLM_BUDGET_TOKENS, LLM_BUDGET_DOLLARS and
+LLM_BUDGET_SECONDS, for graphs started by the LangGraph server.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+
+# USD per 1M (input, output) tokens. Models not listed (local Ollama) cost nothing.
+PRICES: Dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4": (30.00, 60.00),
+}
+# Tokens the chat format adds per message, plus the reply primer.
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+# Completion length assumed by pre-flight cost checks.
+EXPECTED_COMPLETION_TOKENS = 400
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> Any:
+    if not HAS_TIKTOKEN:
+        return None
+    # Encoding files are downloaded on first use, so offline either lookup can
+    # fail with a network error; count_tokens then estimates from length.
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        pass
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def _text(message: Any) -> str:
+    if isinstance(message, str):
+        return message
+    if isinstance(message, tuple):
+        return str(message[-1])
+    if isinstance(message, dict):
+        return str(message.get("content", ""))
+    return str(getattr(message, "content", message))
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """Tokens in text for model's tokenizer (or a length-based estimate)."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def estimate_tokens(messages: Any, model: str = "") -> int:
+    """Prompt tokens for a string or a list of chat messages, counted locally before the call."""
+    if isinstance(messages, str):
+        return count_tokens(messages, model) + TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+    return sum(count_tokens(_text(m), model) + TOKENS_PER_MESSAGE for m in messages) + TOKENS_PER_REPLY
+
+
+def cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD for one call."""
+    prompt_price, completion_price = PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def model_name(llm: Any) -> str:
+    """Return the model a LangChain chat client calls ("" if it does not say)."""
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or "")
+
+
+def response_usage(response: Any) -> Optional[tuple[int, int]]:
+    """(prompt, completion) tokens the provider reported for a response, if any."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+    token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage")
+    if token_usage:
+        return int(token_usage.get("prompt_tokens", 0)), int(token_usage.get("completion_tokens", 0))
+    return None
+
+
+class RunBudget:
+    """Token, dollar and wall-time limits for one run (None means unlimited)."""
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_dollars: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+    ):
+        """Set the limits; each one left as None is not enforced."""
+        self.max_tokens = max_tokens
+        self.max_dollars = max_dollars
+        self.max_seconds = max_seconds
+
+    @classmethod
+    def from_env(cls) -> RunBudget:
+        """Read the limits from LLM_BUDGET_TOKENS, LLM_BUDGET_DOLLARS and LLM_BUDGET_SECONDS."""
+        def _env(name: str, kind: type) -> Any:
+            value = os.environ.get(name, "").strip()
+            return kind(value) if value else None
+
+        return cls(
+            _env("LLM_BUDGET_TOKENS", int), _env("LLM_BUDGET_DOLLARS", float), _env("LLM_BUDGET_SECONDS", float)
+        )
+
+    def exceeded_by(self, tokens: int, dollars: float, seconds: float) -> Optional[str]:
+        """Return which limit a run at these totals would be over, or None."""
+        if self.max_tokens is not None and tokens > self.max_tokens:
+            return "tokens"
+        if self.max_dollars is not None and dollars > self.max_dollars:
+            return "dollars"
+        if self.max_seconds is not None and seconds > self.max_seconds:
+            return "time"
+        return None
+
+
+class UsageLedger:
+    """LLM usage for one run, per node, checked against an optional budget."""
+
+    FIELDS = (
+        "calls", "prompt_tokens", "completion_tokens", "cost", "seconds",
+        "cache_hits", "saved_tokens", "saved_cost", "deferred",
+    )
+
+    def __init__(self, budget: Optional[RunBudget] = None):
+        """Start an empty ledger checked against budget (unlimited when None)."""
+        self.budget = budget or RunBudget()
+        self.started = time.monotonic()
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        # Estimates held by reserved work that has not finished yet.
+        self.reserved_tokens = 0
+        self.reserved_cost = 0.0
+        self._lock = threading.Lock()
+
+    def _node(self, node: str) -> Dict[str, float]:
+        return self.nodes.setdefault(node, dict.fromkeys(self.FIELDS, 0))
+
+    def totals(self) -> Dict[str, float]:
+        """Return every field summed over all nodes."""
+        with self._lock:
+            return {field: sum(n[field] for n in self.nodes.values()) for field in self.FIELDS}
+
+    def elapsed(self) -> float:
+        """Return the seconds since the run started."""
+        return time.monotonic() - self.started
+
+    def allows(self, node: str, model: str, prompt_tokens: int, high_priority: bool = False) -> bool:
+        """Pre-flight check for one call; a low-priority call that would break the budget is deferred."""
+        if high_priority:
+            return True
+        totals = self.totals()
+        completion = EXPECTED_COMPLETION_TOKENS
+        over = self.budget.exceeded_by(
+            int(totals["prompt_tokens"] + totals["completion_tokens"])
+            + self.reserved_tokens
+            + prompt_tokens
+            + completion,
+            totals["cost"] + self.reserved_cost + cost(model, prompt_tokens, completion),
+            self.elapsed(),
+        )
+        if over is None:
+            return True
+        with self._lock:
+            self._node(node)["deferred"] += 1
+        return False
+
+    def reserve(self, node: str, model: str, prompt_tokens: int, high_priority: bool = False) -> bool:
+        """Check like allows(), then hold the estimate against the budget until release()."""
+        if not self.allows(node, model, prompt_tokens, high_priority):
+            return False
+        with self._lock:
+            self.reserved_tokens += prompt_tokens + EXPECTED_COMPLETION_TOKENS
+            self.reserved_cost += cost(model, prompt_tokens, EXPECTED_COMPLETION_TOKENS)
+        return True
+
+    def release(self, model: str, prompt_tokens: int) -> None:
+        """Drop a reservation once its calls have been recorded."""
+        with self._lock:
+            self.reserved_tokens -= prompt_tokens + EXPECTED_COMPLETION_TOKENS
+            self.reserved_cost -= cost(model, prompt_tokens, EXPECTED_COMPLETION_TOKENS)
+
+    def record(self, node: str, model: str, prompt_tokens: int, completion_tokens: int, seconds: float) -> None:
+        """Record one finished call's tokens, cost and latency under node."""
+        with self._lock:
+            stats = self._node(node)
+            stats["calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["cost"] += cost(model, prompt_tokens, completion_tokens)
+            stats["seconds"] += seconds
+
+    def record_response(self, node: str, model: str, messages: Any, response: Any, seconds: float) -> None:
+        """Record a call from the provider's usage metadata, or local estimates without it."""
+        usage = response_usage(response)
+        if usage is None:
+            usage = (estimate_tokens(messages, model), count_tokens(_text(response), model))
+        self.record(node, model, usage[0], usage[1], seconds)
+
+    def record_cache_hit(self, node: str, model: str, prompt_tokens: int) -> None:
+        """Record a call the cache answered; its estimated tokens and cost count as saved."""
+        with self._lock:
+            stats = self._node(node)
+            stats["cache_hits"] += 1
+            stats["saved_tokens"] += prompt_tokens + EXPECTED_COMPLETION_TOKENS
+            stats["saved_cost"] += cost(model, prompt_tokens, EXPECTED_COMPLETION_TOKENS)
+
+    def report(self) -> str:
+        """Per-node table of tokens, latency, cost, cache savings and deferrals."""
+        header = (
+            f"  {'node':<24}{'calls':>7}{'prompt':>10}{'output':>9}{'cost $':>10}{'avg s':>8}"
+            f"{'cached':>8}{'saved tok':>11}{'saved $':>9}{'deferred':>10}"
+        )
+        lines = [f"LLM usage ({self.elapsed():.1f}s wall):", header]
+        rows = sorted(self.nodes.items()) + [("total", self.totals())]
+        for node, s in rows:
+            avg = s["seconds"] / s["calls"] if s["calls"] else 0.0
+            lines.append(
+                f"  {node:<24}{int(s['calls']):>7}{int(s['prompt_tokens']):>10}{int(s['completion_tokens']):>9}"
+                f"{s['cost']:>10.4f}{avg:>8.2f}{int(s['cache_hits']):>8}{int(s['saved_tokens']):>11}"
+                f"{s['saved_cost']:>9.4f}{int(s['deferred']):>10}"
+            )
+        return "\n".join(lines)
+
+
+_ledger = UsageLedger(RunBudget.from_env())
+
+
+def start_run(budget: Optional[RunBudget] = None) -> UsageLedger:
+    """Start a fresh ledger for this run (budget from the environment if not given)."""
+    global _ledger
+    _ledger = UsageLedger(budget or RunBudget.from_env())
+    return _ledger
+
+
+def ledger() -> UsageLedger:
+    """Return the current run's ledger."""
+    return _ledger
+
+
+def invoke(llm: Any, messages: Any, node: str, high_priority: bool = False) -> Any:
+    """Call llm.invoke(messages), budget-checked first and recorded after; None if deferred."""
+    model = model_name(llm)
+    run = ledger()
+    if not run.allows(node, model, estimate_tokens(messages, model), high_priority):
+        return None
+    started = time.monotonic()
+    response = llm.invoke(messages)
+    run.record_response(node, model, messages, response, time.monotonic() - started)
+    return response
+
+
+async def ainvoke(llm: Any, messages: Any, node: str) -> Any:
+    """Await llm.ainvoke(messages) and record it.
+
+    There is no budget check here: these are the calls of work the caller
+    already admitted with reserve().
+    """
+    started = time.monotonic()
+    response = await llm.ainvoke(messages)
+    ledger().record_response(node, model_name(llm), messages, response, time.monotonic() - started)
+    return response
+
+
+def batch(llm: Any, inputs: Sequence[Any], node: str, config: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """Call llm.batch(inputs) and record each response with its share of the wall time.
+
+    Like ainvoke, this does not check the budget; the batch belongs to work
+    the caller already admitted with reserve().
+    """
+    started = time.monotonic()
+    responses: List[Any] = llm.batch(list(inputs), config=config)
+    share = (time.monotonic() - started) / max(1, len(responses))
+    model = model_name(llm)
+    for messages, response in zip(inputs, responses):
+        ledger().record_response(node, model, messages, response, share)
+    return responses
+
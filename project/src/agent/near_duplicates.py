@@ -0,0 +1,313 @@
+"""MinHash/LSH near-duplicate detection for crawled posts.
+
+KWTX, KBTX, KXAN and KVUE often carry the same story under slightly different
+titles, which the crawler's (title[:30], date) key does not catch. Each post
+body is reduced to a MinHash signature over word shingles; locality-sensitive
+hashing (banded signatures) finds candidate pairs, and a pair whose estimated
+Jaccard similarity clears the threshold joins the same cluster.
+
+The first post seen in a cluster (filename order, i.e. earliest date) is its
+canonical post; the others are duplicates that evidence_validator and
+cleanup_summarize skip. Signatures and cluster assignments persist in
+legal-luminary/_data/post_signatures.json so only new or changed posts are
+hashed on each run.
+
+A post with no shingles (nothing but short nav lines) has no signature: it
+is never indexed, matched or reported as a duplicate.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from agent.post_index import read_post
+
+_LEGAL_LUMINARY_DEFAULT = Path("/Volumes/RepoPart1/legal-luminary")
+
+SIGNATURES_FILENAME = "post_signatures.json"
+# 2: posts without shingles store an empty signature instead of a sentinel.
+SIGNATURES_VERSION = 2
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands x 4 rows: candidates from roughly 0.4 Jaccard upward
+SHINGLE_SIZE = 3
+JACCARD_THRESHOLD = 0.5
+# Lines shorter than this are nav/boilerplate ("Weather", "Skip to content")
+# shared by every post from one station; they would make unrelated stories
+# look alike.
+MIN_LINE_WORDS = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SOURCE_HEADER_RE = re.compile(r"^##\s*Source Information\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+def default_signatures_path() -> Path:
+    """Return the signature store location, honoring LEGAL_LUMINARY_DATA."""
+    data_dir = Path(os.environ.get("LEGAL_LUMINARY_DATA", str(_LEGAL_LUMINARY_DEFAULT / "_data")))
+    return data_dir / SIGNATURES_FILENAME
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """Return the set of word n-grams from the article part of a post body."""
+    match = _SOURCE_HEADER_RE.search(text)
+    if match:
+        text = text[: match.start()]
+    words: List[str] = []
+    for line in text.splitlines():
+        line_words = _WORD_RE.findall(line.lower())
+        if len(line_words) >= MIN_LINE_WORDS:
+            words.extend(line_words)
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class NearDuplicateDetector:
+    """Incremental MinHash/LSH clustering of posts with persisted signatures."""
+
+    def __init__(
+        self,
+        num_perm: int = NUM_PERM,
+        bands: int = BANDS,
+        threshold: float = JACCARD_THRESHOLD,
+        seed: int = 1,
+    ):
+        """Create an empty detector.
+
+        Args:
+            num_perm: Number of hash permutations per signature.
+            bands: LSH bands; num_perm must divide evenly.
+            threshold: Minimum estimated Jaccard similarity for a duplicate.
+            seed: Seed for the permutation coefficients (must match the store).
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.seed = seed
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+        # path -> {"mtime_ns", "size", "signature", "canonical"}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[tuple, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def signature(self, text: str) -> List[int]:
+        """Compute the MinHash signature of a post body ([] if it has no shingles)."""
+        hashes = [_shingle_hash(s) for s in shingles(text)]
+        if not hashes:
+            # A shared sentinel would make every such post match every other.
+            return []
+        return [
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+            for a, b in self._perms
+        ]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        if not sig_a or not sig_b:
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+    def _band_keys(self, signature: List[int]) -> List[tuple]:
+        # An empty signature has no bands, so it is never indexed or matched.
+        if not signature:
+            return []
+        return [
+            (i, tuple(signature[i * self.rows : (i + 1) * self.rows]))
+            for i in range(self.bands)
+        ]
+
+    def _index(self, path: str, signature: List[int]) -> None:
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, []).append(path)
+
+    def _unindex(self, path: str, signature: List[int]) -> None:
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket and path in bucket:
+                bucket.remove(path)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _best_match(self, path: str, signature: List[int]) -> Optional[str]:
+        best, best_sim = None, self.threshold
+        seen = set()
+        for key in self._band_keys(signature):
+            for other in self._buckets.get(key, ()):
+                if other == path or other in seen:
+                    continue
+                seen.add(other)
+                sim = self.similarity(signature, self.docs[other]["signature"])
+                if sim >= best_sim:
+                    best, best_sim = other, sim
+        if best is None:
+            return None
+        return self.docs[best]["canonical"] or best
+
+    def add(self, path: str, text: str, mtime_ns: int = 0, size: int = 0) -> Optional[str]:
+        """Hash and cluster one post.
+
+        Returns:
+            The canonical post path if this post is a near-duplicate, else None.
+        """
+        previous = self.docs.get(path)
+        dependents = [p for p, d in self.docs.items() if d["canonical"] == path]
+        if previous is not None:
+            self._unindex(path, previous["signature"])
+        signature = self.signature(text)
+        # A post other posts already point at stays canonical even if its own
+        # text changes (e.g. after summarization), so clusters stay stable.
+        canonical = None if dependents else self._best_match(path, signature)
+        self.docs[path] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "signature": signature,
+            "canonical": canonical,
+        }
+        self._index(path, signature)
+        return canonical
+
+    def add_post(self, post_path: Path) -> Optional[str]:
+        """Read a post from disk and cluster it."""
+        st = post_path.stat()
+        _, body = read_post(post_path)
+        return self.add(str(post_path), body, st.st_mtime_ns, st.st_size)
+
+    def remove(self, path: str) -> bool:
+        """Forget a post; its duplicates are re-homed to the next post in the cluster."""
+        doc = self.docs.pop(path, None)
+        if doc is None:
+            return False
+        self._unindex(path, doc["signature"])
+        dependents = sorted(p for p, d in self.docs.items() if d["canonical"] == path)
+        if dependents:
+            new_canonical = dependents[0]
+            self.docs[new_canonical]["canonical"] = None
+            for other in dependents[1:]:
+                self.docs[other]["canonical"] = new_canonical
+        return True
+
+    def update(self, posts_dir: Path) -> Dict[str, int]:
+        """Sync with posts_dir, hashing only new or changed posts.
+
+        Returns:
+            Counts of added, updated and removed posts and current duplicates.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        present: Dict[str, os.stat_result] = {}
+        with os.scandir(posts_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".md") and not entry.name.startswith("."):
+                    present[entry.path] = entry.stat()
+        for path in [p for p in self.docs if p not in present]:
+            self.remove(path)
+            stats["removed"] += 1
+        # Filename order puts the earliest-dated copy of a story first, so it
+        # becomes the canonical post of its cluster.
+        for path in sorted(present):
+            st = present[path]
+            doc = self.docs.get(path)
+            if doc and doc["mtime_ns"] == st.st_mtime_ns and doc["size"] == st.st_size:
+                continue
+            _, body = read_post(Path(path))
+            self.add(path, body, st.st_mtime_ns, st.st_size)
+            stats["updated" if doc else "added"] += 1
+        stats["duplicates"] = len(self.duplicates())
+        return stats
+
+    def canonical_of(self, path: str) -> str:
+        """Return the canonical post for path (path itself if it is canonical or unknown)."""
+        doc = self.docs.get(str(path))
+        return (doc or {}).get("canonical") or str(path)
+
+    def is_duplicate(self, path: str) -> bool:
+        return bool((self.docs.get(str(path)) or {}).get("canonical"))
+
+    def duplicates(self) -> Dict[str, str]:
+        """Map each duplicate post to its canonical post."""
+        return {p: d["canonical"] for p, d in self.docs.items() if d["canonical"]}
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Map each canonical post that has duplicates to its sorted duplicates."""
+        out: Dict[str, List[str]] = {}
+        for path, canonical in sorted(self.duplicates().items()):
+            out.setdefault(canonical, []).append(path)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": SIGNATURES_VERSION,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "threshold": self.threshold,
+            "seed": self.seed,
+            "docs": self.docs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NearDuplicateDetector":
+        detector = cls(
+            num_perm=data.get("num_perm", NUM_PERM),
+            bands=data.get("bands", BANDS),
+            threshold=data.get("threshold", JACCARD_THRESHOLD),
+            seed=data.get("seed", 1),
+        )
+        if data.get("version") != SIGNATURES_VERSION:
+            return detector
+        detector.docs = data.get("docs", {})
+        for path, doc in detector.docs.items():
+            detector._index(path, doc["signature"])
+        return detector
+
+    def save(self, signatures_path: Optional[Path] = None) -> Path:
+        """Write signatures and clusters as JSON (temp file + rename)."""
+        signatures_path = signatures_path or default_signatures_path()
+        signatures_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = signatures_path.with_name(signatures_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        os.replace(tmp, signatures_path)
+        return signatures_path
+
+    @classmethod
+    def load(cls, signatures_path: Optional[Path] = None) -> "NearDuplicateDetector":
+        """Load a saved store; returns an empty detector if missing or unreadable."""
+        signatures_path = signatures_path or default_signatures_path()
+        if not signatures_path.exists():
+            return cls()
+        try:
+            return cls.from_dict(json.loads(signatures_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+
+def load_updated_detector(
+    posts_dir: Path, signatures_path: Optional[Path] = None
+) -> NearDuplicateDetector:
+    """Load the saved store, refresh it against posts_dir, and persist any changes."""
+    detector = NearDuplicateDetector.load(signatures_path)
+    if posts_dir.exists():
+        stats = detector.update(posts_dir)
+        if stats["added"] or stats["updated"] or stats["removed"]:
+            detector.save(signatures_path)
+    return detector
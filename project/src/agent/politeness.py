@@ -0,0 +1,266 @@
+"""Per-host politeness for the crawler: token buckets, robots.txt and backoff.
+
+Each host gets a token bucket (requests per second plus a small burst). The
+rate starts at DEFAULT_RATE, capped by the host's robots.txt ``Crawl-delay``,
+and adapts to how the host responds: a 429 or 5xx halves it and pauses the
+host (for ``Retry-After`` when given), a slow or timed-out load trims it, and
+every normal response nudges it back up towards the cap. Politeness also
+suggests a navigation timeout per host from its recent load times, in place
+of one fixed timeout for every site.
+
+robots.txt bodies are cached in output/crawl_state/robots.json for
+ROBOTS_TTL_SECONDS so a crawl does not refetch them on every run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin
+from urllib.robotparser import RobotFileParser
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+ROBOTS_PATH = _PROJECT_ROOT / "output" / "crawl_state" / "robots.json"
+ROBOTS_TTL_SECONDS = 24 * 3600
+ROBOTS_USER_AGENT = "*"
+
+# Requests per second per host, and how many may go out back to back.
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 3
+# Floor for adaptive backoff; a robots.txt Crawl-delay may set a lower cap.
+MIN_RATE = 0.1
+# Additive increase per normal response; multiplicative decrease on trouble.
+RECOVERY_STEP = 0.1
+ERROR_FACTOR = 0.5
+SLOW_FACTOR = 0.75
+# Pause after a 429/5xx without Retry-After, doubled per consecutive error.
+BASE_PAUSE_SECONDS = 2.0
+MAX_PAUSE_SECONDS = 120.0
+# A load slower than this counts against the host.
+SLOW_LOAD_SECONDS = 8.0
+# Navigation timeout is a multiple of the host's smoothed load time, within bounds.
+TIMEOUT_MULTIPLIER = 4.0
+MIN_TIMEOUT_SECONDS = 5.0
+MAX_TIMEOUT_SECONDS = 30.0
+LATENCY_SMOOTHING = 0.3
+
+Getter = Callable[[str], Awaitable[Optional[Tuple[bytes, str]]]]
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class TokenBucket:
+    """Classic token bucket; ``acquire`` sleeps until a token is available."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """Start full, refilling ``rate`` tokens per second up to ``burst``."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.not_before = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token can be taken (0 if one is available now)."""
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, self.not_before - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        return wait
+
+    async def acquire(self) -> None:
+        """Wait for a token and take it."""
+        while True:
+            wait = self.delay()
+            if wait <= 0:
+                self.tokens -= 1
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for at least seconds from now."""
+        self.not_before = max(self.not_before, time.monotonic() + seconds)
+
+
+class RobotsCache:
+    """robots.txt per origin, cached on disk, answering Crawl-delay."""
+
+    def __init__(self, get: Getter, path: Path = ROBOTS_PATH, ttl: float = ROBOTS_TTL_SECONDS):
+        """Create the cache.
+
+        Args:
+            get: Async fetch returning (body, content_type) or None, e.g. HttpFetcher.get.
+            path: JSON file holding {origin: {"text", "fetched_at"}}.
+            ttl: Seconds before a cached robots.txt is fetched again.
+        """
+        self.get = get
+        self.path = path
+        self.ttl = ttl
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._parsers: Dict[str, RobotFileParser] = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text())
+            except ValueError:
+                self.entries = {}
+
+    async def parser(self, url: str) -> RobotFileParser:
+        """Return the parsed robots.txt for url's origin, fetching it if missing or expired."""
+        origin = urljoin(url, "/")
+        if origin in self._parsers:
+            return self._parsers[origin]
+        entry = self.entries.get(origin)
+        if entry is None or time.time() - entry.get("fetched_at", 0) > self.ttl:
+            result = await self.get(urljoin(origin, "/robots.txt"))
+            text = result[0].decode("utf-8", errors="replace") if result else ""
+            entry = {"text": text, "fetched_at": time.time()}
+            self.entries[origin] = entry
+        parser = RobotFileParser()
+        parser.parse(entry["text"].splitlines())
+        self._parsers[origin] = parser
+        return parser
+
+    async def crawl_delay(self, url: str) -> Optional[float]:
+        """Seconds between requests the site asks for, or None."""
+        parser = await self.parser(url)
+        delay = parser.crawl_delay(ROBOTS_USER_AGENT)
+        if delay is None:
+            rate = parser.request_rate(ROBOTS_USER_AGENT)
+            if rate is not None and rate.requests:
+                return rate.seconds / rate.requests
+        return float(delay) if delay is not None else None
+
+    def save(self) -> None:
+        """Write the cache, keeping entries other crawl workers saved meanwhile."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        merged: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                merged = json.loads(self.path.read_text())
+            except ValueError:
+                merged = {}
+        merged.update(self.entries)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(merged, indent=2))
+        os.replace(tmp, self.path)
+
+
+class HostState:
+    """Bucket and adaptive-rate bookkeeping for one host."""
+
+    def __init__(self, rate: float, burst: int):
+        """Start the host at ``rate`` requests per second, which is also its ceiling."""
+        self.bucket = TokenBucket(rate, burst)
+        self.ceiling = rate
+        self.latency: Optional[float] = None
+        self.consecutive_errors = 0
+        self.errors = 0
+        self.slow = 0
+        self.requests = 0
+        self.ready = False
+        self.lock = asyncio.Lock()
+
+
+class Politeness:
+    """Per-host token buckets with robots.txt caps and adaptive backoff."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        robots: Optional[RobotsCache] = None,
+    ):
+        """Create the scheduler.
+
+        Args:
+            rate: Starting and maximum requests per second for each host.
+            burst: Requests a host may receive back to back.
+            robots: Optional robots.txt cache; its Crawl-delay lowers the host's cap.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.robots = robots
+        self.hosts: Dict[str, HostState] = {}
+
+    def _state(self, host: str) -> HostState:
+        if host not in self.hosts:
+            self.hosts[host] = HostState(self.rate, self.burst)
+        return self.hosts[host]
+
+    async def wait(self, host: str, url: str) -> None:
+        """Block until host may receive another request."""
+        state = self._state(host)
+        if not state.ready:
+            async with state.lock:
+                if not state.ready and self.robots is not None:
+                    delay = await self.robots.crawl_delay(url)
+                    if delay:
+                        state.ceiling = min(state.ceiling, 1 / delay)
+                        state.bucket.rate = state.ceiling
+                        state.bucket.burst = 1
+                        state.bucket.tokens = min(state.bucket.tokens, 1)
+                state.ready = True
+        await state.bucket.acquire()
+
+    def record(self, host: str, status: int, seconds: float, retry_after: Optional[str] = None) -> None:
+        """Adapt host's rate to one response (status 0 means the load failed or timed out)."""
+        state = self._state(host)
+        bucket = state.bucket
+        state.requests += 1
+        if status == 429 or status >= 500:
+            state.errors += 1
+            state.consecutive_errors += 1
+            bucket.rate = max(min(MIN_RATE, state.ceiling), bucket.rate * ERROR_FACTOR)
+            pause = retry_after_seconds(retry_after)
+            if pause is None:
+                pause = BASE_PAUSE_SECONDS * 2 ** (state.consecutive_errors - 1)
+            bucket.pause(min(pause, MAX_PAUSE_SECONDS))
+            return
+        state.consecutive_errors = 0
+        if status:
+            state.latency = seconds if state.latency is None else (
+                LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * state.latency
+            )
+        if status == 0 or seconds > SLOW_LOAD_SECONDS:
+            state.slow += 1
+            bucket.rate = max(min(MIN_RATE, state.ceiling), bucket.rate * SLOW_FACTOR)
+        else:
+            bucket.rate = min(state.ceiling, bucket.rate + RECOVERY_STEP)
+
+    def timeout_for(self, host: str) -> float:
+        """Navigation timeout in seconds for host, from its smoothed load time."""
+        state = self.hosts.get(host)
+        if state is None or state.latency is None:
+            return MAX_TIMEOUT_SECONDS
+        return min(MAX_TIMEOUT_SECONDS, max(MIN_TIMEOUT_SECONDS, state.latency * TIMEOUT_MULTIPLIER))
+
+    def summary(self) -> str:
+        """Return each host's current rate, ceiling and error counts on one line."""
+        parts = [
+            f"{host} {state.bucket.rate:.2f}/s (cap {state.ceiling:.2f}, "
+            f"{state.errors} throttled/5xx, {state.slow} slow of {state.requests})"
+            for host, state in sorted(self.hosts.items())
+        ]
+        return "; ".join(parts) or "no requests"
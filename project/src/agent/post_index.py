@@ -0,0 +1,230 @@
+"""BM25 inverted index over Jekyll posts.
+
+Indexes post titles and bodies from legal-luminary/_posts so topic queries
+("rank posts about X") are answered from a persisted index instead of
+rescanning every file. The index is stored as JSON next to
+important_articles.json (legal-luminary/_data/post_index.json) and is updated
+incrementally: only posts whose mtime or size changed are re-tokenized.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from agent.front_matter import Post, text_value
+
+_LEGAL_LUMINARY_DEFAULT = Path("/Volumes/RepoPart1/legal-luminary")
+
+INDEX_FILENAME = "post_index.json"
+INDEX_VERSION = 1
+
+# Title tokens count this many times toward term frequency (cheap BM25F).
+TITLE_WEIGHT = 3
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """a an and are as at be by for from has have he her his in is it its of on
+    or she that the their they this to was were will with""".split()
+)
+
+
+def default_index_path() -> Path:
+    """Return the index location, honoring LEGAL_LUMINARY_DATA."""
+    data_dir = Path(os.environ.get("LEGAL_LUMINARY_DATA", str(_LEGAL_LUMINARY_DEFAULT / "_data")))
+    return data_dir / INDEX_FILENAME
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into index terms, dropping stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def read_post(post_path: Path) -> tuple[str, str]:
+    """Return (title, body) for a Jekyll post."""
+    post = Post.read(post_path)
+    if not post.has_front_matter:
+        return "", post.text
+    return text_value(post.get("title")), post.body.strip()
+
+
+class PostIndex:
+    """Persistent inverted index with BM25 ranking over post title + body."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        """Create an empty index.
+
+        Args:
+            k1: BM25 term-frequency saturation.
+            b: BM25 document-length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        # path -> {"title", "length", "mtime_ns", "size", "terms": {term: tf}}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        # term -> {path: tf}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def __contains__(self, path: object) -> bool:
+        return str(path) in self.docs
+
+    def add_document(
+        self,
+        path: str,
+        title: str,
+        body: str,
+        mtime_ns: int = 0,
+        size: int = 0,
+    ) -> None:
+        """Index (or re-index) one document under ``path``."""
+        self.remove(path)
+        terms: Dict[str, int] = {}
+        for term in tokenize(body):
+            terms[term] = terms.get(term, 0) + 1
+        for term in tokenize(title):
+            terms[term] = terms.get(term, 0) + TITLE_WEIGHT
+        length = sum(terms.values())
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[path] = tf
+        self.docs[path] = {
+            "title": title,
+            "length": length,
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "terms": list(terms),
+        }
+        self.total_length += length
+
+    def add_post(self, post_path: Path) -> None:
+        """Read a post from disk and index it."""
+        st = post_path.stat()
+        title, body = read_post(post_path)
+        self.add_document(str(post_path), title, body, st.st_mtime_ns, st.st_size)
+
+    def remove(self, path: str) -> bool:
+        """Drop a document from the index. Returns True if it was present."""
+        doc = self.docs.pop(str(path), None)
+        if doc is None:
+            return False
+        for term in doc["terms"]:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(str(path), None)
+            if not posting:
+                del self.postings[term]
+        self.total_length -= doc["length"]
+        return True
+
+    def update(self, posts_dir: Path) -> Dict[str, int]:
+        """Bring the index in line with posts_dir, re-reading only changed posts.
+
+        Returns:
+            Counts of added, updated and removed posts.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        present = set()
+        with os.scandir(posts_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".md") or entry.name.startswith("."):
+                    continue
+                present.add(entry.path)
+                st = entry.stat()
+                doc = self.docs.get(entry.path)
+                if doc and doc["mtime_ns"] == st.st_mtime_ns and doc["size"] == st.st_size:
+                    continue
+                title, body = read_post(Path(entry.path))
+                self.add_document(entry.path, title, body, st.st_mtime_ns, st.st_size)
+                stats["updated" if doc else "added"] += 1
+        for path in [p for p in self.docs if p not in present]:
+            self.remove(path)
+            stats["removed"] += 1
+        return stats
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Rank indexed posts against a free-text query with BM25.
+
+        Returns:
+            Up to ``limit`` dicts with path, title and score, best first.
+        """
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avgdl = self.total_length / n_docs or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for path, tf in posting.items():
+                dl = self.docs[path]["length"]
+                norm = tf + self.k1 * (1 - self.b + self.b * dl / avgdl)
+                scores[path] = scores.get(path, 0.0) + idf * tf * (self.k1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+        return [
+            {"path": path, "title": self.docs[path]["title"], "score": round(score, 4)}
+            for path, score in ranked
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "docs": self.docs,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PostIndex":
+        index = cls(k1=data.get("k1", BM25_K1), b=data.get("b", BM25_B))
+        if data.get("version") != INDEX_VERSION:
+            return index
+        index.docs = data.get("docs", {})
+        index.postings = data.get("postings", {})
+        index.total_length = sum(d["length"] for d in index.docs.values())
+        return index
+
+    def save(self, index_path: Optional[Path] = None) -> Path:
+        """Write the index as JSON (temp file + rename so readers never see a partial file)."""
+        index_path = index_path or default_index_path()
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = index_path.with_name(index_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        os.replace(tmp, index_path)
+        return index_path
+
+    @classmethod
+    def load(cls, index_path: Optional[Path] = None) -> "PostIndex":
+        """Load a saved index; returns an empty index if missing or unreadable."""
+        index_path = index_path or default_index_path()
+        if not index_path.exists():
+            return cls()
+        try:
+            return cls.from_dict(json.loads(index_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError):
+            return cls()
+
+
+def load_updated_index(posts_dir: Path, index_path: Optional[Path] = None) -> PostIndex:
+    """Load the saved index, refresh it against posts_dir, and persist any changes."""
+    index = PostIndex.load(index_path)
+    if posts_dir.exists():
+        stats = index.update(posts_dir)
+        if any(stats.values()):
+            index.save(index_path)
+    return index
@@ -0,0 +1,55 @@
+"""Crash-safe post writes and the manifest of posts a run changed.
+
+Posts are rewritten through a temp file in the same directory, fsynced and
+renamed over the original, so a crash leaves either the old post or the new
+one, never a truncated file. A write whose content is byte-identical to the
+file on disk is skipped, keeping the file's mtime, so Jekyll's incremental
+build only regenerates posts that really changed. The temp file is a
+dotfile, which Jekyll and the post scanners ignore.
+
+Each cleanup or crawl run records the posts it changed in
+``_data/changed_posts.json`` (see write_manifest).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+MANIFEST_FILENAME = "changed_posts.json"
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Atomically replace path with content; return False, writing nothing, if it already matches."""
+    data = content.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_manifest(data_dir: Path, changed: Iterable[str]) -> Path:
+    """Write the sorted paths one run changed to data_dir/changed_posts.json (temp file + rename)."""
+    paths = sorted(set(changed))
+    manifest = {"generated_at": datetime.now().isoformat(), "count": len(paths), "changed": paths}
+    path = data_dir / MANIFEST_FILENAME
+    data_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
@@ -21,6 +21,8 @@ from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from agent.llm_budget import invoke, ledger
+
 
 def get_llm():
     """Get the LLM instance based on available API keys."""
@@ -44,6 +46,7 @@ def check_vagueness(state: Quiz1State) -> dict:
     spec = state["specification"]
     llm = get_llm()
 
+    response = None
     if llm:
         messages = [
             SystemMessage(
@@ -54,7 +57,8 @@ Respond with only 'VAGUE' or 'NOT_VAGUE'."""
             ),
             HumanMessage(content=spec),
         ]
-        response = llm.invoke(messages)
+        response = invoke(llm, messages, "check_vagueness")
+    if response is not None:
         is_vague = "VAGUE" in response.content.upper()
     else:
         vague_indicators = [
@@ -79,6 +83,7 @@ def fix_vagueness(state: Quiz1State) -> dict:
     spec = state["specification"]
     llm = get_llm()
 
+    response = None
     if llm:
         messages = [
             SystemMessage(
@@ -89,7 +94,8 @@ Return ONLY the clarified specification, no explanation."""
             ),
             HumanMessage(content=spec),
         ]
-        response = llm.invoke(messages)
+        response = invoke(llm, messages, "fix_vagueness")
+    if response is not None:
         clarified = response.content.strip()
     else:
         clarifications = {
@@ -119,6 +125,7 @@ def generate_test_case(state: Quiz1State) -> dict:
     is_vague = state["is_vague"]
     llm = get_llm()
 
+    response = None
     if llm:
         messages = [
             SystemMessage(
@@ -131,7 +138,8 @@ Format as structured text. Be specific and measurable."""
             ),
             HumanMessage(content=spec),
         ]
-        response = llm.invoke(messages)
+        response = invoke(llm, messages, "generate_test_case")
+    if response is not None:
         test_case = response.content.strip()
     else:
         test_case = f"""Test Case Specification:
@@ -200,3 +208,5 @@ if __name__ == "__main__":
             print(f"Clarified: {result['clarified_spec']}")
         print(f"Test Case:\n{result['test_case']}")
         print("=" * 60)
+
+    print(ledger().report())
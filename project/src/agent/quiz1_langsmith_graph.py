@@ -17,6 +17,8 @@ from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from agent.llm_budget import invoke, ledger
+
 
 def get_langsmith_callbacks():
     """Get LangSmith callbacks if tracing is enabled."""
@@ -73,6 +75,7 @@ def check_vagueness(state: Quiz1LangSmithState) -> dict:
     spec = state["specification"]
     llm = get_llm()
 
+    response = None
     if llm:
         messages = [
             SystemMessage(
@@ -83,7 +86,8 @@ Respond with only 'VAGUE' or 'NOT_VAGUE'."""
             ),
             HumanMessage(content=spec),
         ]
-        response = llm.invoke(messages)
+        response = invoke(llm, messages, "check_vagueness")
+    if response is not None:
         is_vague = "VAGUE" in response.content.upper()
     else:
         vague_indicators = [
@@ -108,6 +112,7 @@ def fix_vagueness(state: Quiz1LangSmithState) -> dict:
     spec = state["specification"]
     llm = get_llm()
 
+    response = None
     if llm:
         messages = [
             SystemMessage(
@@ -118,7 +123,8 @@ Return ONLY the clarified specification, no explanation."""
             ),
             HumanMessage(content=spec),
         ]
-        response = llm.invoke(messages)
+        response = invoke(llm, messages, "fix_vagueness")
+    if response is not None:
         clarified = response.content.strip()
     else:
         clarifications = {
@@ -148,6 +154,7 @@ def generate_test_case(state: Quiz1LangSmithState) -> dict:
     is_vague = state["is_vague"]
     llm = get_llm()
 
+    response = None
     if llm:
         messages = [
             SystemMessage(
@@ -160,7 +167,8 @@ Format as structured text. Be specific and measurable."""
             ),
             HumanMessage(content=spec),
         ]
-        response = llm.invoke(messages)
+        response = invoke(llm, messages, "generate_test_case")
+    if response is not None:
         test_case = response.content.strip()
     else:
         test_case = f"""Test Case Specification:
@@ -238,3 +246,4 @@ if __name__ == "__main__":
 
     print(f"\nTotal chains executed: {chains_executed}")
     print("Check LangSmith dashboard for detailed traces.")
+    print(ledger().report())
@@ -0,0 +1,177 @@
+"""Request interception for the Playwright crawler.
+
+The crawler only reads ``innerText``, so images, media, fonts, stylesheets,
+ads and third-party trackers are pure overhead. ResourceBlocker installs a
+``context.route`` handler that aborts requests by Playwright resource type or
+by domain, with per-source overrides, and keeps counters of what was blocked.
+Aborted requests never report a size, so bytes saved is estimated from a
+typical transfer size per resource type.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from agent.crawl_scheduler import host_of
+
+BLOCKED_RESOURCE_TYPES = frozenset(
+    {"image", "media", "font", "stylesheet", "imageset", "texttrack", "object", "beacon", "csp_report"}
+)
+
+BLOCKED_DOMAINS = frozenset(
+    {
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googletagmanager.com",
+        "googletagservices.com",
+        "google-analytics.com",
+        "adservice.google.com",
+        "amazon-adsystem.com",
+        "adnxs.com",
+        "taboola.com",
+        "outbrain.com",
+        "scorecardresearch.com",
+        "chartbeat.com",
+        "chartbeat.net",
+        "facebook.net",
+        "connect.facebook.net",
+        "twitter.com",
+        "quantserve.com",
+        "moatads.com",
+        "brightcove.net",
+        "jwplatform.com",
+        "jwpcdn.com",
+        "cdn.cookielaw.org",
+    }
+)
+
+# Typical transfer size per resource type, used to estimate bytes saved.
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 80_000,
+    "imageset": 60_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+# Per-source overrides, keyed by source name as used in date_aware_crawler.
+SOURCE_OVERRIDES: Dict[str, Dict[str, Any]] = {}
+
+# Optional JSON config: top-level keys use the same vocabulary as an override
+# and apply to every source; "sources" holds per-source overrides.
+BLOCKING_CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "resource_blocking.json"
+
+
+@dataclass
+class BlockingPolicy:
+    """What to abort for one source."""
+
+    resource_types: FrozenSet[str] = BLOCKED_RESOURCE_TYPES
+    domains: FrozenSet[str] = BLOCKED_DOMAINS
+    allow_domains: FrozenSet[str] = frozenset()
+
+    def with_override(self, override: Optional[Dict[str, Any]]) -> "BlockingPolicy":
+        """Return a policy adjusted by a SOURCE_OVERRIDES-style dict.
+
+        Recognized keys: ``resource_types`` / ``domains`` (replace),
+        ``extra_resource_types`` / ``extra_domains`` (add),
+        ``allow_resource_types`` / ``allow_domains`` (remove / always allow).
+        """
+        if not override:
+            return self
+        types = frozenset(override.get("resource_types", self.resource_types))
+        types = (types | frozenset(override.get("extra_resource_types", ()))) - frozenset(
+            override.get("allow_resource_types", ())
+        )
+        domains = frozenset(override.get("domains", self.domains)) | frozenset(
+            override.get("extra_domains", ())
+        )
+        allow = self.allow_domains | frozenset(override.get("allow_domains", ()))
+        return BlockingPolicy(resource_types=types, domains=domains, allow_domains=allow)
+
+    def should_block(self, resource_type: str, url: str) -> Optional[str]:
+        """Return the block reason ("type" or "domain"), or None to let it through."""
+        host = host_of(url)
+        if resource_type == "document" or _matches(host, self.allow_domains):
+            return None
+        if resource_type in self.resource_types:
+            return "type"
+        if _matches(host, self.domains):
+            return "domain"
+        return None
+
+
+def _matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+@dataclass
+class BlockingStats:
+    """Counters for one crawl (shared across sources)."""
+
+    allowed: int = 0
+    blocked: int = 0
+    bytes_saved: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+    by_reason: Dict[str, int] = field(default_factory=dict)
+
+    def record_block(self, resource_type: str, reason: str, size: int) -> None:
+        self.blocked += 1
+        self.bytes_saved += size
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+        self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+
+    def summary(self) -> str:
+        top = ", ".join(f"{t}={n}" for t, n in sorted(self.by_type.items(), key=lambda kv: -kv[1])[:5])
+        return (
+            f"blocked {self.blocked} of {self.blocked + self.allowed} requests, "
+            f"~{self.bytes_saved / 1_000_000:.1f} MB saved ({top})"
+        )
+
+
+class ResourceBlocker:
+    """Installs a route handler on a browser context and tallies what it blocks."""
+
+    def __init__(self, policy: Optional[BlockingPolicy] = None, stats: Optional[BlockingStats] = None):
+        self.policy = policy or BlockingPolicy()
+        self.stats = stats or BlockingStats()
+
+        self.source_overrides: Dict[str, Dict[str, Any]] = dict(SOURCE_OVERRIDES)
+
+    @classmethod
+    def from_config(cls, config_path: Path = BLOCKING_CONFIG_PATH) -> "ResourceBlocker":
+        """Build a blocker from the defaults plus config/resource_blocking.json if present."""
+        blocker = cls()
+        if config_path.exists():
+            config = json.loads(config_path.read_text())
+            blocker.source_overrides.update(config.pop("sources", {}))
+            blocker.policy = blocker.policy.with_override(config)
+        return blocker
+
+    def for_source(self, name: str) -> "ResourceBlocker":
+        """Return a blocker with this source's override applied that shares these counters."""
+        child = ResourceBlocker(self.policy.with_override(self.source_overrides.get(name)), self.stats)
+        child.source_overrides = self.source_overrides
+        return child
+
+    async def handle(self, route: Any) -> None:
+        """Playwright route handler: abort blocked requests, continue the rest."""
+        request = route.request
+        reason = self.policy.should_block(request.resource_type, request.url)
+        if reason is None:
+            self.stats.allowed += 1
+            await route.continue_()
+            return
+        size = ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+        self.stats.record_block(request.resource_type, reason, size)
+        await route.abort("blockedbyclient")
+
+    async def install(self, context: Any) -> None:
+        """Route every request made by pages in this context through handle()."""
+        await context.route("**/*", self.handle)
+
@@ -0,0 +1,526 @@
+"""Summarizer backends for cleanup_summarize.
+
+Three interchangeable backends summarize a cleaned article:
+
+  openai    ChatOpenAI (SUMMARY_MODEL); best summaries, costs money.
+  ollama    ChatOllama against a local Ollama server (OLLAMA_MODEL); free,
+            slower per token.
+  textrank  Extractive TextRank in-process with NumPy; free, instant,
+            works offline, but only selects sentences from the article.
+
+The chat backends share one implementation (ChatSummarizer): long articles
+are split at paragraph boundaries and summarized map-reduce, and every call
+retries rate limits and transient errors with jittered exponential backoff.
+
+select_summarizer picks a backend per post. Only the backends that are
+available are considered: the packages must be installed, OpenAI needs a key,
+Ollama needs a running server, and TextRank needs NumPy. Of those that fit
+the latency budget, a high-priority post gets the best quality and any
+other post gets the cheapest. Bulk cleanup therefore runs offline at no API
+cost, and OpenAI is kept for the posts that matter. SUMMARY_BACKEND
+overrides the choice.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import urllib.request
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from agent import llm_budget
+
+try:
+    from langchain_core.messages import HumanMessage, SystemMessage
+    from langchain_openai import ChatOpenAI
+    HAS_LANGCHAIN = True
+except ImportError:
+    HAS_LANGCHAIN = False
+
+try:
+    from langchain_ollama import ChatOllama
+    HAS_OLLAMA = True
+except ImportError:
+    HAS_OLLAMA = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+# Max characters sent to LLM in one summarization call (allow longer articles)
+MAX_INPUT_CHARS = 12000
+# Rough token estimate for English prose; only used to size chunks.
+CHARS_PER_TOKEN = 4
+# Articles over this many tokens are summarized map-reduce instead of in one call.
+SINGLE_SHOT_TOKENS = MAX_INPUT_CHARS // CHARS_PER_TOKEN
+# Token budget per map chunk; smaller chunks finish sooner and run in parallel.
+CHUNK_TOKENS = 1500
+# Map calls in flight at once on the sync path
+MAP_CONCURRENCY = 8
+
+SUMMARY_MODEL = "gpt-4o-mini"
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.1:8b")
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+# Retries per call for rate limits (429), timeouts and 5xx; backoff doubles up to the cap
+MAX_RETRIES = 5
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# TextRank: PageRank damping, convergence, and how much of the article to keep.
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_TOLERANCE = 1e-6
+TEXTRANK_MAX_ITERATIONS = 100
+TEXTRANK_RATIO = 0.2
+TEXTRANK_MIN_SENTENCES = 3
+TEXTRANK_MAX_SENTENCES = 10
+# Sentences considered; similarity is quadratic in this.
+TEXTRANK_MAX_INPUT_SENTENCES = 400
+TEXTRANK_SENTENCES_PER_PARAGRAPH = 3
+
+SUMMARY_SYSTEM_PROMPT = """You are an editor writing a comprehensive summary for a news article.
+
+Your task: read the article and produce a detailed summary that will replace the raw article body on a news site. The summary must:
+
+1. Be written in clear, neutral, third-person prose suitable for a legal/community news site.
+2. Cover the main point in the first 1–2 sentences (who, what, when, where).
+3. Include key facts, figures, quotes (if notable), and context.
+4. Explain why it matters or what happens next when relevant.
+5. Be substantive: aim for roughly 2–5 short paragraphs (or equivalent length). Do not reduce the article to a single short sentence unless the source is genuinely a one-line item.
+6. Preserve any important names, dates, locations, and outcomes. Do not invent details not present in the source.
+7. Output only the summary text, no headings or labels."""
+
+CHUNK_SYSTEM_PROMPT = """You are an editor taking notes on one part of a long news article (often a court ruling, hearing or piece of legislation).
+
+Write dense notes on this part only: every party, name, date, location, figure, vote, ruling, deadline and notable quote it contains, in the order they appear. Do not add an introduction or conclusion and do not invent details. Output only the notes."""
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+_WORD_RE = re.compile(r"[a-z0-9']+")
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by for from had has have he her his in is it its of on or "
+    "said she that the their they this to was were which who will with would".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Return a rough token count for text, used only to size chunks."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_into_chunks(text: str, max_tokens: Optional[int] = None) -> List[str]:
+    """Split text at paragraph boundaries into chunks of at most max_tokens (default CHUNK_TOKENS).
+
+    Paragraphs are packed greedily; a paragraph too long on its own is split
+    at sentence ends, and a sentence too long on its own at the budget.
+    """
+    limit = (max_tokens or CHUNK_TOKENS) * CHARS_PER_TOKEN
+    pieces: List[str] = []
+    for para in re.split(r"\n\s*\n", text):
+        para = para.strip()
+        if not para:
+            continue
+        if len(para) <= limit:
+            pieces.append(para)
+            continue
+        for sentence in _SENTENCE_RE.split(para):
+            pieces.extend(sentence[i : i + limit] for i in range(0, len(sentence), limit))
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 2 + len(piece) > limit:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def summary_prompt(title: str, body: str) -> Tuple[str, str]:
+    """(system, user) prompt for a single-shot or reduce call."""
+    return SUMMARY_SYSTEM_PROMPT, f"Title: {title}\n\n{body}"[:MAX_INPUT_CHARS]
+
+
+def chunk_prompt(title: str, chunk: str, part: int, parts: int) -> Tuple[str, str]:
+    """(system, user) prompt for the map call on one part of a long article."""
+    return CHUNK_SYSTEM_PROMPT, f"Title: {title}\nPart {part} of {parts}\n\n{chunk}"
+
+
+def map_prompts(title: str, body: str) -> Optional[List[Tuple[str, str]]]:
+    """Prompts for the map step, or None if body fits in a single call."""
+    if estimate_tokens(body) <= SINGLE_SHOT_TOKENS:
+        return None
+    chunks = split_into_chunks(body)
+    return [chunk_prompt(title, chunk, i, len(chunks)) for i, chunk in enumerate(chunks, 1)]
+
+
+def notes_text(notes: List[str]) -> str:
+    """Return the reduce call's body: the map notes, labelled by part."""
+    return "The article is long; these are notes on each part, in order.\n\n" + "\n\n".join(
+        f"Part {i}:\n{note}" for i, note in enumerate(notes, 1)
+    )
+
+
+def _messages(prompt: Tuple[str, str]) -> List[Any]:
+    system, user = prompt
+    return [SystemMessage(content=system), HumanMessage(content=user)]
+
+
+def _summary_messages(title: str, body: str) -> List[Any]:
+    return _messages(summary_prompt(title, body))
+
+
+def _map_plan(title: str, body: str) -> Optional[List[List[Any]]]:
+    """Messages for the map step, or None if body fits in a single call."""
+    prompts = map_prompts(title, body)
+    return [_messages(prompt) for prompt in prompts] if prompts is not None else None
+
+
+def _content(response: Any) -> Optional[str]:
+    return (response.content or "").strip() or None
+
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying after exc, or None if it is not worth retrying.
+
+    Rate limits (429), timeouts, connection errors and 5xx are retried; the
+    server's Retry-After wins when present, otherwise the wait is a full-jitter
+    exponential backoff so concurrent requests do not retry in lockstep.
+    """
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    name = type(exc).__name__
+    transient = status == 429 or (status is not None and status >= 500) or any(
+        kind in name for kind in ("RateLimit", "Timeout", "Connection", "InternalServer")
+    )
+    if not transient:
+        return None
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+    if retry_after:
+        try:
+            return min(MAX_BACKOFF_SECONDS, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** attempt))
+
+
+async def _ainvoke(llm: Any, messages: List[Any], node: str) -> Optional[str]:
+    """One chat call, retrying rate limits and transient errors; None if it never succeeds."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return _content(await llm_budget.ainvoke(llm, messages, node))
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == MAX_RETRIES:
+                return None
+            await asyncio.sleep(delay)
+    return None
+
+
+class Summarizer(ABC):
+    """Interface every backend implements.
+
+    ``quality`` ranks summaries (higher is better), ``cost`` is relative API
+    cost per 1k tokens (0 for local backends), and ``overhead_seconds`` plus
+    ``seconds_per_1k_tokens`` give the latency estimate the selector uses.
+    """
+
+    name = "base"
+    model = ""
+    quality = 0
+    cost = 0.0
+    overhead_seconds = 0.0
+    seconds_per_1k_tokens = 0.0
+
+    def identity(self) -> Tuple[str, ...]:
+        """Everything that changes this backend's output (model, prompts, parameters)."""
+        return (self.name,)
+
+    def available(self) -> bool:
+        """Return True if this backend can run here (packages, keys, servers)."""
+        return True
+
+    def expected_seconds(self, text: str) -> float:
+        """Estimate the seconds this backend takes to summarize text."""
+        return self.overhead_seconds + estimate_tokens(text) / 1000 * self.seconds_per_1k_tokens
+
+    def prompt_tokens(self, title: str, body: str) -> int:
+        """Estimated LLM prompt tokens to summarize body (0 for backends that call no LLM)."""
+        return 0
+
+    @abstractmethod
+    def summarize(self, title: str, body: str) -> Optional[str]:
+        """Return a summary of body, or None if this backend could not produce one."""
+
+    async def asummarize(self, title: str, body: str) -> Optional[str]:
+        """Summarize without blocking the event loop (summarize in a worker thread)."""
+        return await asyncio.to_thread(self.summarize, title, body)
+
+
+class ChatSummarizer(Summarizer):
+    """A LangChain chat model, single-shot for short articles and map-reduce for long ones."""
+
+    def __init__(self, name: str, model: str, llm: Any = None):
+        """Wrap llm (or the backend's shared client when None) as backend ``name``."""
+        self.name = name
+        self.model = model
+        self._llm = llm
+
+    def identity(self) -> Tuple[str, ...]:
+        """Return the model and prompts, which decide this backend's output."""
+        return (self.model, SUMMARY_SYSTEM_PROMPT, CHUNK_SYSTEM_PROMPT)
+
+    def client(self) -> Any:
+        """Return the chat model to call, or None if it is unavailable."""
+        return self._llm
+
+    def available(self) -> bool:
+        """Return True if a chat model is reachable."""
+        return self.client() is not None
+
+    def expected_seconds(self, text: str) -> float:
+        """Estimate latency, counting parallel map calls as one round."""
+        # Map calls run in parallel, so beyond one chunk the cost is a second (reduce) round.
+        tokens = estimate_tokens(text)
+        if tokens <= SINGLE_SHOT_TOKENS:
+            return self.overhead_seconds + tokens / 1000 * self.seconds_per_1k_tokens
+        return 2 * self.overhead_seconds + 2 * CHUNK_TOKENS / 1000 * self.seconds_per_1k_tokens
+
+    def prompt_tokens(self, title: str, body: str) -> int:
+        """Estimate prompt tokens over the single-shot call or every map call plus the reduce."""
+        prompts = map_prompts(title, body)
+        if prompts is None:
+            return llm_budget.estimate_tokens(summary_prompt(title, body), self.model)
+        # The reduce call's notes are about one completion per part.
+        notes = len(prompts) * llm_budget.EXPECTED_COMPLETION_TOKENS
+        return sum(llm_budget.estimate_tokens(p, self.model) for p in prompts) + notes
+
+    def summarize(self, title: str, body: str) -> Optional[str]:
+        """Summarize synchronously; None if the model is unavailable or a call fails."""
+        if not body or not body.strip():
+            return None
+        try:
+            llm = self.client()
+            if llm is None:
+                return None
+            while (plan := _map_plan(title, body)) is not None:
+                responses = llm_budget.batch(llm, plan, f"{self.name}.map", config={"max_concurrency": MAP_CONCURRENCY})
+                notes = [note for r in responses if (note := _content(r))]
+                if len(notes) < len(plan):
+                    return None
+                if len(notes_text(notes)) >= len(body):
+                    break
+                body = notes_text(notes)
+            # Admitted per post by the caller, so the call itself is never deferred.
+            response = llm_budget.invoke(llm, _summary_messages(title, body), f"{self.name}.summarize", True)
+            return _content(response)
+        except Exception:
+            return None
+
+    async def asummarize(self, title: str, body: str) -> Optional[str]:
+        """Summarize with retries; long articles run their map calls concurrently."""
+        if not body or not body.strip():
+            return None
+        llm = self.client()
+        if llm is None:
+            return None
+        while (plan := _map_plan(title, body)) is not None:
+            answers = await asyncio.gather(*(_ainvoke(llm, messages, f"{self.name}.map") for messages in plan))
+            notes = [note for note in answers if note]
+            if len(notes) < len(answers):
+                return None
+            if len(notes_text(notes)) >= len(body):
+                # Notes that do not shrink the text would never converge; reduce what fits.
+                break
+            body = notes_text(notes)
+        return await _ainvoke(llm, _summary_messages(title, body), f"{self.name}.summarize")
+
+
+@lru_cache(maxsize=1)
+def summary_llm() -> Any:
+    """Return the shared ChatOpenAI client, or None without LangChain or OPENAI_API_KEY.
+
+    The client's own retries are off; ChatSummarizer retries with jitter.
+    """
+    if not HAS_LANGCHAIN or not os.environ.get("OPENAI_API_KEY"):
+        return None
+    return ChatOpenAI(model=SUMMARY_MODEL, temperature=0, max_retries=0)
+
+
+@lru_cache(maxsize=1)
+def ollama_llm() -> Any:
+    """Return a ChatOllama client if the server at OLLAMA_HOST is up and has OLLAMA_MODEL pulled."""
+    if not HAS_OLLAMA or not HAS_LANGCHAIN:
+        return None
+    try:
+        with urllib.request.urlopen(f"{OLLAMA_HOST}/api/tags", timeout=1) as response:
+            models = {m.get("name") for m in json.load(response).get("models", [])}
+    except (OSError, ValueError):
+        return None
+    if OLLAMA_MODEL not in models and f"{OLLAMA_MODEL}:latest" not in models:
+        return None
+    return ChatOllama(model=OLLAMA_MODEL, base_url=OLLAMA_HOST, temperature=0)
+
+
+class OpenAISummarizer(ChatSummarizer):
+    """ChatOpenAI on SUMMARY_MODEL: the best summaries, at API cost."""
+
+    quality = 3
+    cost = 1.0
+    overhead_seconds = 1.0
+    seconds_per_1k_tokens = 1.5
+
+    def __init__(self, llm: Any = None):
+        """Use llm, or the shared summary_llm client when None."""
+        super().__init__("openai", SUMMARY_MODEL, llm)
+
+    def client(self) -> Any:
+        """Return the given client or the shared summary_llm."""
+        return self._llm or summary_llm()
+
+
+class OllamaSummarizer(ChatSummarizer):
+    """ChatOllama on OLLAMA_MODEL: free and local, but slower per token."""
+
+    quality = 2
+    overhead_seconds = 2.0
+    seconds_per_1k_tokens = 8.0
+
+    def __init__(self, llm: Any = None):
+        """Use llm, or the local ollama_llm client when None."""
+        super().__init__("ollama", OLLAMA_MODEL, llm)
+
+    def identity(self) -> Tuple[str, ...]:
+        """Return the chat identity, tagged so Ollama and OpenAI models never collide."""
+        return ("ollama",) + super().identity()
+
+    def client(self) -> Any:
+        """Return the given client or the local ollama_llm."""
+        return self._llm or ollama_llm()
+
+
+class TextRankSummarizer(Summarizer):
+    """Extractive summary: the top TextRank sentences, in article order.
+
+    Sentences are term-frequency vectors (stopwords dropped); edge weights are
+    their cosine similarity, and scores come from PageRank power iteration.
+    """
+
+    name = "textrank"
+    quality = 1
+    overhead_seconds = 0.0
+    seconds_per_1k_tokens = 0.01
+
+    def identity(self) -> Tuple[str, ...]:
+        """Return the TextRank parameters, which decide which sentences are kept."""
+        return (
+            self.name,
+            str(TEXTRANK_DAMPING),
+            str(TEXTRANK_RATIO),
+            str(TEXTRANK_MIN_SENTENCES),
+            str(TEXTRANK_MAX_SENTENCES),
+        )
+
+    def available(self) -> bool:
+        """Return True if NumPy is installed."""
+        return HAS_NUMPY
+
+    @staticmethod
+    def sentences(body: str) -> List[str]:
+        """Split body into candidate sentences of at least four words."""
+        out = []
+        for para in re.split(r"\n\s*\n", body):
+            for sentence in _SENTENCE_RE.split(" ".join(para.split())):
+                if len(sentence.split()) >= 4:
+                    out.append(sentence.strip())
+        return out[:TEXTRANK_MAX_INPUT_SENTENCES]
+
+    @staticmethod
+    def rank(sentences: Sequence[str]) -> np.ndarray:
+        """Return the TextRank score of each sentence."""
+        vocab: Dict[str, int] = {}
+        rows = []
+        for sentence in sentences:
+            words = [w for w in _WORD_RE.findall(sentence.lower()) if w not in _STOPWORDS]
+            rows.append([vocab.setdefault(w, len(vocab)) for w in words])
+        n = len(sentences)
+        tf = np.zeros((n, max(1, len(vocab))))
+        for i, ids in enumerate(rows):
+            np.add.at(tf[i], ids, 1.0)
+        norms = np.linalg.norm(tf, axis=1, keepdims=True)
+        unit = np.divide(tf, norms, out=np.zeros_like(tf), where=norms > 0)
+        sim = unit @ unit.T
+        np.fill_diagonal(sim, 0.0)
+
+        out_weight = sim.sum(axis=1, keepdims=True)
+        # Sentences sharing no words with any other link to every sentence equally.
+        transition = np.divide(sim, out_weight, out=np.full_like(sim, 1.0 / n), where=out_weight > 0)
+        scores = np.full(n, 1.0 / n)
+        for _ in range(TEXTRANK_MAX_ITERATIONS):
+            updated: np.ndarray = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE:
+                return updated
+            scores = updated
+        return scores
+
+    def summarize(self, title: str, body: str) -> Optional[str]:
+        """Return the top-ranked sentences in article order, a few per paragraph."""
+        if not HAS_NUMPY or not body or not body.strip():
+            return None
+        sentences = self.sentences(body)
+        if not sentences:
+            return None
+        keep = min(
+            len(sentences),
+            max(TEXTRANK_MIN_SENTENCES, min(TEXTRANK_MAX_SENTENCES, math.ceil(len(sentences) * TEXTRANK_RATIO))),
+        )
+        top = sorted(np.argsort(-self.rank(sentences), kind="stable")[:keep])
+        picked = [sentences[i] for i in top]
+        step = TEXTRANK_SENTENCES_PER_PARAGRAPH
+        return "\n\n".join(" ".join(picked[i : i + step]) for i in range(0, len(picked), step))
+
+
+BACKENDS: Dict[str, Type[Summarizer]] = {
+    "openai": OpenAISummarizer,
+    "ollama": OllamaSummarizer,
+    "textrank": TextRankSummarizer,
+}
+
+
+def select_summarizer(
+    text: str,
+    high_priority: bool = False,
+    latency_budget: Optional[float] = None,
+    backends: Optional[Sequence[Summarizer]] = None,
+) -> Optional[Summarizer]:
+    """Pick the backend for one article, or None if nothing is available.
+
+    Args:
+        text: The cleaned article (its length drives the latency estimate).
+        high_priority: Prefer the best summary over the cheapest.
+        latency_budget: Seconds one summary may take; backends expected to be
+            slower are skipped unless none fits, in which case the fastest is used.
+        backends: Candidates (default: every backend, or SUMMARY_BACKEND alone if set).
+    """
+    if backends is None:
+        forced = os.environ.get("SUMMARY_BACKEND", "auto")
+        backends = [BACKENDS[forced]()] if forced in BACKENDS else [cls() for cls in BACKENDS.values()]
+    candidates = [b for b in backends if b.available()]
+    if not candidates:
+        return None
+    if latency_budget is not None:
+        fits = [b for b in candidates if b.expected_seconds(text) <= latency_budget]
+        candidates = fits or [min(candidates, key=lambda b: b.expected_seconds(text))]
+    if high_priority:
+        return max(candidates, key=lambda b: (b.quality, -b.cost))
+    return min(candidates, key=lambda b: (b.cost, -b.quality))
@@ -0,0 +1,206 @@
+"""Batch-request files for offline post summarization.
+
+Backfilling hundreds of posts through live chat calls costs full price and
+runs into rate limits. The OpenAI Batch API takes a JSONL file of requests,
+runs them asynchronously (within 24 hours) at a discount, and returns a JSONL
+file of results. cleanup_summarize uses this module in two phases:
+
+  export   cleanup_summarize --export-batch FILE writes one chat request per
+           post that needs a summary.
+  ingest   cleanup_summarize --ingest-batch FILE reads the results and
+           rewrites those posts with their summaries and excerpts.
+
+Custom ids come from the summary cache key (OpenAI model, prompts, title and
+cleaned text), so they stay stable across exports and a results file can be
+ingested against posts that were re-crawled in between. A long article needs
+two rounds: the first batch holds its map requests (one per chunk), ingest
+caches the notes, and the next export sends the reduce request.
+
+The ``local`` command here stands in for the Batch API: it answers a
+requests file with a results file in the same format, using the extractive
+TextRank summarizer, so the round trip can be tested without an API key.
+Its results name STAND_IN_MODEL as their model, and ingest applies them as
+TextRank summaries rather than OpenAI ones. Upload and submission are done with the OpenAI CLI or dashboard.
+
+Usage (from the project root):
+    PYTHONPATH=src python3 src/agent/cleanup_summarize.py --export-batch output/summary_batch/requests.jsonl
+    PYTHONPATH=src python3 src/agent/summary_batch.py local output/summary_batch/requests.jsonl output/summary_batch/results.jsonl
+    PYTHONPATH=src python3 src/agent/cleanup_summarize.py --ingest-batch output/summary_batch/results.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from agent.summarizers import SUMMARY_MODEL, TextRankSummarizer
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+BATCH_DIR = _PROJECT_ROOT / "output" / "summary_batch"
+BATCH_ENDPOINT = "/v1/chat/completions"
+# Requests per file accepted by the Batch API.
+MAX_BATCH_REQUESTS = 50000
+# Model named in the stand-in's results.
+STAND_IN_MODEL = "local-textrank"
+# Leading sentences the stand-in returns when TextRank (numpy) is unavailable.
+STAND_IN_SENTENCES = 5
+
+_TITLE_RE = re.compile(r"^Title: (.*)$", re.MULTILINE)
+
+
+def summary_id(key: str) -> str:
+    """Return the custom id of the single-shot or reduce request for a summary cache key."""
+    return f"sum-{key[:40]}"
+
+
+def map_id(key: str, part: int, parts: int) -> str:
+    """Return the custom id of the map request for one part of a long article."""
+    return f"sum-{key[:40]}-map-{part}-of-{parts}"
+
+
+def notes_key(key: str) -> str:
+    """Summary-cache key under which a long article's map notes are kept between rounds."""
+    return f"notes:{key}"
+
+
+def batch_request(custom_id: str, prompt: Tuple[str, str]) -> Dict[str, Any]:
+    """One Batch API request line for a (system, user) prompt."""
+    system, user = prompt
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": SUMMARY_MODEL,
+            "temperature": 0,
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+        },
+    }
+
+
+def batch_result(
+    custom_id: str, content: Optional[str], error: Optional[str] = None, model: str = SUMMARY_MODEL
+) -> Dict[str, Any]:
+    """Build one results line in the Batch API's format."""
+    if content is None:
+        return {
+            "id": f"batch_req_{custom_id}",
+            "custom_id": custom_id,
+            "response": None,
+            "error": {"code": "stand_in_error", "message": error or "no summary"},
+        }
+    return {
+        "id": f"batch_req_{custom_id}",
+        "custom_id": custom_id,
+        "response": {
+            "status_code": 200,
+            "request_id": custom_id,
+            "body": {
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            },
+        },
+        "error": None,
+    }
+
+
+def write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> int:
+    """Write rows as JSON lines (temp file + rename); return how many were written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    count = 0
+    with tmp.open("w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp, path)
+    return count
+
+
+def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON object on each non-blank line of path."""
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def is_summary_model(model: str) -> bool:
+    """Check whether a result came from SUMMARY_MODEL (the API names dated snapshots, e.g. gpt-4o-mini-2024-07-18)."""
+    return model == SUMMARY_MODEL or model.startswith(SUMMARY_MODEL + "-")
+
+
+def read_results(path: Path) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, str]]:
+    """Parse a results file into ({custom_id: (content, model)}, {custom_id: error message})."""
+    results: Dict[str, Tuple[str, str]] = {}
+    errors: Dict[str, str] = {}
+    for row in read_jsonl(path):
+        custom_id = row.get("custom_id")
+        if not custom_id:
+            continue
+        response = row.get("response") or {}
+        if row.get("error") or response.get("status_code") != 200:
+            error = row.get("error") or {}
+            errors[custom_id] = error.get("message") or f"status {response.get('status_code')}"
+            continue
+        body = response.get("body") or {}
+        try:
+            content = (body["choices"][0]["message"]["content"] or "").strip()
+        except (KeyError, IndexError, TypeError):
+            content = ""
+        if content:
+            results[custom_id] = (content, str(body.get("model") or ""))
+        else:
+            errors[custom_id] = "empty response"
+    return results, errors
+
+
+def _stand_in_answer(messages: List[Dict[str, str]]) -> Optional[str]:
+    """Return an extractive answer to a summary or map request (the stand-in has no model)."""
+    user = next((m["content"] for m in messages if m.get("role") == "user"), "")
+    title_match = _TITLE_RE.search(user)
+    _, _, text = user.partition("\n\n")
+    title = title_match.group(1) if title_match else ""
+    summarizer = TextRankSummarizer()
+    if summarizer.available():
+        return summarizer.summarize(title, text)
+    sentences = summarizer.sentences(text)
+    return " ".join(sentences[:STAND_IN_SENTENCES]) or None
+
+
+def run_local_batch(requests_path: Path, results_path: Path) -> Dict[str, int]:
+    """Answer every request in requests_path locally and write results_path in Batch API format."""
+    counts = {"requests": 0, "answered": 0, "failed": 0}
+
+    def _rows() -> Iterator[Dict[str, Any]]:
+        for request in read_jsonl(requests_path):
+            counts["requests"] += 1
+            content = _stand_in_answer(request.get("body", {}).get("messages", []))
+            counts["answered" if content else "failed"] += 1
+            yield batch_result(request["custom_id"], content, model=STAND_IN_MODEL)
+
+    write_jsonl(results_path, _rows())
+    return counts
+
+
+def main() -> None:
+    """Answer a batch requests file locally, from the command line."""
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI Batch API.")
+    parser.add_argument("command", choices=["local"])
+    parser.add_argument("requests", type=Path, help="Batch requests JSONL (from cleanup_summarize --export-batch)")
+    parser.add_argument("results", type=Path, help="Results JSONL to write")
+    args = parser.parse_args()
+    counts = run_local_batch(args.requests, args.results)
+    print(f"Answered {counts['answered']} of {counts['requests']} requests -> {args.results}")
+    if counts["failed"]:
+        print(f"  {counts['failed']} requests had nothing to summarize")
+
+
+if __name__ == "__main__":
+    main()
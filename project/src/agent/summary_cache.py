@@ -0,0 +1,93 @@
+"""Content-addressed cache of LLM post summaries.
+
+Summaries are stored in SQLite (output/summary_cache/summaries.sqlite3) under
+a SHA-256 key of (model, system prompts, title, cleaned article text), so a
+post whose source, prompt and model are unchanged is never sent to the LLM
+twice. The cleaned source text is kept too, keyed by its own hash: once a
+post's body has been replaced by its summary, that is the only copy left to
+re-summarize from when the prompt or model changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+SUMMARY_CACHE_PATH = _PROJECT_ROOT / "output" / "summary_cache" / "summaries.sqlite3"
+# Seconds to wait for another process holding the database lock.
+SQLITE_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    source_hash TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source_hash TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+def content_hash(*parts: str) -> str:
+    """SHA-256 hex digest of parts joined with NUL separators."""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """SQLite-backed summaries keyed by content hash, plus the sources they came from."""
+
+    def __init__(self, path: Path = SUMMARY_CACHE_PATH):
+        """Open (or create) the cache database at path."""
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), timeout=SQLITE_TIMEOUT)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None, counting the hit or miss."""
+        row = self._db.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        self.stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def put(self, key: str, source_hash: str, summary: str) -> None:
+        """Store summary under key, linked to the source it was made from."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)", (key, source_hash, summary, time.time())
+        )
+        self._db.commit()
+
+    def source(self, source_hash: str) -> Optional[Tuple[str, str]]:
+        """Return (title, cleaned text) of a summarized post, or None if it was never seen."""
+        row = self._db.execute(
+            "SELECT title, text FROM sources WHERE source_hash = ?", (source_hash,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put_source(self, source_hash: str, title: str, text: str) -> None:
+        """Keep a post's cleaned source so it can be summarized again later."""
+        self._db.execute(
+            "INSERT OR IGNORE INTO sources VALUES (?, ?, ?, ?)", (source_hash, title, text, time.time())
+        )
+        self._db.commit()
+
+    def summary(self) -> str:
+        """Return this run's hit and miss counts."""
+        return f"{self.stats['hits']} cached, {self.stats['misses']} sent to the LLM"
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self._db.commit()
+        self._db.close()
@@ -1,6 +1,93 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
 import pytest
 
+TOPICS = [
+    "bail reform", "jury selection", "county budget", "school board",
+    "water rights", "road repairs", "city council", "fire department",
+]
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeLLM:
+    """Async chat client that takes ``delay`` per call and fails the first ``failures`` calls.
+
+    ``peak`` records the most calls that were in flight at once.
+    """
+
+    def __init__(self, delay=0.05, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise RateLimitError("slow down")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        title = messages[-1].content.splitlines()[0]
+        return SimpleNamespace(content=f"Summary of {title}. It matters.")
+
+
+def _write_post(posts_dir, name, title, body, url=None):
+    """Write one post; with url, a Source Information section follows the body."""
+    path = posts_dir / name
+    source = f"## Source Information\n\n- **Original URL**: {url}\n" if url else ""
+    path.write_text(f'---\ntitle: "{title}"\ndate: 2026-02-11\n---\n\n{body}\n{source}')
+    return path
+
+
+def _write_posts(posts_dir, n, sentences=8):
+    """Write n crawled-looking posts, 2026-02-1<i>-story-<i>.md, each on its own topic."""
+    for i in range(n):
+        topic = TOPICS[i % len(TOPICS)]
+        body = " ".join(
+            f"The {topic} story {i} continued in sentence {j} with officials commenting on {topic} {j}."
+            for j in range(sentences)
+        )
+        (posts_dir / f"2026-02-1{i}-story-{i}.md").write_text(
+            f"---\ntitle: Story {i}\n---\n\nSkip to content\n{body}\n\n## Source Information\n\n- Source: KWTX\n"
+        )
+
 
 @pytest.fixture(scope="session")
 def anyio_backend():
     return "asyncio"
+
+
+@pytest.fixture
+def fake_llm():
+    return FakeLLM
+
+
+@pytest.fixture
+def rate_limit_error():
+    return RateLimitError
+
+
+@pytest.fixture
+def posts_dir(tmp_path: Path) -> Path:
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    return posts
+
+
+@pytest.fixture
+def write_post():
+    return _write_post
+
+
+@pytest.fixture
+def write_posts():
+    return _write_posts
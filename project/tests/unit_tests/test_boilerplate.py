@@ -0,0 +1,71 @@
+"""Unit tests for learned per-source boilerplate."""
+
+from __future__ import annotations
+
+from agent.boilerplate import BoilerplateIndex, line_key, load_updated_index
+
+
+def _post(posts, n, source="KWTX", extra="", summarized=False):
+    marker = "summary_source_hash: abc\n" if summarized else ""
+    (posts / f"2026-02-{n:02d}-story-{n}.md").write_text(
+        f'---\ntitle: "Story {n}"\nsource_name: "{source}"\n{marker}---\n\n'
+        f"Download the KWTX app\nStory {n} happened on Tuesday in Waco.\n{extra}\n"
+        f"Copyright 2026 KWTX. All rights reserved.\n\n"
+        f"## Source Information\n\n- **Source**: {source}\n"
+    )
+
+
+def test_lines_repeated_across_a_source_become_boilerplate(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    for n in range(1, 7):
+        _post(posts, n)
+    index = BoilerplateIndex()
+
+    assert index.update(posts) == 6
+    learned = index.boilerplate("KWTX")
+
+    assert line_key("Download the KWTX app") in learned
+    assert line_key("  copyright 2026 KWTX.  All rights reserved. ") in learned
+    assert line_key("Story 3 happened on Tuesday in Waco.") not in learned
+    # The Source Information block is never counted.
+    assert line_key("- **Source**: KWTX") not in learned
+    assert index.boilerplate("KBTX") == frozenset()
+
+
+def test_too_few_posts_learn_nothing(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    for n in range(1, 4):
+        _post(posts, n)
+
+    assert BoilerplateIndex().update(posts) == 3
+    assert load_updated_index(posts, tmp_path / "bp.json").boilerplate("KWTX") == frozenset()
+
+
+def test_posts_are_counted_once_and_summaries_skipped(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    _post(posts, 1)
+    _post(posts, 2, summarized=True)
+    path = tmp_path / "bp.json"
+
+    index = load_updated_index(posts, path)
+    again = load_updated_index(posts, path)
+
+    assert index.totals == {"KWTX": 1}
+    assert again.totals == {"KWTX": 1}
+    assert again.update(posts) == 0
+
+
+def test_new_boilerplate_is_learned_after_many_posts(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    for n in range(1, 41):
+        _post(posts, n)
+    for n in range(41, 47):
+        _post(posts, n, extra="Watch KWTX News 10 live on the new streaming app")
+    index = BoilerplateIndex()
+    index.update(posts)
+
+    assert index.is_boilerplate("KWTX", "Watch KWTX News 10 live on the new streaming app")
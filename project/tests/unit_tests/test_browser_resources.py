@@ -0,0 +1,159 @@
+"""Unit tests for browser page/context recycling and warmed contexts."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import agent.browser_resources as browser_resources
+from agent.browser_resources import BrowserResources
+from agent.crawl_scheduler import PagePool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def evaluate(self, script):
+        return 1_000_000
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        self.storage_state_in = storage_state
+        self.pages = []
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        await asyncio.sleep(0)
+        return page
+
+    async def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump({"cookies": [{"name": "consent", "value": "yes"}]}, f)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, storage_state=None):
+        context = FakeContext(storage_state)
+        self.contexts.append(context)
+        return context
+
+
+def test_page_pool_replaces_pages_after_max_uses():
+    context = FakeContext()
+
+    async def run():
+        pool = PagePool(context, size=1, max_uses=2)
+        for _ in range(5):
+            async with pool.page():
+                pass
+        return pool
+
+    pool = asyncio.run(run())
+
+    assert len(context.pages) == 3
+    assert pool.recycled == 2
+    assert [p.closed for p in context.pages] == [True, True, False]
+
+
+def test_context_recycled_after_navigation_limit(tmp_path):
+    browser = FakeBrowser()
+    resources = BrowserResources(max_page_navigations=None, max_context_navigations=4, state_dir=tmp_path)
+
+    async def run():
+        session = await resources.open(browser, "KWTX", pages=2)
+
+        async def borrow():
+            async with session.page():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(borrow() for _ in range(10)))
+        await session.close()
+
+    asyncio.run(run())
+
+    assert len(browser.contexts) == 3
+    assert resources.contexts_recycled == 2
+    assert all(context.closed for context in browser.contexts)
+    assert resources.navigations == 10
+    assert [n for _, n, _ in resources.context_reports] == [4, 4, 2]
+
+
+def test_storage_state_warms_next_context(tmp_path):
+    browser = FakeBrowser()
+    resources = BrowserResources(state_dir=tmp_path)
+
+    async def run():
+        session = await resources.open(browser, "KWTX")
+        await session.close()
+        session = await resources.open(browser, "KWTX")
+        await session.close()
+
+    asyncio.run(run())
+
+    assert browser.contexts[0].storage_state_in is None
+    assert browser.contexts[1].storage_state_in == str(tmp_path / "KWTX.json")
+
+
+def test_rss_limit_recycles_open_sessions(tmp_path):
+    browser = FakeBrowser()
+    resources = BrowserResources(max_context_navigations=None, state_dir=None)
+
+    async def run():
+        session = await resources.open(browser, "KXAN")
+        async with session.page():
+            pass
+        resources.generation += 1
+        async with session.page():
+            pass
+        await session.close()
+
+    asyncio.run(run())
+
+    assert len(browser.contexts) == 2
+    assert resources.contexts_recycled == 1
+
+
+def test_rss_over_limit_is_counted_in_summary(monkeypatch):
+    monkeypatch.setattr(browser_resources, "browser_rss_bytes", lambda: 2_000_000_000)
+    resources = BrowserResources(rss_limit=1_000_000_000, state_dir=None)
+
+    async def run():
+        for _ in range(browser_resources.RSS_CHECK_EVERY):
+            await resources.navigated()
+
+    asyncio.run(run())
+
+    assert resources.generation == 1
+    assert resources.rss_limit_hits == 1
+    assert "peak RSS 2000 MB (over limit 1x)" in resources.summary()
+
+
+def test_unmanaged_never_recycles_or_saves(tmp_path):
+    browser = FakeBrowser()
+    resources = BrowserResources.unmanaged()
+
+    async def run():
+        session = await resources.open(browser, "KVUE", pages=1)
+        for _ in range(300):
+            async with session.page():
+                pass
+        await session.close()
+
+    asyncio.run(run())
+
+    assert len(browser.contexts) == 1
+    assert len(browser.contexts[0].pages) == 1
+    assert "300 navigations" in resources.summary()
@@ -0,0 +1,239 @@
+"""Unit tests for cleanup_summarize: batch runs, idempotency and junk filtering."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+import agent.cleanup_summarize as cleanup
+import agent.summarizers as summarizers
+from agent.llm_budget import RunBudget, start_run
+from agent.summarizers import OpenAISummarizer, TextRankSummarizer
+
+needs_langchain = pytest.mark.skipif(not summarizers.HAS_LANGCHAIN, reason="langchain-openai not installed")
+
+
+@needs_langchain
+def test_batch_runs_concurrently_and_rewrites_posts(tmp_path, fake_llm, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 8)
+    llm = fake_llm(delay=0.1)
+
+    started = time.monotonic()
+    results = asyncio.run(
+        cleanup.acleanup_and_summarize_all_posts(
+            posts, tmp_path / "_data", concurrency=4, summarizer=OpenAISummarizer(llm), cache=cleanup.SummaryCache(tmp_path / "s.sqlite3")
+        )
+    )
+    elapsed = time.monotonic() - started
+
+    assert all(r["summary_set"] for r in results)
+    assert llm.peak == 4
+    assert elapsed < 0.6
+    text = (posts / "2026-02-10-story-0.md").read_text()
+    assert "Summary of Title: Story 0." in text
+    assert "Skip to content" not in text
+    assert "## Source Information" in text
+
+
+@needs_langchain
+def test_rate_limits_are_retried(tmp_path, monkeypatch, fake_llm, write_posts):
+    monkeypatch.setattr(summarizers, "BASE_BACKOFF_SECONDS", 0.001)
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 1)
+    llm = fake_llm(delay=0, failures=2)
+
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    results = asyncio.run(cleanup.acleanup_and_summarize_all_posts(posts, tmp_path / "_data", summarizer=OpenAISummarizer(llm), cache=cache))
+
+    assert results[0]["summary_set"]
+    assert llm.calls == 3
+
+
+@needs_langchain
+def test_summarized_posts_are_not_summarized_again(tmp_path, fake_llm, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 2)
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    llm = fake_llm(delay=0)
+
+    asyncio.run(cleanup.acleanup_and_summarize_all_posts(posts, tmp_path / "_data", summarizer=OpenAISummarizer(llm), cache=cache))
+    first = (posts / "2026-02-10-story-0.md").read_text()
+    results = asyncio.run(cleanup.acleanup_and_summarize_all_posts(posts, tmp_path / "_data", summarizer=OpenAISummarizer(llm), cache=cache))
+
+    assert llm.calls == 2
+    assert all(r.get("skipped") for r in results)
+    assert (posts / "2026-02-10-story-0.md").read_text() == first
+    assert cleanup.summary_version() in first
+    assert "summary_backend: openai" in first
+
+
+@needs_langchain
+def test_recrawled_article_is_served_from_cache(tmp_path, fake_llm, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 1)
+    raw = (posts / "2026-02-10-story-0.md").read_text()
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    llm = fake_llm(delay=0)
+
+    cleanup_post = cleanup.acleanup_and_summarize_post
+    asyncio.run(cleanup_post(posts / "2026-02-10-story-0.md", cache, summarizer=OpenAISummarizer(llm)))
+    # The crawler writes the same article again as a raw post.
+    (posts / "2026-02-10-story-0.md").write_text(raw)
+    result = asyncio.run(cleanup_post(posts / "2026-02-10-story-0.md", cache, summarizer=OpenAISummarizer(llm)))
+
+    assert result["cached"] and result["summary_set"]
+    assert llm.calls == 1
+
+
+@needs_langchain
+def test_run_budget_defers_low_priority_posts(tmp_path, fake_llm, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 2)
+    before = (posts / "2026-02-11-story-1.md").read_text()
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    llm = fake_llm(delay=0)
+    run = start_run(RunBudget(max_tokens=1))
+    cleanup_post = cleanup.acleanup_and_summarize_post
+
+    try:
+        important = asyncio.run(cleanup_post(posts / "2026-02-10-story-0.md", cache, summarizer=OpenAISummarizer(llm), high_priority=True))
+        deferred = asyncio.run(cleanup_post(posts / "2026-02-11-story-1.md", cache, summarizer=OpenAISummarizer(llm)))
+    finally:
+        start_run(RunBudget())
+
+    assert important["summary_set"] and not important.get("deferred")
+    assert deferred["deferred"] and not deferred["cleaned"]
+    assert (posts / "2026-02-11-story-1.md").read_text() == before
+    assert llm.calls == 1
+    assert run.nodes["openai.summarize"]["calls"] == 1
+    assert run.nodes["openai.summarize"]["deferred"] == 1
+    assert run.reserved_tokens == 0
+
+
+@needs_langchain
+def test_concurrent_posts_share_the_run_budget(tmp_path, fake_llm, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 6)
+    llm = fake_llm(delay=0.05)
+    summarizer = OpenAISummarizer(llm)
+    post = posts / "2026-02-10-story-0.md"
+    title, text = "Story 0", cleanup.clean_body(cleanup.parse_front_matter_and_body(post.read_text())[1])[0]
+    # Room for about two posts; all six start at once.
+    per_post = summarizer.prompt_tokens(title, text) + cleanup.EXPECTED_COMPLETION_TOKENS
+    start_run(RunBudget(max_tokens=int(per_post * 2.5)))
+
+    try:
+        results = asyncio.run(
+            cleanup.acleanup_and_summarize_all_posts(
+                posts, tmp_path / "_data", concurrency=6, summarizer=summarizer, cache=cleanup.SummaryCache(tmp_path / "s.sqlite3")
+            )
+        )
+    finally:
+        start_run(RunBudget())
+
+    assert sum(1 for r in results if r["summary_set"]) == 2
+    assert sum(1 for r in results if r.get("deferred")) == 4
+
+
+@needs_langchain
+def test_prompt_change_resummarizes_from_cached_source(tmp_path, monkeypatch, fake_llm, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 1)
+    path = posts / "2026-02-10-story-0.md"
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    llm = fake_llm(delay=0)
+    asyncio.run(cleanup.acleanup_and_summarize_post(path, cache, summarizer=OpenAISummarizer(llm)))
+
+    monkeypatch.setattr(summarizers, "SUMMARY_SYSTEM_PROMPT", summarizers.SUMMARY_SYSTEM_PROMPT + "\nBe brief.")
+    seen = []
+    original = llm.ainvoke
+
+    async def spy(messages):
+        seen.append(messages[-1].content)
+        return await original(messages)
+
+    llm.ainvoke = spy
+    result = asyncio.run(cleanup.acleanup_and_summarize_post(path, cache, summarizer=OpenAISummarizer(llm)))
+
+    assert result["summary_set"] and not result["cached"]
+    # Summarized from the original article, not from the previous summary.
+    assert "sentence 7" in seen[0]
+
+
+def test_clean_body_drops_fixed_and_learned_junk():
+    body = (
+        "Skip to content\n72°\nWaco, TX »\nThe council voted 5-2 on Tuesday.\n"
+        "Download the KWTX app\nNews about the vote continues.\n\n"
+        "## Source Information\n\n- **Source**: KWTX\n"
+    )
+    learned = frozenset({cleanup.line_key("download the kwtx app")})
+
+    article, source = cleanup.clean_body(body, learned)
+
+    assert article == "The council voted 5-2 on Tuesday.\nNews about the vote continues."
+    assert source == "## Source Information\n\n- **Source**: KWTX"
+
+
+@needs_langchain
+@pytest.mark.skipif(not summarizers.HAS_NUMPY, reason="numpy not installed")
+def test_llm_summary_is_not_replaced_by_a_weaker_backend(tmp_path, fake_llm, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 1)
+    path = posts / "2026-02-10-story-0.md"
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    asyncio.run(cleanup.acleanup_and_summarize_post(path, cache, summarizer=OpenAISummarizer(fake_llm(delay=0))))
+
+    result = asyncio.run(cleanup.acleanup_and_summarize_post(path, cache, summarizer=TextRankSummarizer()))
+
+    assert result["skipped"]
+    assert "summary_backend: openai" in path.read_text()
+
+
+def test_high_priority_posts_come_from_important_articles(tmp_path):
+    (tmp_path / "important_articles.json").write_text(
+        '{"by_relevance": {"critical": [{"path": "/x/_posts/a.md"}], "high": [{"path": "/x/_posts/b.md"}],'
+        ' "medium": [{"path": "/x/_posts/c.md"}]}}'
+    )
+
+    assert cleanup.high_priority_posts(tmp_path) == {"a.md", "b.md"}
+    assert cleanup.high_priority_posts(tmp_path / "missing") == set()
+
+
+class NoSummary(summarizers.Summarizer):
+    name = "none"
+
+    def summarize(self, title, body):
+        return None
+
+
+def test_unchanged_posts_are_not_rewritten(tmp_path, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 2)
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    data = tmp_path / "_data"
+
+    first = cleanup.cleanup_and_summarize_all_posts(posts, data, cache=cache, summarizer=NoSummary())
+    manifest = json.loads((data / "changed_posts.json").read_text())
+    mtimes = {p.name: p.stat().st_mtime_ns for p in posts.iterdir()}
+    second = cleanup.cleanup_and_summarize_all_posts(posts, data, cache=cache, summarizer=NoSummary())
+
+    assert all(r["changed"] for r in first)
+    assert manifest["changed"] == sorted(r["path"] for r in first)
+    assert "Skip to content" not in (posts / "2026-02-10-story-0.md").read_text()
+    assert all(r["cleaned"] and not r["changed"] for r in second)
+    assert json.loads((data / "changed_posts.json").read_text())["changed"] == []
+    assert {p.name: p.stat().st_mtime_ns for p in posts.iterdir()} == mtimes
+
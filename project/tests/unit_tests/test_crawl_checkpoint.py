@@ -0,0 +1,58 @@
+"""Unit tests for the crawl checkpoint log and resumable post writing."""
+
+from __future__ import annotations
+
+from agent.crawl_checkpoint import CrawlCheckpoint
+from agent.date_aware_crawler import PostWriter
+
+
+def _article(n):
+    return {
+        "title": f"Story {n}: sheriff's office update",
+        "content": "County commissioners met on Tuesday. " * 20,
+        "url": f"https://www.kwtx.com/news/story-{n}/",
+        "source": "KWTX",
+        "date": "2026-02-11",
+    }
+
+
+def test_pending_lists_articles_not_yet_written(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.jsonl")
+    checkpoint.record_article(_article(1))
+    checkpoint.record_article(_article(2))
+    checkpoint.record_written(_article(1))
+    checkpoint.close()
+
+    pending = CrawlCheckpoint(tmp_path / "checkpoint.jsonl").pending()
+
+    assert [a["url"] for a in pending] == ["https://www.kwtx.com/news/story-2/"]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = CrawlCheckpoint(path)
+    checkpoint.record_article(_article(1))
+    checkpoint.close()
+    with path.open("a") as f:
+        f.write('{"type": "article", "article": {"url": "https://www.kw')
+
+    assert len(CrawlCheckpoint(path).pending()) == 1
+
+
+def test_interrupted_run_is_resumed_and_log_cleared(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    path = tmp_path / "checkpoint.jsonl"
+
+    # First run: article 1 written, article 2 extracted but the process died.
+    first = PostWriter(posts, index_path=None, checkpoint=CrawlCheckpoint(path))
+    first.write(_article(1))
+    first.checkpoint.record_article(_article(2))
+    first.checkpoint.close()
+
+    second = PostWriter(posts, index_path=None, checkpoint=CrawlCheckpoint(path))
+    assert second.resume() == 1
+    assert len(list(posts.glob("*.md"))) == 2
+
+    second.finish()
+    assert second.checkpoint.pending() == []
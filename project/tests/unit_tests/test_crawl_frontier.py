@@ -0,0 +1,79 @@
+"""Unit tests for the persistent crawl frontier."""
+
+from __future__ import annotations
+
+import pytest
+
+from agent.crawl_frontier import CrawlFrontier, normalize_url
+from agent.date_aware_crawler import PostWriter
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    frontier = CrawlFrontier(tmp_path / "frontier.sqlite3")
+    yield frontier
+    frontier.close()
+
+
+class TestNormalizeUrl:
+    """Tests for URL normalization."""
+
+    def test_equivalent_urls_normalize_together(self):
+        a = normalize_url("HTTPS://www.KWTX.com/news/story/?utm_source=fb&b=2&a=1#comments")
+        b = normalize_url("https://kwtx.com/news/story?a=1&b=2")
+        assert a == b == "https://kwtx.com/news/story?a=1&b=2"
+
+    def test_root_path_kept(self):
+        assert normalize_url("https://www.kxan.com") == "https://kxan.com/"
+
+
+class TestCrawlFrontier:
+    """Tests for skip decisions and persistence."""
+
+    def test_ingested_and_irrelevant_urls_are_skipped(self, frontier):
+        frontier.mark_ingested("https://www.kwtx.com/news/a/", "/posts/a.md")
+        frontier.mark_fetched("https://www.kwtx.com/news/b", "irrelevant", "weather text")
+        frontier.mark_fetched("https://www.kwtx.com/news/c", "failed")
+
+        new = frontier.filter_new(
+            ["https://kwtx.com/news/a", "https://www.kwtx.com/news/b", "https://www.kwtx.com/news/c", "https://www.kwtx.com/news/d"]
+        )
+
+        assert new == ["https://www.kwtx.com/news/c", "https://www.kwtx.com/news/d"]
+
+    def test_stops_after_streak_of_known_urls(self, frontier):
+        for i in range(3):
+            frontier.mark_ingested(f"https://kbtx.com/news/old-{i}")
+        urls = ["https://kbtx.com/news/new"] + [f"https://kbtx.com/news/old-{i}" for i in range(3)] + ["https://kbtx.com/news/older"]
+
+        assert frontier.filter_new(urls, stop_after_known=3) == ["https://kbtx.com/news/new"]
+
+    def test_ingested_status_survives_refetch(self, frontier):
+        frontier.mark_ingested("https://kvue.com/news/x")
+        frontier.mark_fetched("https://kvue.com/news/x", "relevant", "body")
+        assert frontier.status("https://kvue.com/news/x") == "ingested"
+
+    def test_persists_across_runs(self, tmp_path):
+        path = tmp_path / "frontier.sqlite3"
+        first = CrawlFrontier(path)
+        first.mark_fetched("https://kxan.com/news/y", "relevant", "court story")
+        first.mark_ingested("https://kxan.com/news/y", "/posts/y.md")
+        first.close()
+
+        second = CrawlFrontier(path)
+        assert second.is_done("https://www.kxan.com/news/y/")
+        assert second.has_content("court story")
+        assert second.counts() == {"ingested": 1}
+        second.close()
+
+    def test_writer_skips_text_already_ingested_under_another_url(self, frontier, tmp_path):
+        writer = PostWriter(tmp_path, frontier, index_path=None)
+        content = "The county court ruled on the zoning appeal on Tuesday. " * 10
+        for n, url in enumerate(["https://kwtx.com/news/ruling", "https://kbtx.com/news/kwtx-ruling"]):
+            frontier.mark_fetched(url, "relevant", content)
+            article = {"title": f"Court rules on appeal ({n})", "date": "2026-02-11", "content": content, "url": url}
+            written = writer.write(article)
+            assert (written is not None) == (n == 0)
+
+        assert frontier.status("https://kbtx.com/news/kwtx-ruling") == "ingested"
+        assert len(list(tmp_path.glob("*.md"))) == 1
@@ -0,0 +1,111 @@
+"""Unit tests for the streaming crawl-to-post pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from agent.crawl_pipeline import CrawlPipeline
+from agent.date_aware_crawler import PostWriter
+
+
+def _article(n, content="County commissioners met on Tuesday to discuss the budget. "):
+    return {
+        "title": f"Story {n}: commissioners court update",
+        "content": content * 20,
+        "url": f"https://www.kwtx.com/news/story-{n}/",
+        "source": "KWTX",
+        "date": "2026-02-11",
+    }
+
+
+async def _stream(articles, delay=0.0):
+    for article in articles:
+        await asyncio.sleep(delay)
+        yield article
+
+
+def test_writes_posts_as_articles_arrive(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    writer = PostWriter(posts, index_path=None)
+    pipeline = CrawlPipeline(writer, tmp_path / "_data", validate=False)
+    seen = []
+
+    async def articles():
+        for n in range(3):
+            yield _article(n)
+            # The previous article's post is on disk before the next is extracted.
+            await asyncio.sleep(0.01)
+            seen.append(len(list(posts.glob("*.md"))))
+
+    counts = asyncio.run(pipeline.run(articles()))
+
+    assert counts["articles"] == 3
+    assert counts["written"] == 3
+    assert seen == [1, 2, 3]
+    manifest = json.loads((tmp_path / "_data" / "changed_posts.json").read_text())
+    assert manifest["changed"] == sorted(str(p) for p in posts.glob("*.md"))
+
+
+def test_validate_stage_scores_new_posts_and_skips_duplicates(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    data = tmp_path / "_data"
+    writer = PostWriter(posts, index_path=None)
+    pipeline = CrawlPipeline(writer, data, validate=True)
+    same = "Bell County judge ruled on the zoning appeal in district court today. "
+    articles = [_article(1, same), _article(2, same), _article(3, "Waco police announced a new chief this week. ")]
+
+    counts = asyncio.run(pipeline.run(_stream(articles)))
+
+    assert counts["written"] == 3
+    assert counts["duplicates"] == 1
+    assert counts["validated"] == 2
+    assert (data / "post_signatures.json").exists()
+
+
+def test_summarize_stage_skips_duplicates(tmp_path, monkeypatch):
+    import agent.cleanup_summarize as cleanup
+    import agent.crawl_pipeline as pipeline_module
+    from agent.summary_cache import SummaryCache
+
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    summarized = []
+
+    async def fake_summarize(path, cache=None, boilerplate=None, **kwargs):
+        summarized.append(path.name)
+        return {"path": str(path), "cleaned": True, "summary_set": True}
+
+    monkeypatch.setattr(cleanup, "acleanup_and_summarize_post", fake_summarize)
+    monkeypatch.setattr(pipeline_module, "SummaryCache", lambda: SummaryCache(tmp_path / "summaries.sqlite3"))
+    writer = PostWriter(posts, index_path=None)
+    pipeline = CrawlPipeline(writer, tmp_path / "_data", validate=False, summarize=True, queue_size=1)
+    same = "Bell County judge ruled on the zoning appeal in district court today. "
+
+    counts = asyncio.run(pipeline.run(_stream([_article(1, same), _article(2, same)])))
+
+    assert counts["summarized"] == 1
+    assert counts["duplicates"] == 1
+    assert len(summarized) == 1
+
+
+def test_failed_stage_stops_the_run_instead_of_blocking(tmp_path, monkeypatch):
+    from agent.evidence_validator import ValidatorWatcher
+
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+
+    def broken_add_post(self, path):
+        raise ValueError(f"bad post {path.name}")
+
+    monkeypatch.setattr(ValidatorWatcher, "add_post", broken_add_post)
+    writer = PostWriter(posts, index_path=None)
+    pipeline = CrawlPipeline(writer, tmp_path / "_data", validate=True, queue_size=1)
+    articles = [_article(n, f"Story {n} about the county budget vote this week. ") for n in range(10)]
+
+    with pytest.raises(ValueError, match="bad post"):
+        asyncio.run(asyncio.wait_for(pipeline.run(_stream(articles)), timeout=5))
@@ -0,0 +1,67 @@
+"""Unit tests for the offline crawl replay archive and server."""
+
+from __future__ import annotations
+
+import urllib.error
+import urllib.request
+
+from agent.crawl_replay import ReplayArchive, ReplayServer, archive_key
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as err:
+        return err.code, ""
+
+
+def test_archive_key_drops_www_and_keeps_query():
+    assert archive_key("https://www.kwtx.com/news/") == "kwtx.com/news/"
+    assert archive_key("https://kxan.com/feed/?outputType=xml") == "kxan.com/feed/?outputType=xml"
+
+
+def test_archive_round_trips_through_disk(tmp_path):
+    archive = ReplayArchive(tmp_path)
+    archive.add("https://www.kwtx.com/news/", b"<html></html>", "text/html")
+    archive.sources["KWTX"] = {"index": "https://www.kwtx.com/news/", "feed": None}
+    archive.save()
+
+    reloaded = ReplayArchive(tmp_path)
+
+    assert reloaded.lookup("kwtx.com/news/") == (200, "text/html", b"<html></html>")
+    assert reloaded.sources["KWTX"]["index"] == "https://www.kwtx.com/news/"
+    assert reloaded.hosts() == ["kwtx.com"]
+
+
+def test_server_serves_archive_and_rewrites_links(tmp_path):
+    archive = ReplayArchive(tmp_path)
+    archive.add(
+        "https://www.kwtx.com/news/",
+        b'<a href="https://www.kwtx.com/news/a-story/">A</a><a href="/news/b/">B</a>'
+        b'<a href="https://example.com/x">X</a>',
+        "text/html; charset=utf-8",
+    )
+
+    with ReplayServer(archive, latency=0.0, jitter=0.0) as server:
+        status, body = _get(server.url_for("https://www.kwtx.com/news/"))
+        missing, _ = _get(f"{server.base_url}/kwtx.com/nope")
+
+    assert status == 200
+    assert f'href="{server.base_url}/kwtx.com/news/a-story/"' in body
+    assert 'href="/kwtx.com/news/b/"' in body
+    assert 'href="https://example.com/x"' in body
+    assert missing == 404
+    assert server.requests == 2
+    assert server.bytes_served >= len(body)
+
+
+def test_server_simulates_errors(tmp_path):
+    archive = ReplayArchive(tmp_path)
+    archive.add("https://www.kwtx.com/news/", b"ok", "text/plain")
+
+    with ReplayServer(archive, latency=0.0, jitter=0.0, error_rate=1.0) as server:
+        status, _ = _get(server.url_for("https://www.kwtx.com/news/"))
+
+    assert status == 500
+    assert server.errors == 1
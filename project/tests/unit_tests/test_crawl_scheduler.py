@@ -0,0 +1,153 @@
+"""Unit tests for the crawler's concurrency primitives."""
+
+from __future__ import annotations
+
+import asyncio
+
+from agent.crawl_scheduler import (
+    CrawlStats,
+    Deadline,
+    HostLimiter,
+    PagePool,
+    host_of,
+    iter_until,
+    merge_until,
+)
+
+
+class FakeContext:
+    def __init__(self):
+        self.opened = 0
+
+    async def new_page(self):
+        self.opened += 1
+        await asyncio.sleep(0)
+        return FakePage()
+
+
+class FakePage:
+    async def close(self):
+        pass
+
+
+def test_host_of_strips_www():
+    assert host_of("https://www.KWTX.com/news/story") == "kwtx.com"
+
+
+def test_host_limiter_caps_per_host_and_global():
+    limiter = HostLimiter(max_concurrency=3, per_host=2)
+    peak = {"kwtx.com": 0, "kxan.com": 0, "total": 0}
+
+    async def hit(url):
+        async with limiter.slot(url):
+            host = host_of(url)
+            peak[host] = max(peak[host], limiter.in_flight[host])
+            peak["total"] = max(peak["total"], sum(limiter.in_flight.values()))
+            await asyncio.sleep(0.01)
+
+    async def run():
+        urls = [f"https://www.kwtx.com/news/{i}" for i in range(5)]
+        urls += [f"https://www.kxan.com/news/{i}" for i in range(5)]
+        await asyncio.gather(*(hit(u) for u in urls))
+
+    asyncio.run(run())
+    assert peak["kwtx.com"] == 2
+    assert peak["kxan.com"] == 2
+    assert peak["total"] == 3
+
+
+def test_page_pool_never_exceeds_size():
+    context = FakeContext()
+
+    async def borrow(pool):
+        async with pool.page():
+            await asyncio.sleep(0.01)
+
+    async def run():
+        pool = PagePool(context, size=2)
+        await asyncio.gather(*(borrow(pool) for _ in range(6)))
+        await pool.close()
+
+    asyncio.run(run())
+    assert context.opened == 2
+
+
+def test_iter_until_yields_in_completion_order():
+    async def work(delay, value):
+        await asyncio.sleep(delay)
+        return value
+
+    async def run():
+        coros = [work(0.04, "second"), work(0, "first"), work(5, "late")]
+        return [value async for value in iter_until(coros, Deadline(0.1))]
+
+    assert asyncio.run(run()) == ["first", "second"]
+
+
+def test_merge_until_bounds_items_in_flight():
+    produced = []
+
+    async def stream(name):
+        for i in range(10):
+            produced.append((name, i))
+            yield (name, i)
+
+    async def run():
+        items = []
+        async for item in merge_until([stream("a"), stream("b")], None, maxsize=2):
+            # Producers may only be a queue's worth (plus one blocked put each) ahead.
+            assert len(produced) - len(items) <= 2 + 2
+            items.append(item)
+        return items
+
+    items = asyncio.run(run())
+    assert sorted(items) == sorted(produced)
+    assert len(items) == 20
+
+
+def test_merge_until_stops_at_deadline():
+    async def endless():
+        while True:
+            await asyncio.sleep(0.01)
+            yield "tick"
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        items = [item async for item in merge_until([endless()], Deadline(0.05))]
+        return items, loop.time() - start
+
+    items, elapsed = asyncio.run(run())
+    assert items
+    assert elapsed < 0.5
+
+
+def test_merge_until_logs_and_counts_a_failed_stream(caplog):
+    async def good():
+        yield "ok"
+
+    async def broken():
+        yield "partial"
+        raise RuntimeError("source crashed")
+
+    async def run(stats):
+        return [item async for item in merge_until([good(), broken()], None, names=["Good", "Broken"], stats=stats)]
+
+    stats = CrawlStats()
+    with caplog.at_level("ERROR", logger="agent.crawl_scheduler"):
+        items = asyncio.run(run(stats))
+
+    assert sorted(items) == ["ok", "partial"]
+    assert stats.failures == 1
+    assert "Broken: stream failed" in caplog.text
+
+
+def test_crawl_stats_percentiles():
+    stats = CrawlStats()
+    for ms in range(1, 101):
+        stats.record_page(ms / 1000, "http" if ms % 2 else "browser")
+
+    assert stats.percentile(50) == 0.05
+    assert stats.percentile(95) == 0.095
+    assert stats.by_tier == {"http": 50, "browser": 50}
+    assert CrawlStats().percentile(95) == 0.0
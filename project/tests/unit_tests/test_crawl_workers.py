@@ -0,0 +1,114 @@
+"""Unit tests for the multi-process crawl coordinator."""
+
+from __future__ import annotations
+
+import agent.crawl_workers as crawl_workers
+from agent.crawl_scheduler import Deadline
+from agent.crawl_workers import CrawlCoordinator, shard_sources
+from agent.date_aware_crawler import PostWriter
+
+SOURCES = [
+    ("KWTX", "https://www.kwtx.com/news/"),
+    ("KWTX-LOCAL", "https://www.kwtx.com/news/local/"),
+    ("KBTX", "https://www.kbtx.com/news/"),
+    ("KXAN", "https://www.kxan.com/news/"),
+]
+
+
+class DeadProcess:
+    exitcode = -9
+
+    def is_alive(self):
+        return False
+
+    def join(self):
+        pass
+
+
+def _coordinator(tmp_path, workers=2):
+    return CrawlCoordinator(SOURCES, ["kwtx.com"], workers, PostWriter(tmp_path, index_path=None))
+
+
+def test_shard_sources_keeps_each_domain_in_one_shard():
+    shards = shard_sources(SOURCES, 2)
+
+    assert len(shards) == 2
+    kwtx = [i for i, shard in enumerate(shards) for name, _ in shard if name.startswith("KWTX")]
+    assert len(set(kwtx)) == 1
+    assert sorted(name for shard in shards for name, _ in shard) == sorted(n for n, _ in SOURCES)
+
+
+def test_shard_sources_never_exceeds_domain_count():
+    assert len(shard_sources(SOURCES, 16)) == 3
+
+
+def test_results_are_written_once_and_clear_pending(tmp_path):
+    coordinator = _coordinator(tmp_path)
+    coordinator._pending[0] = [("KWTX", ""), ("KBTX", "")]
+    article = {"title": "County approves new jail budget", "date": "2026-02-10", "content": "x"}
+
+    coordinator._handle(("article", 0, "KWTX", [article]))
+    coordinator._handle(("article", 0, "KWTX", [dict(article)]))
+    assert coordinator._pending[0] == [("KWTX", ""), ("KBTX", "")]
+
+    coordinator._handle(("source", 0, "KWTX", None))
+
+    assert coordinator._pending[0] == [("KBTX", "")]
+    assert coordinator.articles == 2
+    assert coordinator.writer.count == 1
+    assert len(list(tmp_path.glob("*.md"))) == 1
+
+    coordinator._handle(("exit", 0, None, None))
+    assert 0 not in coordinator._pending
+
+
+def test_crashed_worker_is_restarted_with_unfinished_sources(tmp_path):
+    coordinator = _coordinator(tmp_path)
+    started = []
+    coordinator._start = lambda worker_id, sources, seconds: started.append((worker_id, sources))
+    coordinator._procs[1] = DeadProcess()
+    coordinator._pending[1] = [("KXAN", "https://www.kxan.com/news/")]
+
+    coordinator._check_workers(Deadline(60))
+
+    assert started == [(1, [("KXAN", "https://www.kxan.com/news/")])]
+    assert coordinator.restarts == 1
+
+
+def test_crashed_worker_is_not_restarted_past_limit(tmp_path):
+    coordinator = _coordinator(tmp_path)
+    coordinator.max_restarts = 0
+    coordinator._start = lambda *args: (_ for _ in ()).throw(AssertionError("restarted"))
+    coordinator._procs[1] = DeadProcess()
+    coordinator._pending[1] = [("KXAN", "https://www.kxan.com/news/")]
+
+    coordinator._check_workers(Deadline(60))
+
+    assert 1 not in coordinator._pending
+
+
+class BusyQueue:
+    """Result queue that always has another (empty) article batch waiting."""
+
+    def get(self, timeout=None):
+        return ("article", 0, "KWTX", [])
+
+
+def test_crashed_worker_is_found_while_results_keep_arriving(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_workers, "QUEUE_POLL_SECONDS", 0.01)
+    coordinator = _coordinator(tmp_path, workers=1)
+    coordinator._results = BusyQueue()
+    started = []
+
+    def start(worker_id, sources, seconds):
+        started.append(worker_id)
+        coordinator._procs[worker_id] = DeadProcess()
+        # The restarted worker finishes at once, which ends the run.
+        if len(started) == 1:
+            coordinator._pending[worker_id] = list(sources)
+
+    coordinator._start = start
+    coordinator.run()
+
+    assert started == [0, 0]
+    assert coordinator.restarts == 1
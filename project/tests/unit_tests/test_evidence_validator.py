@@ -0,0 +1,109 @@
+"""Unit tests for the evidence validator's long-running watcher."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import agent.evidence_validator as evidence_validator
+from agent.evidence_validator import ValidatorWatcher
+
+STORIES = {
+    "senate": "The state senate passed the bail bill after a long debate over the new law.",
+    "court": "A district judge issued a ruling in the zoning appeal heard by the county court.",
+    "storms": "Storm crews restored power to thousands of homes across Waco and Temple overnight.",
+}
+
+
+def _write_post(posts: Path, name: str, body: str, days_old: int = 1) -> Path:
+    day = (datetime.now() - timedelta(days=days_old)).strftime("%Y-%m-%d")
+    path = posts / f"{day}-{name}.md"
+    path.write_text(f'---\ntitle: "{name.title()} story"\ndate: {day}\n---\n\n{body}\n')
+    return path
+
+
+def _watcher(tmp_path: Path, **kwargs) -> ValidatorWatcher:
+    posts = tmp_path / "_posts"
+    posts.mkdir(exist_ok=True)
+    # rescan_every=1 diffs every poll, so same-tick edits are not missed.
+    return ValidatorWatcher(posts, tmp_path / "_data", rescan_every=1, **kwargs)
+
+
+def test_ranked_posts_expire_while_the_watcher_runs(tmp_path, monkeypatch):
+    watcher = _watcher(tmp_path)
+    _write_post(watcher.posts_dir, "senate", STORIES["senate"], days_old=10)
+    _write_post(watcher.posts_dir, "court", STORIES["court"], days_old=1)
+    watcher.poll()
+    assert len(watcher.ranking()) == 2
+
+    monkeypatch.setattr(evidence_validator, "MAX_AGE_DAYS", 5)
+    watcher.poll()
+
+    assert [r["title"] for r in watcher.ranking()] == ["Court story"]
+    assert watcher.flush(force=True)
+    output = json.loads(watcher.output_file.read_text())
+    assert [a["title"] for a in output["all_articles"]] == ["Court story"]
+
+
+def test_poll_rescores_added_modified_and_removed_posts(tmp_path):
+    watcher = _watcher(tmp_path)
+    senate = _write_post(watcher.posts_dir, "senate", STORIES["senate"])
+    court = _write_post(watcher.posts_dir, "court", STORIES["court"])
+
+    assert watcher.poll() == {"added": 2, "modified": 0, "removed": 0}
+    assert watcher.poll() == {"added": 0, "modified": 0, "removed": 0}
+    before = watcher.result(court)["score"]
+
+    court.write_text(court.read_text() + "\nThe judge said the court ruling stands, and the attorney will appeal.\n")
+    senate.unlink()
+    _write_post(watcher.posts_dir, "storms", STORIES["storms"])
+
+    assert watcher.poll() == {"added": 1, "modified": 1, "removed": 1}
+    assert watcher.result(senate) is None
+    assert watcher.result(court)["score"] > before
+    assert [r["title"] for r in watcher.ranking()] == ["Court story", "Storms story"]
+
+
+def test_flush_is_debounced_unless_forced(tmp_path):
+    watcher = _watcher(tmp_path, debounce=60)
+    _write_post(watcher.posts_dir, "senate", STORIES["senate"])
+
+    assert not watcher.flush()
+    watcher.poll()
+    assert watcher.flush()
+    assert len(json.loads(watcher.output_file.read_text())["all_articles"]) == 1
+
+    _write_post(watcher.posts_dir, "court", STORIES["court"])
+    watcher.poll()
+    assert not watcher.flush()
+    assert len(json.loads(watcher.output_file.read_text())["all_articles"]) == 1
+    assert watcher.flush(force=True)
+    assert len(json.loads(watcher.output_file.read_text())["all_articles"]) == 2
+    assert not watcher.flush(force=True)
+
+
+def test_output_is_replaced_atomically(tmp_path, monkeypatch):
+    watcher = _watcher(tmp_path)
+    _write_post(watcher.posts_dir, "senate", STORIES["senate"])
+    watcher.poll()
+    watcher.flush(force=True)
+    previous = watcher.output_file.read_text()
+    _write_post(watcher.posts_dir, "court", STORIES["court"])
+    watcher.poll()
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(evidence_validator.os, "replace", crash)
+    with pytest.raises(OSError):
+        watcher.flush(force=True)
+
+    # A failed write leaves the previous output whole.
+    assert watcher.output_file.read_text() == previous
+    monkeypatch.undo()
+    assert watcher.flush(force=True)
+    assert len(json.loads(watcher.output_file.read_text())["all_articles"]) == 2
+    assert not watcher.output_file.with_name(watcher.output_file.name + ".tmp").exists()
@@ -0,0 +1,109 @@
+"""Unit tests for feed- and sitemap-first discovery."""
+
+from __future__ import annotations
+
+import asyncio
+
+from agent.feed_discovery import FeedDiscovery, parse_date, parse_feed
+from agent.http_fetch import extract_feed_links
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>KWTX News</title><link>https://www.kwtx.com/</link>
+<item><title>Bell County judge sworn in</title><link>https://www.kwtx.com/2026/02/11/judge/</link>
+<pubDate>Wed, 11 Feb 2026 15:04:00 +0000</pubDate></item>
+<item><title>Killeen council votes</title><link>https://www.kwtx.com/2026/02/10/council/</link>
+<pubDate>Tue, 10 Feb 2026 09:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>KXAN</title><link href="https://www.kxan.com/"/>
+<entry><title>Legislature session opens</title><link rel="alternate" href="/news/legislature/"/>
+<published>2026-02-09T12:00:00Z</published></entry></feed>"""
+
+NEWS_SITEMAP = b"""<?xml version="1.0"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+<url><loc>https://www.kbtx.com/2026/02/08/court/</loc>
+<news:news><news:publication><news:name>KBTX</news:name></news:publication>
+<news:publication_date>2026-02-08T18:30:00-06:00</news:publication_date>
+<news:title>Brazos County court ruling</news:title></news:news></url></urlset>"""
+
+
+def _chunked(body, size=17):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+class TestParseFeed:
+    """Tests for the incremental feed parser."""
+
+    def test_rss_items(self):
+        items = list(parse_feed(_chunked(RSS)))
+        assert items == [
+            {"href": "https://www.kwtx.com/2026/02/11/judge/", "text": "Bell County judge sworn in", "date": "2026-02-11"},
+            {"href": "https://www.kwtx.com/2026/02/10/council/", "text": "Killeen council votes", "date": "2026-02-10"},
+        ]
+
+    def test_atom_entries_resolve_relative_links(self):
+        items = list(parse_feed([ATOM], "https://www.kxan.com/feed/"))
+        assert items == [
+            {"href": "https://www.kxan.com/news/legislature/", "text": "Legislature session opens", "date": "2026-02-09"}
+        ]
+
+    def test_news_sitemap(self):
+        items = list(parse_feed(_chunked(NEWS_SITEMAP)))
+        assert items == [
+            {"href": "https://www.kbtx.com/2026/02/08/court/", "text": "Brazos County court ruling", "date": "2026-02-08"}
+        ]
+
+    def test_parse_date_formats(self):
+        assert parse_date("Wed, 11 Feb 2026 15:04:00 +0000") == "2026-02-11"
+        assert parse_date("2026-02-11") == "2026-02-11"
+        assert parse_date("not a date") is None
+
+
+class FakeFetcher:
+    enabled = True
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requests = []
+
+    async def get(self, url):
+        self.requests.append(url)
+        return self.bodies.get(url)
+
+    async def get_html(self, url):
+        body = self.bodies.get(url)
+        return body[0].decode() if body and "html" in body[1] else None
+
+
+class TestFeedDiscovery:
+    """Tests for feed probing and the remembered state."""
+
+    def test_autodiscovers_and_remembers_feed(self, tmp_path):
+        index = "https://www.example-station.com/news/"
+        html = '<html><head><link rel="alternate" type="application/rss+xml" href="/rss.xml"></head></html>'
+        fetcher = FakeFetcher({
+            index: (html.encode(), "text/html"),
+            "https://www.example-station.com/rss.xml": (RSS, "application/rss+xml"),
+        })
+        discovery = FeedDiscovery(fetcher, tmp_path / "feeds.json")
+
+        items = asyncio.run(discovery.discover("EXAMPLE", index))
+        discovery.save()
+
+        assert len(items) == 2
+        reloaded = FeedDiscovery(fetcher, tmp_path / "feeds.json")
+        assert reloaded.state["EXAMPLE"]["feed"] == "https://www.example-station.com/rss.xml"
+
+    def test_feedless_source_is_not_reprobed(self, tmp_path):
+        fetcher = FakeFetcher({})
+        discovery = FeedDiscovery(fetcher, tmp_path / "feeds.json")
+
+        assert asyncio.run(discovery.discover("NONE", "https://none.example/news/")) == []
+        probes = len(fetcher.requests)
+        assert asyncio.run(discovery.discover("NONE", "https://none.example/news/")) == []
+        assert len(fetcher.requests) == probes
+
+    def test_extract_feed_links(self):
+        html = '<link rel="alternate" type="application/atom+xml" href="https://x.example/atom"/><link rel="stylesheet" href="/a.css">'
+        assert extract_feed_links(html, "https://x.example/") == ["https://x.example/atom"]
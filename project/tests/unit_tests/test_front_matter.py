@@ -0,0 +1,93 @@
+"""Unit tests for the shared front matter codec."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+import agent.front_matter as front_matter
+from agent.date_aware_crawler import render_post
+from agent.front_matter import Post, dump_front_matter, parse_front_matter, render
+
+FLAT = (
+    'title: "County court rules on bail"\n'
+    "date: 2026-02-11\n"
+    "layout: default\n"
+    "news_excerpt: true\n"
+    "summary_source_hash: 0a1b2c3d4e5f6a7b\n"
+    "summary_version: '123456789012'\n"
+    "count: 3\n"
+    "note:\n"
+)
+
+
+def test_flat_front_matter_parses_like_yaml_without_it(monkeypatch):
+    parsed = parse_front_matter(FLAT)
+    monkeypatch.setattr(front_matter, "HAS_YAML", False)
+
+    assert parse_front_matter(FLAT) == parsed
+    assert parsed == {
+        "title": "County court rules on bail",
+        "date": date(2026, 2, 11),
+        "layout": "default",
+        "news_excerpt": True,
+        "summary_source_hash": "0a1b2c3d4e5f6a7b",
+        "summary_version": "123456789012",
+        "count": 3,
+        "note": None,
+    }
+    assert list(parsed)[:4] == ["title", "date", "layout", "news_excerpt"]
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["plain", "", "123", "2026-02-11", "true", "null", "1.5", "a: b", "# hash", "He said \"no\"", "it's", "x\ny", " ", " pad "],
+)
+def test_strings_round_trip(value):
+    dumped = dump_front_matter({"title": value, "z": 1, "a": 2})
+
+    assert parse_front_matter(dumped) == {"title": value, "z": 1, "a": 2}
+    assert dumped.splitlines()[1:] == ["z: 1", "a: 2"]
+
+
+@pytest.mark.skipif(not front_matter.HAS_YAML, reason="PyYAML not installed")
+def test_nested_values_fall_back_to_yaml():
+    import yaml
+
+    text = "title: Story\ntags:\n- courts\n- bail\nauthor:\n  name: Staff\n"
+
+    parsed = parse_front_matter(text)
+
+    assert parsed == yaml.safe_load(text)
+    assert parse_front_matter(dump_front_matter(parsed)) == parsed
+
+
+def test_invalid_yaml_is_read_line_by_line():
+    parsed = parse_front_matter('title: "He said "no" today"\ndate: 2026-02-11\n')
+
+    assert parsed == {"title": 'He said "no" today', "date": date(2026, 2, 11)}
+
+
+def test_post_splits_front_matter_and_body():
+    post = Post(f"---\n{FLAT}---\n\n\nBody with --- inside.\n")
+
+    assert post.has_front_matter
+    assert post.get("layout") == "default"
+    assert post.body == "Body with --- inside.\n"
+    assert not Post("No front matter\n").has_front_matter
+    assert Post("No front matter\n").body == "No front matter\n"
+    rendered = render(post.front_matter, post.body)
+    assert rendered == f"---\n{dump_front_matter(post.front_matter)}---\n\nBody with --- inside.\n"
+
+
+def test_crawled_post_title_with_quotes_round_trips():
+    article = {"title": 'Judge: "No bail" for suspect', "url": "https://kwtx.com/a", "source": "KWTX"}
+    article["content"] = "Text."
+
+    post = Post(render_post(article, "2026-02-11"))
+
+    assert post.get("title") == 'Judge: "No bail" for suspect'
+    assert post.get("date") == date(2026, 2, 11)
+    assert post.get("news_excerpt") is True
+    assert post.body.startswith("Text.\n\n## Source Information")
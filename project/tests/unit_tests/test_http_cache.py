@@ -0,0 +1,51 @@
+"""Unit tests for the crawler's on-disk HTTP cache."""
+
+from __future__ import annotations
+
+from agent.http_cache import HttpCache
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite3")
+    cache.put("https://www.kwtx.com/news/", b"<html>hi</html>", "text/html", '"abc"', "Wed, 11 Feb 2026 10:00:00 GMT")
+
+    entry = cache.get("https://www.kwtx.com/news/")
+
+    assert entry.text == "<html>hi</html>"
+    assert cache.is_fresh(entry)
+    assert entry.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 11 Feb 2026 10:00:00 GMT",
+    }
+    assert cache.get("https://www.kwtx.com/other") is None
+    cache.close()
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = HttpCache(path)
+    cache.put("https://www.kxan.com/news/", b"body", "text/html")
+    cache.close()
+
+    assert HttpCache(path).get("https://www.kxan.com/news/").body == b"body"
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite3", max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.total_bytes() == 10
+
+
+def test_hit_rate(tmp_path):
+    cache = HttpCache(tmp_path / "cache.sqlite3")
+    cache.record("fresh")
+    cache.record("revalidated")
+    cache.record("miss")
+    cache.record("miss")
+    assert cache.hit_rate() == 0.5
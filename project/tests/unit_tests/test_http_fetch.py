@@ -0,0 +1,134 @@
+"""Unit tests for the HTTP fast path."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from agent.http_cache import HttpCache
+from agent.http_fetch import (
+    LEARN_AFTER,
+    HttpFetcher,
+    extract_article,
+    extract_links,
+    html_to_text,
+)
+
+ARTICLE_HTML = """<html><head><title>Judge rules in Bell County case</title>
+<script>var ads = 1;</script><style>p {color: red}</style></head>
+<body><nav><a href="/">Home</a><a href="/weather">Weather</a></nav>
+<article><h1>Judge rules in Bell County case</h1>
+<p>BELTON, Texas &mdash; A Bell County judge ruled on Tuesday.</p>
+<p>The ruling&nbsp;affects the county court.</p></article>
+<footer>Copyright 2026</footer></body></html>"""
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    async def get(self, url, headers=None):
+        self.calls.append((url, headers or {}))
+        return self.responses[url]
+
+
+def _response(text, status=200, content_type="text/html; charset=utf-8", **headers):
+    headers = {"content-type": content_type, **{k.replace("_", "-"): v for k, v in headers.items()}}
+    return SimpleNamespace(text=text, content=text.encode("utf-8"), status_code=status, headers=headers)
+
+
+def _fetcher(responses, cache=None):
+    fetcher = HttpFetcher(cache=cache)
+    fetcher._client = FakeClient(responses)
+    return fetcher
+
+
+class TestHtmlToText:
+    """Tests for the HTML-to-text extractor."""
+
+    def test_extracts_title_and_body_without_chrome(self):
+        title, text = html_to_text(ARTICLE_HTML)
+
+        assert title == "Judge rules in Bell County case"
+        assert "A Bell County judge ruled on Tuesday." in text
+        assert "The ruling affects the county court." in text
+        assert "ads" not in text
+        assert "Weather" not in text
+        assert "Copyright" not in text
+
+    def test_block_elements_become_lines(self):
+        _, text = html_to_text("<p>one</p><p>two</p>")
+        assert text.split("\n\n") == ["one", "two"]
+
+    def test_extract_article_reads_structured_metadata(self):
+        html = ARTICLE_HTML.replace(
+            "<title>",
+            '<link rel="canonical" href="/news/judge-rules/">'
+            '<meta property="article:published_time" content="2026-02-10T08:00:00Z">'
+            '<script type="application/ld+json">{"@graph": [{"@type": "WebPage"}, '
+            '{"@type": "NewsArticle", "datePublished": "2026-02-11T09:30:00-06:00"}]}</script><title>',
+        )
+
+        article = extract_article(html, "https://www.kwtx.com/news/x")
+
+        assert article["canonical"] == "https://www.kwtx.com/news/judge-rules/"
+        assert article["ld_date_published"] == "2026-02-11T09:30:00-06:00"
+        assert article["meta_published_time"] == "2026-02-10T08:00:00Z"
+        assert article["title"] == "Judge rules in Bell County case"
+        assert "datePublished" not in article["content"]
+
+    def test_extract_links_resolves_relative_hrefs(self):
+        links = extract_links(ARTICLE_HTML, "https://www.kwtx.com/news/")
+        assert links[0] == {"href": "https://www.kwtx.com/", "text": "Home"}
+
+
+class TestHttpFetcher:
+    """Tests for fast-path vs browser escalation."""
+
+    def test_serves_server_rendered_article(self):
+        url = "https://www.kwtx.com/news/story"
+        fetcher = _fetcher({url: _response(ARTICLE_HTML.replace("Tuesday.", "Tuesday. " + "More detail. " * 30))})
+
+        result = asyncio.run(fetcher.fetch(url))
+
+        assert result["title"] == "Judge rules in Bell County case"
+        assert fetcher.escalation_rates() == {"kwtx.com": 0.0}
+
+    def test_escalates_on_short_text_or_error(self):
+        short = "https://www.kvue.com/news/short"
+        missing = "https://www.kvue.com/news/missing"
+        fetcher = _fetcher({short: _response("<div id='app'></div>"), missing: _response("", status=404)})
+
+        assert asyncio.run(fetcher.fetch(short)) is None
+        assert asyncio.run(fetcher.fetch(missing)) is None
+        assert fetcher.escalation_rates() == {"kvue.com": 1.0}
+
+    def test_learns_js_required_domain(self):
+        url = "https://www.kxan.com/news/spa"
+        fetcher = _fetcher({url: _response("<div id='root'></div>")})
+        for _ in range(LEARN_AFTER):
+            asyncio.run(fetcher.fetch(url))
+        calls = len(fetcher._client.calls)
+
+        assert fetcher.needs_browser(url)
+        assert asyncio.run(fetcher.fetch(url)) is None
+        assert len(fetcher._client.calls) == calls
+
+    def test_cache_serves_fresh_and_revalidates_stale(self, tmp_path):
+        url = "https://www.kbtx.com/news/"
+        cache = HttpCache(tmp_path / "cache.sqlite3")
+        fetcher = _fetcher({url: _response(ARTICLE_HTML, etag='"v1"')}, cache=cache)
+
+        assert asyncio.run(fetcher.get_html(url)) == ARTICLE_HTML
+        assert asyncio.run(fetcher.get_html(url)) == ARTICLE_HTML
+        assert len(fetcher._client.calls) == 1
+
+        cache.freshness = 0
+        fetcher._client.responses[url] = _response("", status=304)
+        assert asyncio.run(fetcher.get_html(url)) == ARTICLE_HTML
+        assert fetcher._client.calls[-1][1] == {"If-None-Match": '"v1"'}
+        assert cache.stats["fresh"] == 1
+        assert cache.stats["revalidated"] == 1
+        assert cache.stats["miss"] == 1
+        cache.close()
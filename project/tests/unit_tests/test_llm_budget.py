@@ -0,0 +1,152 @@
+"""Unit tests for LLM token accounting and per-run budgets."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import agent.llm_budget as llm_budget
+from agent.llm_budget import RunBudget, UsageLedger, cost, estimate_tokens, start_run
+
+
+class FakeChat:
+    """Chat client that answers "OK", with provider usage metadata when ``usage`` is set."""
+
+    model_name = "gpt-4o-mini"
+
+    def __init__(self, usage=None):
+        self.usage = usage
+        self.calls = 0
+
+    def _response(self):
+        return SimpleNamespace(content="OK", usage_metadata=self.usage)
+
+    def invoke(self, messages):
+        self.calls += 1
+        return self._response()
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return self._response()
+
+    def batch(self, inputs, config=None):
+        return [self.invoke(messages) for messages in inputs]
+
+
+@pytest.fixture(autouse=True)
+def fresh_run():
+    start_run(RunBudget())
+    yield
+    start_run(RunBudget())
+
+
+def test_estimates_grow_with_text_and_messages():
+    one = estimate_tokens([("system", "Summarize."), ("user", "word " * 100)])
+    two = estimate_tokens([("system", "Summarize."), ("user", "word " * 100), ("user", "more")])
+
+    assert estimate_tokens("word " * 200) > estimate_tokens("word " * 100) > 0
+    assert two > one
+    assert estimate_tokens([SimpleNamespace(content="word " * 100)]) == estimate_tokens([{"content": "word " * 100}])
+
+
+def test_offline_tokenizer_falls_back_to_length_estimate(monkeypatch):
+    def unreachable(*args):
+        raise ConnectionError("encoding download failed")
+
+    fake = SimpleNamespace(encoding_for_model=unreachable, get_encoding=unreachable)
+    monkeypatch.setattr(llm_budget, "tiktoken", fake, raising=False)
+    monkeypatch.setattr(llm_budget, "HAS_TIKTOKEN", True)
+    llm_budget._encoding.cache_clear()
+
+    try:
+        tokens = llm_budget.count_tokens("word " * 100, "gpt-4o-mini")
+    finally:
+        llm_budget._encoding.cache_clear()
+
+    assert tokens == len("word " * 100) // llm_budget.CHARS_PER_TOKEN + 1
+
+
+def test_cost_uses_list_prices_and_local_models_are_free():
+    assert cost("gpt-4o-mini", 1_000_000, 1_000_000) == pytest.approx(0.75)
+    assert cost("granite-code:20b", 1_000_000, 1_000_000) == 0.0
+
+
+def test_provider_usage_is_preferred_over_estimates():
+    run = llm_budget.ledger()
+
+    llm_budget.invoke(FakeChat({"input_tokens": 120, "output_tokens": 30}), "Hello", "reported")
+    llm_budget.invoke(FakeChat(), "Hello", "estimated")
+
+    assert run.nodes["reported"]["prompt_tokens"] == 120
+    assert run.nodes["reported"]["completion_tokens"] == 30
+    assert run.nodes["reported"]["cost"] == pytest.approx(cost("gpt-4o-mini", 120, 30))
+    assert run.nodes["estimated"]["prompt_tokens"] == estimate_tokens("Hello")
+
+
+def test_low_priority_calls_are_deferred_once_over_budget():
+    run = start_run(RunBudget(max_tokens=1000))
+    llm = FakeChat({"input_tokens": 500, "output_tokens": 100})
+
+    assert llm_budget.invoke(llm, "Hello", "node") is not None
+    assert llm_budget.invoke(llm, "Hello", "node") is None
+    assert llm_budget.invoke(llm, "Hello", "node", high_priority=True) is not None
+    assert llm.calls == 2
+    assert run.nodes["node"]["deferred"] == 1
+    assert run.nodes["node"]["calls"] == 2
+
+
+def test_reservations_count_against_the_budget_until_released():
+    run = start_run(RunBudget(max_tokens=1500))
+
+    assert run.reserve("post", "gpt-4o-mini", 500)
+    assert not run.reserve("post", "gpt-4o-mini", 500)
+    assert run.reserve("post", "gpt-4o-mini", 500, high_priority=True)
+    run.release("gpt-4o-mini", 500)
+    run.release("gpt-4o-mini", 500)
+
+    assert run.reserved_tokens == 0
+    assert run.reserved_cost == pytest.approx(0.0)
+    assert run.reserve("post", "gpt-4o-mini", 500)
+    assert run.nodes["post"]["deferred"] == 1
+
+
+def test_dollar_and_time_limits():
+    assert RunBudget(max_dollars=0.01).exceeded_by(0, 0.02, 0) == "dollars"
+    assert RunBudget(max_seconds=5).exceeded_by(0, 0, 6) == "time"
+    assert RunBudget(max_tokens=10, max_dollars=1).exceeded_by(5, 0.5, 100) is None
+
+
+def test_budget_from_environment(monkeypatch):
+    monkeypatch.setenv("LLM_BUDGET_TOKENS", "5000")
+    monkeypatch.setenv("LLM_BUDGET_DOLLARS", "0.5")
+    monkeypatch.delenv("LLM_BUDGET_SECONDS", raising=False)
+
+    budget = RunBudget.from_env()
+
+    assert (budget.max_tokens, budget.max_dollars, budget.max_seconds) == (5000, 0.5, None)
+
+
+def test_async_and_batch_calls_are_recorded():
+    llm = FakeChat({"input_tokens": 10, "output_tokens": 5})
+
+    asyncio.run(llm_budget.ainvoke(llm, "Hello", "map"))
+    llm_budget.batch(llm, ["a", "b"], "map")
+
+    stats = llm_budget.ledger().nodes["map"]
+    assert stats["calls"] == 3
+    assert stats["prompt_tokens"] == 30
+
+
+def test_report_lists_nodes_cache_savings_and_total():
+    run = UsageLedger()
+    run.record("openai.summarize", "gpt-4o-mini", 1000, 200, 1.5)
+    run.record_cache_hit("openai.summarize", "gpt-4o-mini", 1000)
+
+    report = run.report()
+    rows = {line.split()[0]: line.split() for line in report.splitlines()[2:]}
+
+    assert set(rows) == {"openai.summarize", "total"}
+    assert rows["total"][1:4] == ["1", "1000", "200"]
+    assert rows["total"][6:8] == ["1", str(1000 + llm_budget.EXPECTED_COMPLETION_TOKENS)]
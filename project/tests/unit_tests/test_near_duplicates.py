@@ -0,0 +1,104 @@
+"""Unit tests for MinHash/LSH near-duplicate detection."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from agent.near_duplicates import NearDuplicateDetector, load_updated_detector, shingles
+
+STORY = (
+    "Bell County commissioners approved funding on Tuesday for a new legal resource center in Belton.\n"
+    "The center will provide residents with legal information, referral services and educational materials.\n"
+    "County Judge David Blackburn said the facility is expected to open by the third quarter of 2026.\n"
+    "Officials said the center will complement services from the Texas Attorney General and State Bar.\n"
+)
+OTHER_STORY = (
+    "Heavy storms moved through Central Texas overnight, knocking out power to thousands of homes.\n"
+    "Crews from Oncor worked through the morning to restore service across Waco and Temple neighborhoods.\n"
+    "Forecasters expect drier weather to return by the weekend with highs in the upper seventies.\n"
+)
+
+
+@pytest.fixture
+def posts_dir(posts_dir: Path, write_post) -> Path:
+    for name, title, body in [
+        ("2026-02-11-kwtx-legal-center.md", "Commissioners approve legal center", "Skip to content\nWeather\n" + STORY),
+        ("2026-02-12-kbtx-legal-center.md", "Bell County OKs new legal resource center", "RIGHT NOW\n" + STORY + "Copyright 2026 KBTX. All rights reserved.\n"),
+        ("2026-02-12-kxan-storms.md", "Storms knock out power", OTHER_STORY),
+    ]:
+        write_post(posts_dir, name, title, body, url=f"https://example.com/{name}")
+    return posts_dir
+
+
+class TestShingles:
+    """Tests for body shingling."""
+
+    def test_short_nav_lines_and_source_section_ignored(self):
+        body = "Skip to content\nWeather\n" + STORY + "## Source Information\n\n- **Source**: KWTX news station feed here\n"
+        assert shingles(body) == shingles(STORY)
+
+
+class TestNearDuplicateDetector:
+    """Tests for clustering, canonical selection and persistence."""
+
+    def test_signature_similarity(self):
+        detector = NearDuplicateDetector()
+        same = detector.similarity(detector.signature(STORY), detector.signature(STORY + "Extra closing line for the story.\n"))
+        different = detector.similarity(detector.signature(STORY), detector.signature(OTHER_STORY))
+        assert same > 0.7
+        assert different < 0.2
+
+    def test_update_marks_earliest_copy_canonical(self, posts_dir):
+        detector = NearDuplicateDetector()
+        stats = detector.update(posts_dir)
+
+        kwtx = str(posts_dir / "2026-02-11-kwtx-legal-center.md")
+        kbtx = str(posts_dir / "2026-02-12-kbtx-legal-center.md")
+        storms = str(posts_dir / "2026-02-12-kxan-storms.md")
+        assert stats == {"added": 3, "updated": 0, "removed": 0, "duplicates": 1}
+        assert detector.is_duplicate(kbtx)
+        assert not detector.is_duplicate(kwtx)
+        assert not detector.is_duplicate(storms)
+        assert detector.canonical_of(kbtx) == kwtx
+        assert detector.clusters() == {kwtx: [kbtx]}
+
+    def test_removing_canonical_promotes_duplicate(self, posts_dir):
+        detector = NearDuplicateDetector()
+        detector.update(posts_dir)
+        (posts_dir / "2026-02-11-kwtx-legal-center.md").unlink()
+
+        detector.update(posts_dir)
+
+        assert detector.duplicates() == {}
+
+    def test_save_and_load_round_trip(self, posts_dir, tmp_path):
+        store = tmp_path / "_data" / "post_signatures.json"
+        detector = load_updated_detector(posts_dir, store)
+
+        reloaded = NearDuplicateDetector.load(store)
+
+        assert reloaded.duplicates() == detector.duplicates()
+        assert reloaded.update(posts_dir)["added"] == 0
+
+    def test_bands_must_divide_permutations(self):
+        with pytest.raises(ValueError):
+            NearDuplicateDetector(num_perm=100, bands=32)
+
+
+def test_posts_without_shingles_are_never_duplicates(tmp_path: Path, write_post) -> None:
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    for name, title, body in [
+        ("2026-02-11-a.md", "Weather", "Skip to content\nWeather\n"),
+        ("2026-02-11-b.md", "Scores", "Friday night scores\nWatch live\n"),
+        ("2026-02-11-c.md", "Traffic", "Traffic alert\n"),
+    ]:
+        write_post(posts, name, title, body, url=f"https://example.com/{name}")
+
+    detector = load_updated_detector(posts, tmp_path / "_data" / "post_signatures.json")
+
+    assert detector.duplicates() == {}
+    assert all(doc["signature"] == [] for doc in detector.docs.values())
+    assert detector.add("new.md", "Weather\n") is None
@@ -0,0 +1,132 @@
+"""Unit tests for per-host token buckets, robots.txt caching and backoff."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from agent.crawl_scheduler import HostLimiter
+from agent.politeness import (
+    BASE_PAUSE_SECONDS,
+    MAX_TIMEOUT_SECONDS,
+    MIN_TIMEOUT_SECONDS,
+    Politeness,
+    RobotsCache,
+    TokenBucket,
+    retry_after_seconds,
+)
+
+
+def _robots(text):
+    calls = []
+
+    async def get(url):
+        calls.append(url)
+        return (text.encode("utf-8"), "text/plain") if text is not None else None
+
+    return get, calls
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=20.0, burst=2)
+
+    async def run():
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+
+    # Two tokens up front, then two more at 20/s.
+    assert 0.08 <= elapsed < 0.5
+
+
+def test_retry_after_parses_seconds_and_dates():
+    assert retry_after_seconds("30") == 30.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
+
+
+def test_errors_halve_rate_and_pause_host():
+    politeness = Politeness(rate=2.0)
+
+    politeness.record("kwtx.com", 429, 0.5)
+    bucket = politeness.hosts["kwtx.com"].bucket
+    assert bucket.rate == 1.0
+    assert bucket.delay() > BASE_PAUSE_SECONDS - 0.1
+
+    politeness.record("kwtx.com", 503, 0.5, retry_after="60")
+    assert bucket.rate == 0.5
+    assert bucket.delay() > 59
+
+
+def test_normal_responses_recover_up_to_cap():
+    politeness = Politeness(rate=1.0)
+    politeness.record("kxan.com", 500, 0.5)
+    assert politeness.hosts["kxan.com"].bucket.rate == 0.5
+
+    for _ in range(20):
+        politeness.record("kxan.com", 200, 0.5)
+
+    assert politeness.hosts["kxan.com"].bucket.rate == 1.0
+
+
+def test_slow_loads_trim_rate_and_stretch_timeout():
+    politeness = Politeness(rate=2.0)
+    assert politeness.timeout_for("kbtx.com") == MAX_TIMEOUT_SECONDS
+
+    politeness.record("kbtx.com", 200, 0.2)
+    assert politeness.timeout_for("kbtx.com") == MIN_TIMEOUT_SECONDS
+
+    politeness.record("kbtx.com", 200, 12.0)
+    assert politeness.hosts["kbtx.com"].bucket.rate == 1.5
+    assert politeness.timeout_for("kbtx.com") > MIN_TIMEOUT_SECONDS
+
+
+def test_robots_crawl_delay_caps_rate_and_is_cached(tmp_path):
+    get, calls = _robots("User-agent: *\nCrawl-delay: 4\nDisallow: /admin\n")
+    path = tmp_path / "robots.json"
+    politeness = Politeness(rate=2.0, robots=RobotsCache(get, path))
+
+    asyncio.run(politeness.wait("kvue.com", "https://www.kvue.com/news/"))
+
+    state = politeness.hosts["kvue.com"]
+    assert state.ceiling == 0.25
+    assert state.bucket.rate == 0.25
+    assert calls == ["https://www.kvue.com/robots.txt"]
+
+    politeness.robots.save()
+    again, again_calls = _robots(None)
+    assert asyncio.run(RobotsCache(again, path).crawl_delay("https://www.kvue.com/x")) == 4.0
+    assert again_calls == []
+
+
+def test_long_crawl_delay_is_honored_through_backoff(tmp_path):
+    get, _ = _robots("User-agent: *\nCrawl-delay: 30\n")
+    politeness = Politeness(rate=2.0, robots=RobotsCache(get, tmp_path / "robots.json"))
+
+    asyncio.run(politeness.wait("kvue.com", "https://www.kvue.com/news/"))
+    politeness.record("kvue.com", 429, 0.5)
+    politeness.record("kvue.com", 200, 12.0)
+
+    state = politeness.hosts["kvue.com"]
+    assert state.ceiling == 1 / 30
+    assert state.bucket.rate == 1 / 30
+
+
+def test_missing_robots_means_no_cap(tmp_path):
+    get, _ = _robots(None)
+    politeness = Politeness(rate=2.0, robots=RobotsCache(get, tmp_path / "robots.json"))
+
+    asyncio.run(politeness.wait("kwtx.com", "https://www.kwtx.com/news/"))
+
+    assert politeness.hosts["kwtx.com"].ceiling == 2.0
+
+
+def test_host_limiter_without_politeness_keeps_defaults():
+    limiter = HostLimiter()
+    limiter.record("https://www.kwtx.com/a", 429, 1.0)
+
+    assert limiter.timeout_ms("https://www.kwtx.com/a") == MAX_TIMEOUT_SECONDS * 1000
@@ -0,0 +1,71 @@
+"""Unit tests for the BM25 post index."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from agent.post_index import PostIndex, load_updated_index, tokenize
+
+
+@pytest.fixture
+def posts_dir(posts_dir: Path, write_post) -> Path:
+    write_post(posts_dir, "2026-02-11-senate.md", "State Senate passes bail bill", "The Texas senate voted on a bail bill.")
+    write_post(posts_dir, "2026-02-11-weather.md", "Storms roll through Waco", "Heavy rain and wind across Central Texas.")
+    write_post(posts_dir, "2026-02-11-tdcj.md", "TDCJ inmate transferred", "An inmate was moved by TDCJ officials.")
+    return posts_dir
+
+
+class TestTokenize:
+    """Tests for the index tokenizer."""
+
+    def test_lowercases_and_drops_stopwords(self):
+        assert tokenize("The Senate and THE House") == ["senate", "house"]
+
+
+class TestPostIndex:
+    """Tests for building, querying and persisting the index."""
+
+    def test_search_ranks_matching_post_first(self, posts_dir):
+        index = PostIndex()
+        index.update(posts_dir)
+
+        hits = index.search("senate bill")
+
+        assert hits[0]["path"].endswith("2026-02-11-senate.md")
+        assert hits[0]["title"] == "State Senate passes bail bill"
+        assert all(h["score"] > 0 for h in hits)
+
+    def test_search_no_match(self, posts_dir):
+        index = PostIndex()
+        index.update(posts_dir)
+        assert index.search("zoning") == []
+
+    def test_update_is_incremental(self, posts_dir, write_post):
+        index = PostIndex()
+        assert index.update(posts_dir) == {"added": 3, "updated": 0, "removed": 0}
+        assert index.update(posts_dir) == {"added": 0, "updated": 0, "removed": 0}
+
+        path = write_post(posts_dir, "2026-02-11-weather.md", "Court ruling on zoning", "A judge ruled on zoning.")
+        os.utime(path, ns=(1, 1))
+        (posts_dir / "2026-02-11-tdcj.md").unlink()
+
+        assert index.update(posts_dir) == {"added": 0, "updated": 1, "removed": 1}
+        assert len(index) == 2
+        assert index.search("zoning")[0]["path"] == str(path)
+        assert index.search("inmate") == []
+        assert "inmate" not in index.postings
+
+    def test_save_and_load_round_trip(self, posts_dir, tmp_path):
+        index_path = tmp_path / "_data" / "post_index.json"
+        index = load_updated_index(posts_dir, index_path)
+
+        reloaded = PostIndex.load(index_path)
+
+        assert len(reloaded) == len(index) == 3
+        assert reloaded.search("tdcj inmate") == index.search("tdcj inmate")
+
+    def test_load_missing_file_returns_empty_index(self, tmp_path):
+        assert len(PostIndex.load(tmp_path / "missing.json")) == 0
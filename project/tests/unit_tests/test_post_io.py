@@ -0,0 +1,46 @@
+"""Unit tests for atomic post writes and the changed-posts manifest."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+import agent.post_io as post_io
+from agent.post_io import write_if_changed, write_manifest
+
+
+def test_identical_content_is_not_rewritten(tmp_path):
+    path = tmp_path / "2026-02-10-story.md"
+
+    assert write_if_changed(path, "---\ntitle: A\n---\n\nBody\n")
+    before = path.stat().st_mtime_ns
+    assert not write_if_changed(path, "---\ntitle: A\n---\n\nBody\n")
+    assert path.stat().st_mtime_ns == before
+    assert write_if_changed(path, "---\ntitle: A\n---\n\nNew body\n")
+    assert path.read_text() == "---\ntitle: A\n---\n\nNew body\n"
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+
+def test_failed_write_keeps_the_old_post(tmp_path, monkeypatch):
+    path = tmp_path / "2026-02-10-story.md"
+    path.write_text("old")
+
+    def crash(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(post_io.os, "replace", crash)
+    with pytest.raises(OSError):
+        write_if_changed(path, "new")
+
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == [path.name]
+
+
+def test_manifest_lists_changed_paths_once(tmp_path):
+    path = write_manifest(tmp_path / "_data", ["b.md", "a.md", "b.md"])
+
+    manifest = json.loads(path.read_text())
+    assert manifest["changed"] == ["a.md", "b.md"]
+    assert manifest["count"] == 2
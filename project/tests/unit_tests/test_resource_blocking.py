@@ -0,0 +1,75 @@
+"""Unit tests for crawler request interception."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from agent.resource_blocking import BlockingPolicy, ResourceBlocker
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+    async def abort(self, error_code=None):
+        self.outcome = "abort"
+
+
+class TestBlockingPolicy:
+    """Tests for block decisions."""
+
+    def test_blocks_heavy_types_and_ad_domains(self):
+        policy = BlockingPolicy()
+        assert policy.should_block("image", "https://www.kwtx.com/logo.png") == "type"
+        assert policy.should_block("script", "https://securepubads.g.doubleclick.net/tag.js") == "domain"
+        assert policy.should_block("script", "https://www.kwtx.com/app.js") is None
+
+    def test_documents_always_load(self):
+        assert BlockingPolicy().should_block("document", "https://ad.doubleclick.net/") is None
+
+    def test_override_adds_and_allows(self):
+        policy = BlockingPolicy().with_override(
+            {"allow_resource_types": ["stylesheet"], "extra_domains": ["arcpublishing.com"], "allow_domains": ["jwplatform.com"]}
+        )
+        assert policy.should_block("stylesheet", "https://www.kxan.com/site.css") is None
+        assert policy.should_block("script", "https://cdn.arcpublishing.com/x.js") == "domain"
+        assert policy.should_block("script", "https://cdn.jwplatform.com/player.js") is None
+
+
+class TestResourceBlocker:
+    """Tests for the route handler and counters."""
+
+    def test_handle_counts_blocked_and_allowed(self):
+        blocker = ResourceBlocker()
+        routes = [
+            FakeRoute("image", "https://www.kbtx.com/a.jpg"),
+            FakeRoute("font", "https://www.kbtx.com/a.woff2"),
+            FakeRoute("document", "https://www.kbtx.com/news/story"),
+        ]
+
+        async def run():
+            for route in routes:
+                await blocker.handle(route)
+
+        asyncio.run(run())
+        assert [r.outcome for r in routes] == ["abort", "abort", "continue"]
+        assert blocker.stats.blocked == 2
+        assert blocker.stats.allowed == 1
+        assert blocker.stats.bytes_saved > 0
+        assert blocker.stats.by_type == {"image": 1, "font": 1}
+
+    def test_source_override_shares_stats(self, tmp_path):
+        config = tmp_path / "resource_blocking.json"
+        config.write_text(json.dumps({"sources": {"KVUE": {"allow_resource_types": ["image"]}}}))
+        blocker = ResourceBlocker.from_config(config)
+        kvue = blocker.for_source("KVUE")
+
+        assert kvue.policy.should_block("image", "https://www.kvue.com/a.jpg") is None
+        assert blocker.for_source("KWTX").policy.should_block("image", "https://www.kwtx.com/a.jpg") == "type"
+        assert kvue.stats is blocker.stats
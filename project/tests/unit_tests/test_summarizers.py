@@ -0,0 +1,132 @@
+"""Unit tests for the summarizer backends and backend selection."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+import agent.summarizers as summarizers
+from agent.summarizers import (
+    OpenAISummarizer,
+    Summarizer,
+    TextRankSummarizer,
+    select_summarizer,
+)
+
+needs_langchain = pytest.mark.skipif(not summarizers.HAS_LANGCHAIN, reason="langchain-openai not installed")
+needs_numpy = pytest.mark.skipif(not summarizers.HAS_NUMPY, reason="numpy not installed")
+
+
+class FakeBackend(Summarizer):
+    def __init__(self, name, quality, cost, seconds, up=True):
+        self.name = name
+        self.quality = quality
+        self.cost = cost
+        self.overhead_seconds = seconds
+        self.up = up
+
+    def available(self):
+        return self.up
+
+    def summarize(self, title, body):
+        return None
+
+
+def test_other_errors_are_not_retried(rate_limit_error):
+    assert summarizers._retry_delay(ValueError("bad request"), 0) is None
+    assert 0 <= summarizers._retry_delay(rate_limit_error(), 3) <= summarizers.BASE_BACKOFF_SECONDS * 8
+
+
+def test_split_into_chunks_respects_paragraphs_and_budget():
+    paragraphs = [f"Paragraph {i}. " + "The court heard arguments. " * 30 for i in range(10)]
+    text = "\n\n".join(paragraphs)
+
+    chunks = summarizers.split_into_chunks(text, max_tokens=400)
+
+    assert all(len(chunk) <= 400 * summarizers.CHARS_PER_TOKEN for chunk in chunks)
+    assert len(chunks) > 1
+    assert "\n\n".join(chunks).split("\n\n") == [p.strip() for p in paragraphs]
+    huge = "One very long sentence " * 500
+    assert all(len(c) <= 400 * summarizers.CHARS_PER_TOKEN for c in summarizers.split_into_chunks(huge, 400))
+
+
+@needs_langchain
+def test_long_articles_are_summarized_map_reduce(monkeypatch, fake_llm):
+    monkeypatch.setattr(summarizers, "SINGLE_SHOT_TOKENS", 500)
+    monkeypatch.setattr(summarizers, "CHUNK_TOKENS", 300)
+    llm = fake_llm(delay=0.05)
+    prompts = []
+    original = llm.ainvoke
+
+    async def spy(messages):
+        prompts.append((messages[0].content, messages[-1].content))
+        return await original(messages)
+
+    llm.ainvoke = spy
+    body = "\n\n".join(f"Section {i}. " + "The legislature debated the bill. " * 25 for i in range(8))
+
+    started = time.monotonic()
+    summary = asyncio.run(OpenAISummarizer(llm).asummarize("Bill", body))
+    elapsed = time.monotonic() - started
+
+    maps = [human for system, human in prompts if system == summarizers.CHUNK_SYSTEM_PROMPT]
+    reduces = [human for system, human in prompts if system == summarizers.SUMMARY_SYSTEM_PROMPT]
+    assert summary
+    assert len(maps) > 2 and len(reduces) == 1
+    assert any("Section 7." in m for m in maps)
+    assert "Part 1:" in reduces[0]
+    assert llm.peak == len(maps)
+    assert elapsed < 0.05 * 4
+
+
+@needs_langchain
+def test_short_articles_use_one_call(fake_llm):
+    llm = fake_llm(delay=0)
+    assert asyncio.run(OpenAISummarizer(llm).asummarize("Story", "A short story."))
+    assert llm.calls == 1
+
+
+@needs_numpy
+def test_textrank_keeps_central_sentences_in_article_order():
+    body = "\n\n".join(
+        [
+            "The county court ruled on the bail reform case today.",
+            "Weather in Waco was sunny and warm this afternoon outside.",
+            "The bail reform ruling by the court affects county jails.",
+            "A local bakery opened a new location downtown last week.",
+            "County jails must apply the court ruling on bail reform.",
+        ]
+    )
+
+    summary = TextRankSummarizer().summarize("Bail", body)
+
+    assert summary.split("\n\n")[0].split(". ") == [
+        "The county court ruled on the bail reform case today",
+        "The bail reform ruling by the court affects county jails",
+        "County jails must apply the court ruling on bail reform.",
+    ]
+    assert TextRankSummarizer().summarize("Bail", body) == summary
+
+
+@needs_numpy
+def test_textrank_handles_empty_and_unrelated_text():
+    assert TextRankSummarizer().summarize("Empty", "  ") is None
+    body = "Alpha beta gamma delta. Epsilon zeta eta theta. Iota kappa lambda mu."
+    assert TextRankSummarizer().summarize("Unrelated", body) == body
+
+
+def test_select_summarizer_trades_cost_quality_and_latency():
+    llm = FakeBackend("llm", quality=3, cost=1.0, seconds=5.0)
+    local = FakeBackend("local", quality=2, cost=0.0, seconds=20.0)
+    extractive = FakeBackend("extractive", quality=1, cost=0.0, seconds=0.0)
+    backends = [llm, local, extractive]
+
+    assert select_summarizer("text", backends=backends) is local
+    assert select_summarizer("text", high_priority=True, backends=backends) is llm
+    assert select_summarizer("text", latency_budget=10, backends=backends) is extractive
+    assert select_summarizer("text", high_priority=True, latency_budget=1, backends=[llm, local]) is llm
+    llm.up = False
+    assert select_summarizer("text", high_priority=True, backends=backends) is local
+    assert select_summarizer("text", backends=[FakeBackend("down", 3, 1.0, 1.0, up=False)]) is None
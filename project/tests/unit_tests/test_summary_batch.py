@@ -0,0 +1,139 @@
+"""Unit tests for batch-request export, the local stand-in and ingest."""
+
+from __future__ import annotations
+
+import json
+
+import agent.cleanup_summarize as cleanup
+import agent.summarizers as summarizers
+from agent.summary_batch import (
+    STAND_IN_MODEL,
+    batch_result,
+    read_jsonl,
+    read_results,
+    run_local_batch,
+    write_jsonl,
+)
+
+
+def test_export_local_ingest_round_trip(tmp_path, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 3)
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    requests_path = tmp_path / "requests.jsonl"
+    results_path = tmp_path / "results.jsonl"
+
+    counts = cleanup.export_summary_batch(posts, requests_path, tmp_path / "_data", cache=cache)
+    requests = list(read_jsonl(requests_path))
+    again = cleanup.export_summary_batch(posts, tmp_path / "again.jsonl", tmp_path / "_data", cache=cache)
+
+    assert counts["posts"] == counts["requests"] == 3
+    assert [r["custom_id"] for r in requests] == [r["custom_id"] for r in read_jsonl(tmp_path / "again.jsonl")]
+    assert again["requests"] == 3
+    assert requests[0]["url"] == "/v1/chat/completions"
+    assert requests[0]["body"]["messages"][0]["content"] == summarizers.SUMMARY_SYSTEM_PROMPT
+    assert "Skip to content" not in requests[0]["body"]["messages"][1]["content"]
+
+    assert run_local_batch(requests_path, results_path)["answered"] == 3
+    results = cleanup.ingest_summary_batch(posts, results_path, tmp_path / "_data", cache=cache)
+
+    assert all(r["summary_set"] and r["backend"] == "textrank" for r in results)
+    text = (posts / "2026-02-10-story-0.md").read_text()
+    assert "excerpt:" in text and "summary_source_hash:" in text and "summary_backend: textrank" in text
+    assert "Skip to content" not in text and "## Source Information" in text
+    # Stand-in answers are not OpenAI summaries: the next export asks for real ones.
+    final = cleanup.export_summary_batch(posts, requests_path, tmp_path / "_data", cache=cache)
+    assert final["requests"] == 3 and final["cached"] == 0
+
+
+def test_openai_results_are_applied_as_openai_summaries(tmp_path, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 2)
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    requests_path = tmp_path / "requests.jsonl"
+    cleanup.export_summary_batch(posts, requests_path, tmp_path / "_data", cache=cache)
+    rows = [
+        batch_result(r["custom_id"], f"The OpenAI summary of {r['custom_id']} explains what officials decided.", model="gpt-4o-mini-2024-07-18")
+        for r in read_jsonl(requests_path)
+    ]
+    write_jsonl(tmp_path / "results.jsonl", rows)
+
+    results = cleanup.ingest_summary_batch(posts, tmp_path / "results.jsonl", tmp_path / "_data", cache=cache)
+
+    assert all(r["summary_set"] and r["backend"] == "openai" for r in results)
+    assert "summary_backend: openai" in (posts / "2026-02-10-story-0.md").read_text()
+    final = cleanup.export_summary_batch(posts, requests_path, tmp_path / "_data", cache=cache)
+    assert final["requests"] == 0 and final["current"] == 2
+
+
+def test_long_articles_take_a_map_round_then_a_reduce_round(tmp_path, monkeypatch, write_posts):
+    monkeypatch.setattr(summarizers, "SINGLE_SHOT_TOKENS", 100)
+    monkeypatch.setattr(summarizers, "CHUNK_TOKENS", 80)
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 1, sentences=20)
+    path = posts / "2026-02-10-story-0.md"
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    requests_path = tmp_path / "requests.jsonl"
+    results_path = tmp_path / "results.jsonl"
+
+    cleanup.export_summary_batch(posts, requests_path, tmp_path / "_data", cache=cache)
+    maps = list(read_jsonl(requests_path))
+    run_local_batch(requests_path, results_path)
+    first = cleanup.ingest_summary_batch(posts, results_path, tmp_path / "_data", cache=cache)
+
+    assert len(maps) > 1 and all("-map-" in r["custom_id"] for r in maps)
+    assert maps[0]["body"]["messages"][0]["content"] == summarizers.CHUNK_SYSTEM_PROMPT
+    assert first[0]["pending"] and not first[0]["summary_set"]
+    assert "summary_source_hash:" not in path.read_text()
+
+    cleanup.export_summary_batch(posts, requests_path, tmp_path / "_data", cache=cache)
+    (reduce,) = read_jsonl(requests_path)
+    run_local_batch(requests_path, results_path)
+    second = cleanup.ingest_summary_batch(posts, results_path, tmp_path / "_data", cache=cache)
+
+    assert "-map-" not in reduce["custom_id"]
+    assert "Part 1:" in reduce["body"]["messages"][1]["content"]
+    assert second[0]["summary_set"]
+    assert "summary_source_hash:" in path.read_text()
+
+
+def test_failed_and_missing_results_leave_posts_alone(tmp_path, write_posts):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    write_posts(posts, 2)
+    cache = cleanup.SummaryCache(tmp_path / "summaries.sqlite3")
+    requests_path = tmp_path / "requests.jsonl"
+    cleanup.export_summary_batch(posts, requests_path, tmp_path / "_data", cache=cache)
+    first_id = next(read_jsonl(requests_path))["custom_id"]
+    before = {p.name: p.read_text() for p in posts.iterdir()}
+    write_jsonl(tmp_path / "results.jsonl", [batch_result(first_id, None, "rate limited")])
+
+    results = cleanup.ingest_summary_batch(posts, tmp_path / "results.jsonl", tmp_path / "_data", cache=cache)
+
+    assert results[0]["error"] == "rate limited"
+    assert results[1]["missing"]
+    assert {p.name: p.read_text() for p in posts.iterdir()} == before
+
+
+def test_read_results_separates_errors(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        "\n".join(
+            json.dumps(row)
+            for row in [
+                batch_result("a", "A summary."),
+                batch_result("d", "A stand-in summary.", model=STAND_IN_MODEL),
+                batch_result("b", None, "boom"),
+                {"custom_id": "c", "response": {"status_code": 500, "body": {}}, "error": None},
+            ]
+        )
+        + "\n"
+    )
+
+    answers, errors = read_results(path)
+
+    assert answers == {"a": ("A summary.", "gpt-4o-mini"), "d": ("A stand-in summary.", STAND_IN_MODEL)}
+    assert errors == {"b": "boom", "c": "status 500"}